@@ -0,0 +1,60 @@
+"""indexes for task search and filtering
+
+Revision ID: 0007_tasks_search_indexes
+Revises: 0006_tasks_status_check_expand
+Create Date: 2026-10-17 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007_tasks_search_indexes'
+down_revision = '0006_tasks_status_check_expand'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with SEARCH_DOCUMENT in problems/problem_1/app/crud/task.py:
+# the planner only uses the GIN index when the query repeats this expression.
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes on large tables; it cannot run inside
+    # a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_status',
+            'tasks',
+            ['project_id', 'status'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_assignee_id_status_due_date',
+            'tasks',
+            ['assignee_id', 'status', 'due_date'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_search_document',
+            'tasks',
+            [sa.text(SEARCH_DOCUMENT)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_tasks_search_document',
+            'ix_tasks_assignee_id_status_due_date',
+            'ix_tasks_project_id_status',
+        ):
+            op.drop_index(name, table_name='tasks', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,48 @@
+"""per-project task counters
+
+Revision ID: 0008_project_task_counters
+Revises: 0007_tasks_search_indexes
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_project_task_counters'
+down_revision = '0007_tasks_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_task_counters',
+        sa.Column('project_id', sa.Integer(), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        # 9999-12-31 stands for "no due date"
+        sa.Column('due_on', sa.Date(), nullable=False),
+        sa.Column('task_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('project_id', 'status', 'due_on'),
+    )
+    # Backfill; same query as crud.task_counter.rebuild
+    op.execute(
+        """
+        INSERT INTO project_task_counters (project_id, status, due_on, task_count)
+        SELECT project_id,
+               CASE status
+                   WHEN 'TODO' THEN 'ToDo'
+                   WHEN 'IN_PROGRESS' THEN 'InProgress'
+                   WHEN 'DONE' THEN 'Done'
+                   ELSE status
+               END,
+               coalesce((due_date AT TIME ZONE 'UTC')::date, DATE '9999-12-31'),
+               count(*)
+        FROM tasks
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_task_counters')
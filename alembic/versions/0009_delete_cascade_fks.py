@@ -0,0 +1,67 @@
+"""database-side ON DELETE actions for project and user deletes
+
+Revision ID: 0009_delete_cascade_fks
+Revises: 0008_project_task_counters
+Create Date: 2026-10-17 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009_delete_cascade_fks'
+down_revision = '0008_project_task_counters'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, ON DELETE action). Project and user deletes
+# rely on these instead of ORM cascades (crud.project / crud.user
+# delete_statements). 0001 declares them, but databases created from the
+# models (create_all) got plain NO ACTION keys.
+FOREIGN_KEYS = [
+    ('projects', 'owner_id', 'users', 'CASCADE'),
+    ('tasks', 'project_id', 'projects', 'CASCADE'),
+    ('tasks', 'assignee_id', 'users', 'SET NULL'),
+]
+
+# pg_constraint.confdeltype codes
+CONFDELTYPE = {'CASCADE': 'c', 'SET NULL': 'n'}
+
+
+def _foreign_keys(table: str, column: str, referred: str):
+    return op.get_bind().execute(
+        sa.text(
+            """
+            SELECT c.conname, c.confdeltype
+            FROM pg_constraint c
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY (c.conkey)
+            WHERE c.contype = 'f'
+              AND c.conrelid = CAST(:table AS regclass)
+              AND c.confrelid = CAST(:referred AS regclass)
+              AND a.attname = :column
+            """
+        ),
+        {'table': table, 'referred': referred, 'column': column},
+    ).all()
+
+
+def upgrade() -> None:
+    for table, column, referred, action in FOREIGN_KEYS:
+        existing = _foreign_keys(table, column, referred)
+        if existing and all(row.confdeltype == CONFDELTYPE[action] for row in existing):
+            continue
+        for row in existing:
+            op.drop_constraint(row.conname, table, type_='foreignkey')
+        name = f'{table}_{column}_fkey'
+        # NOT VALID skips the full-table check while the ALTER holds its lock;
+        # VALIDATE then scans under a lock that lets reads and writes through.
+        op.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) '
+            f'REFERENCES {referred} (id) ON DELETE {action} NOT VALID'
+        )
+        op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def downgrade() -> None:
+    # The actions match 0001; nothing to undo.
+    pass
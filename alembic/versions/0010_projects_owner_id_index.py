@@ -0,0 +1,39 @@
+"""index projects by owner
+
+Revision ID: 0010_projects_owner_id_index
+Revises: 0009_delete_cascade_fks
+Create Date: 2026-10-17 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010_projects_owner_id_index'
+down_revision = '0009_delete_cascade_fks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the owned-projects branch of GET /tasks/mine, owner-filtered
+    # project lists and the ON DELETE CASCADE from users. CONCURRENTLY keeps
+    # writes going; it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_owner_id',
+            'projects',
+            ['owner_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_projects_owner_id',
+            table_name='projects',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,53 @@
+"""index tasks by project, status and due date for the board
+
+Revision ID: 0011_tasks_board_index
+Revises: 0010_projects_owner_id_index
+Create Date: 2026-10-17 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011_tasks_board_index'
+down_revision = '0010_projects_owner_id_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /projects/{id}/board numbers each status column's tasks by due date;
+    # this index returns them already in that order. It also serves every
+    # (project_id, status) lookup, so the 0007 index on those two is dropped.
+    # CONCURRENTLY keeps writes going; it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_status_due_date',
+            'tasks',
+            ['project_id', 'status', 'due_date'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_tasks_project_id_status',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_status',
+            'tasks',
+            ['project_id', 'status'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_tasks_project_id_status_due_date',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
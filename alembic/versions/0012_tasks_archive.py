@@ -0,0 +1,66 @@
+"""archive table for old Done tasks
+
+Revision ID: 0012_tasks_archive
+Revises: 0011_tasks_board_index
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012_tasks_archive'
+down_revision = '0011_tasks_board_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tasks_archive',
+        # Same id as the task had in `tasks`
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('project_id', sa.Integer(), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('assignee_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_archive_project_id', 'tasks_archive', ['project_id'])
+    op.create_index('ix_tasks_archive_assignee_id', 'tasks_archive', ['assignee_id'])
+    # The archive job picks Done tasks by their last change; this partial
+    # index holds only Done tasks, so finding a batch never walks the rest.
+    # Must match crud.task_archive.last_changed and DONE_STATUSES.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_done_last_changed',
+            'tasks',
+            [sa.text('coalesce(updated_at, created_at)')],
+            postgresql_where=sa.text("status IN ('Done', 'DONE')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # Put archived tasks back before the table goes
+    op.execute(
+        """
+        INSERT INTO tasks (id, title, description, status, project_id, assignee_id, created_at, updated_at, due_date)
+        SELECT id, title, description, status, project_id, assignee_id, created_at, updated_at, due_date
+        FROM tasks_archive
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_done_last_changed',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_table('tasks_archive')
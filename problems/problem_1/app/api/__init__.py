@@ -1,9 +1,40 @@
 from fastapi import APIRouter
+from fastapi.routing import APIRoute
 
 from app.api.v1.endpoints import users, auth, projects, tasks
+from app.core.config import settings
+
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
+
+
+def _merge_routes(base: APIRouter, overlay: APIRouter) -> APIRouter:
+    """
+    Replace routes of `base` with the `overlay` route for the same path and methods.
+
+    Route order of `base` is kept, so literal paths still precede `/{id}`
+    patterns; endpoints that have no overlay version stay as they are.
+    """
+    replacements = {
+        (route.path, frozenset(route.methods)): route
+        for route in overlay.routes
+        if isinstance(route, APIRoute)
+    }
+    merged = APIRouter()
+    for route in base.routes:
+        if isinstance(route, APIRoute):
+            route = replacements.pop((route.path, frozenset(route.methods)), route)
+        merged.routes.append(route)
+    merged.routes.extend(replacements.values())
+    return merged
+
+
+if settings.USE_ASYNC_DB:
+    # Async (asyncpg) versions of the core endpoints; the rest stay sync
+    from app.api.aio import api_router as async_api_router
+
+    api_router = _merge_routes(api_router, async_api_router)
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+
+from app.api.aio.endpoints import auth, projects, tasks, users
+
+api_router = APIRouter()
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
+api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
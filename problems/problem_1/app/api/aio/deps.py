@@ -0,0 +1,68 @@
+"""Async counterparts of `app.api.deps`, backed by `AsyncSession`."""
+from typing import AsyncGenerator
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.api import read_routing
+from app.api.deps import reusable_oauth2
+from app.core.principal_cache import Principal
+from app.core.token_cache import InvalidToken, token_cache
+from app.crud import aio as crud
+from app.db.async_session import AsyncSessionLocal, get_async_db
+from app.db.session import async_replica_session
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async `app.api.deps.get_read_db`: a replica session unless the client wrote recently."""
+    db = None if read_routing.pinned(request) else async_replica_session()
+    read_routing.READ_SESSIONS.labels(target="primary" if db is None else "replica").inc()
+    if db is None:
+        db = AsyncSessionLocal()
+    async with db:
+        yield db
+
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> Principal:
+    try:
+        token_data = token_cache.decode(token)
+    except InvalidToken:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    principal = await crud.user.get_principal(db, id=token_data.sub)
+    if not principal:
+        raise HTTPException(status_code=404, detail="User not found")
+    return principal
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    principal: Principal = Depends(get_current_principal),
+) -> models.User:
+    user = await crud.user.get(db, id=principal.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not crud.user.is_active(current_user):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_active_superuser(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=400, detail="The user doesn't have enough privileges"
+        )
+    return current_user
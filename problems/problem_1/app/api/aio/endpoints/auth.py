@@ -0,0 +1,74 @@
+from datetime import timedelta
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.api.aio import deps
+from app.core import security
+from app.core.config import settings
+from app.crud.aio import user as crud_user
+from app.db.async_session import get_async_db
+
+router = APIRouter()
+
+@router.post("/login/access-token", response_model=schemas.Token)
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
+) -> Any:
+    """
+    OAuth2 compatible token login, get an access token for future requests
+    """
+    user = await crud_user.authenticate(
+        db, email=form_data.username, password=form_data.password
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect email or password",
+        )
+    elif not crud_user.is_active(user):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return {
+        "access_token": security.create_access_token(
+            user.id, expires_delta=access_token_expires
+        ),
+        "token_type": "bearer",
+    }
+
+@router.post("/login/test-token", response_model=schemas.User)
+async def test_token(current_user: models.User = Depends(deps.get_current_user)) -> Any:
+    """
+    Test access token
+    """
+    return current_user
+
+@router.post("/signup", response_model=schemas.User)
+async def signup(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_in: schemas.UserCreate,
+) -> Any:
+    """
+    Public signup endpoint to create a standard user account.
+    Superuser creation is not allowed via this endpoint.
+    """
+    if await crud_user.get_by_email(db, email=user_in.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The user with this email already exists in the system.",
+        )
+    safe_user = schemas.UserCreate(
+        email=user_in.email,
+        password=user_in.password,
+        full_name=user_in.full_name,
+        is_superuser=False,
+    )
+    return await crud_user.create(db, obj_in=safe_user)
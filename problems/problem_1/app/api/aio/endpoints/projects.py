@@ -0,0 +1,223 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.api import export
+from app.api.aio import deps
+from app.api.etag import collection_etag, make_etag, not_modified
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.config import settings
+from app.core.principal_cache import Principal
+from app.crud import aio as crud
+from app.crud.base import InvalidCursor
+from app.db.async_session import get_async_db
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Project])
+async def read_projects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve projects.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    rows = list_rows(crud.project, schemas.Project)
+    try:
+        if crud.user.is_superuser(current_user):
+            projects = await crud.project.get_multi(db, skip=skip, limit=limit, cursor=cursor, rows=rows)
+        else:
+            projects = await crud.project.get_multi_by_owner(
+                db=db, owner_id=current_user.id, skip=skip, limit=limit, cursor=cursor, rows=rows
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.project.next_cursor(projects, limit=limit)
+    cached = not_modified(request, response, collection_etag(projects, extra=[next_cursor]))
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, projects, rows)
+
+@router.post("/", response_model=schemas.Project)
+async def create_project(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_in: schemas.ProjectCreate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create new project.
+    """
+    return await crud.project.create_with_owner(
+        db=db, obj_in=project_in, owner_id=current_user.id
+    )
+
+@router.get("/{project_id}/board", response_model=schemas.ProjectBoard)
+async def read_project_board(
+    *,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    project_id: int,
+    per_column: int = Query(20, ge=1, le=schemas.MAX_BOARD_PER_COLUMN),
+    cursor: List[str] = Query([]),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Kanban board: the first `per_column` tasks of each status column by due
+    date (tasks without one last), with each column's total, in one query.
+
+    To load more of a column, pass its `next_cursor` back as `cursor`; only
+    the columns of the given cursors are returned then.
+    """
+    project = await crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    try:
+        columns = await crud.task.get_board(
+            db, project_id=project_id, per_column=per_column, cursors=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"project_id": project_id, "columns": columns}
+
+@router.get("/{project_id}/tasks/export")
+async def export_project_tasks(
+    *,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    project_id: int,
+    export_format: export.ExportFormat = Query(export.ExportFormat.NDJSON, alias="format"),
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Stream every task of a project as NDJSON (one `Task` per line) or CSV,
+    followed with `include_archived` by its archived tasks.
+    """
+    project = await crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    rows = crud.task.row_shape(schemas.Task)
+    batches = crud.task.stream_by_project(
+        db, project_id=project_id, rows=rows, batch_size=settings.EXPORT_BATCH_SIZE
+    )
+    if include_archived:
+        archived = crud.task_archive.stream_by_project(
+            db,
+            project_id=project_id,
+            rows=crud.task_archive.row_shape(schemas.Task),
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
+        batches = export.chain_async(batches, archived)
+    return StreamingResponse(
+        export.encode_async(batches, rows, export_format),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers=export.content_disposition(f"project-{project_id}-tasks", export_format),
+    )
+
+@router.put("/{project_id}", response_model=schemas.Project)
+async def update_project(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_id: int,
+    project_in: schemas.ProjectUpdate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Update a project.
+    """
+    project = await crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    return await crud.project.update(db, db_obj=project, obj_in=project_in)
+
+@router.get("/{project_id}", response_model=schemas.ProjectWithTasks)
+async def read_project(
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    project_id: int,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get project by ID.
+
+    Sends a weak `ETag`; with a matching `If-None-Match` the answer is 304,
+    decided by one aggregate query without loading the tasks.
+    """
+    project_version = await crud.project.get_version(db, id=project_id)
+    if not project_version:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project_version.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    cached = not_modified(request, response, make_etag(project_id, *project_version))
+    if cached is not None:
+        return cached
+    project = await crud.project.get(
+        db, id=project_id, options=crud.project.load_options(schemas.ProjectWithTasks)
+    )
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    return project
+
+@router.delete("/{project_id}", response_model=schemas.Project)
+async def delete_project(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_id: int,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete a project.
+    """
+    project = await crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    return await crud.project.remove(db=db, id=project_id)
@@ -0,0 +1,374 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.api.aio import deps
+from app.api.deps import check_due_range
+from app.api.etag import collection_etag, not_modified, object_etag
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.principal_cache import Principal
+from app.crud import aio as crud
+from app.crud.base import InvalidCursor
+from app.crud.task import TaskAccess
+from app.db.async_session import get_async_db
+from app.models.task import TaskStatus
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Task])
+async def read_tasks(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve tasks.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    options = crud.task.load_options(schemas.Task)
+    rows = list_rows(crud.task, schemas.Task)
+    try:
+        if crud.user.is_superuser(current_user):
+            tasks = await crud.task.get_multi(
+                db, skip=skip, limit=limit, cursor=cursor, options=options, rows=rows
+            )
+        else:
+            tasks = await crud.task.get_multi_by_assignee(
+                db=db,
+                assignee_id=current_user.id,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                options=options,
+                rows=rows,
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
+
+@router.get("/mine", response_model=List[schemas.Task])
+async def read_my_tasks(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    status: Optional[TaskStatus] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Tasks assigned to the current user or in projects they own, in one query.
+
+    Optionally filtered by status and due date range (`due_after` <=
+    due_date < `due_before`). Pass the `X-Next-Cursor` response header back
+    as `cursor` to page by keyset.
+    """
+    check_due_range(due_after, due_before)
+    rows = list_rows(crud.task, schemas.Task)
+    try:
+        tasks = await crud.task.get_multi_mine(
+            db,
+            user_id=current_user.id,
+            status=status,
+            due_after=due_after,
+            due_before=due_before,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            options=crud.task.load_options(schemas.Task),
+            rows=rows,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
+
+@router.get("/search", response_model=List[schemas.Task])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Search tasks by status, assignee, project, due date range (`due_after` <=
+    due_date < `due_before`) and free text `q` over title and description.
+
+    Non-superusers only see tasks in projects they own or assigned to them.
+    With `include_archived`, archived tasks are searched too.
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    check_due_range(due_after, due_before)
+    visible_to = None if crud.user.is_superuser(current_user) else current_user.id
+    rows = list_rows(crud.task, schemas.Task)
+    filters = dict(
+        status=status,
+        assignee_id=assignee_id,
+        project_id=project_id,
+        due_after=due_after,
+        due_before=due_before,
+        text=q,
+        visible_to=visible_to,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        if include_archived:
+            tasks = await crud.task_archive.search_with(
+                db, crud.task, schema=schemas.Task, fast=rows is not None, **filters
+            )
+        else:
+            tasks = await crud.task.search(
+                db, options=crud.task.load_options(schemas.Task), rows=rows, **filters
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
+
+@router.post("/", response_model=schemas.Task)
+async def create_task(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    task_in: schemas.TaskCreate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create new task.
+    """
+    project = await crud.project.get(db, id=task_in.project_id)
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to create task in this project"
+        )
+
+    if task_in.assignee_id:
+        if not await crud.user.get(db, id=task_in.assignee_id):
+            raise HTTPException(
+                status_code=404,
+                detail="The assignee does not exist in the system",
+            )
+
+    return await crud.task.create(db, obj_in=task_in)
+
+@router.put("/{task_id}", response_model=schemas.Task)
+async def update_task(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    task_id: int,
+    task_in: schemas.TaskUpdate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Update a task.
+    """
+    access = await _get_task_access(db, task_id, assignee_id=task_in.assignee_id)
+    task = access.task
+
+    is_owner = task.project.owner_id == current_user.id
+    is_assignee = task.assignee_id == current_user.id
+
+    if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to update this task"
+        )
+
+    if task_in.assignee_id is not None and access.assignee is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The assignee does not exist in the system",
+        )
+
+    task = await crud.task.update(
+        db, db_obj=task, obj_in=task_in, options=crud.task.load_options(schemas.Task)
+    )
+    if task is None:
+        # Deleted between the access check and the update
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return task
+
+@router.get("/{task_id}", response_model=schemas.TaskWithProject)
+async def read_task(
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    task_id: int,
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get task by ID.
+
+    With `include_archived`, archived tasks are found too (they are read-only).
+    Sends a weak `ETag`; a matching `If-None-Match` gets a 304 without a body.
+    """
+    task = (await _get_task_access(db, task_id, include_archived=include_archived)).task
+
+    is_owner = task.project.owner_id == current_user.id
+    is_assignee = task.assignee_id == current_user.id
+
+    if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to view this task"
+        )
+
+    cached = not_modified(request, response, object_etag(task, related=("project",)))
+    if cached is not None:
+        return cached
+    return task
+
+@router.delete("/{task_id}", status_code=status.HTTP_200_OK)
+async def delete_task(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    task_id: int,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete a task.
+    """
+    task = (await _get_task_access(db, task_id)).task
+
+    if not (crud.user.is_superuser(current_user) or task.project.owner_id == current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to delete this task"
+        )
+
+    task = await crud.task.remove(db=db, id=task_id)
+    if task is None:
+        # Deleted between the access check and the delete
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return {"status": "deleted"}
+
+@router.post("/{task_id}/status/{status}", response_model=schemas.Task)
+async def update_task_status(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    task_id: int,
+    status: TaskStatus,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Update task status.
+    """
+    task = (await _get_task_access(db, task_id)).task
+
+    is_owner = task.project.owner_id == current_user.id
+    is_assignee = task.assignee_id == current_user.id
+
+    if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to update this task"
+        )
+
+    task = await crud.task.update_status_returning(db, db_obj=task, status=status)
+    if task is None:
+        # Deleted between the access check and the update
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return task
+
+@router.post("/{task_id}/assign/{user_id}", response_model=schemas.Task)
+async def assign_task(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    task_id: int,
+    user_id: Optional[int] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Assign a task to a user.
+    """
+    access = await _get_task_access(db, task_id, assignee_id=user_id)
+    task = access.task
+
+    if not (crud.user.is_superuser(current_user) or task.project.owner_id == current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions to assign this task"
+        )
+
+    if user_id is not None and access.assignee is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The user does not exist in the system",
+        )
+
+    task = await crud.task.update_assignee_returning(db, db_obj=task, assignee=access.assignee)
+    if task is None:
+        # Deleted between the access check and the update
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return task
+
+async def _get_task_access(
+    db: AsyncSession,
+    task_id: int,
+    *,
+    assignee_id: Optional[int] = None,
+    include_archived: bool = False,
+) -> TaskAccess:
+    """Load the task with its access context, or raise 404; archived tasks only with `include_archived`."""
+    access = await crud.task.get_with_access(db, id=task_id, assignee_id=assignee_id)
+    if access is None and include_archived:
+        access = await crud.task_archive.get_with_access(db, id=task_id)
+    if access is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return access
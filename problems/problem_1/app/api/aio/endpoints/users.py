@@ -0,0 +1,161 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.api.aio import deps
+from app.api.etag import collection_etag, not_modified, object_etag
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.principal_cache import Principal
+from app.crud import aio as crud
+from app.crud.base import InvalidCursor
+from app.db.async_session import get_async_db
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.User])
+async def read_users(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Retrieve users.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    rows = list_rows(crud.user, schemas.User)
+    try:
+        users = await crud.user.get_multi(db, skip=skip, limit=limit, cursor=cursor, rows=rows)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.user.next_cursor(users, limit=limit)
+    # Same defensive filtering of invalid stored emails as the sync endpoint
+    if rows is not None:
+        safe_users = users
+    else:
+        safe_users = []
+        for u in users:
+            try:
+                _ = EmailStr.validate(u.email)
+                safe_users.append(u)
+            except Exception:
+                continue
+    cached = not_modified(request, response, collection_etag(safe_users, extra=[next_cursor]))
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, safe_users, rows)
+
+@router.post("/", response_model=schemas.User)
+async def create_user(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_in: schemas.UserCreate,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Create new user.
+    """
+    if await crud.user.get_by_email(db, email=user_in.email):
+        raise HTTPException(
+            status_code=400,
+            detail="The user with this username already exists in the system.",
+        )
+    return await crud.user.create(db, obj_in=user_in)
+
+@router.get("/me", response_model=schemas.User)
+async def read_user_me(
+    request: Request,
+    response: Response,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get current user.
+    """
+    cached = not_modified(request, response, object_etag(current_user))
+    if cached is not None:
+        return cached
+    return current_user
+
+@router.get("/{user_id}", response_model=schemas.User)
+async def read_user_by_id(
+    request: Request,
+    response: Response,
+    user_id: int,
+    current_user: Principal = Depends(deps.get_current_principal),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+) -> Any:
+    """
+    Get a specific user by id.
+    """
+    user = await crud.user.get(db, id=user_id)
+    is_self = user is not None and user.id == current_user.id
+    if not is_self and not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=400, detail="The user doesn't have enough privileges"
+        )
+    cached = not_modified(request, response, object_etag(user))
+    if cached is not None:
+        return cached
+    return user
+
+@router.put("/me", response_model=schemas.User)
+async def update_user_me(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_in: schemas.UserUpdate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Update own user.
+    """
+    user = await crud.user.get(db, id=current_user.id)
+    if not user:
+        # Deleted while another process still had the principal cached
+        raise HTTPException(status_code=404, detail="User not found")
+    return await crud.user.update(db, db_obj=user, obj_in=user_in)
+
+@router.put("/{user_id}", response_model=schemas.User)
+async def update_user(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int,
+    user_in: schemas.UserUpdate,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Update a user.
+    """
+    user = await crud.user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this username does not exist in the system",
+        )
+    return await crud.user.update(db, db_obj=user, obj_in=user_in)
+
+@router.delete("/{user_id}", response_model=schemas.User)
+async def delete_user(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Delete a user.
+    """
+    user = await crud.user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this username does not exist in the system",
+        )
+    return await crud.user.remove(db=db, id=user_id)
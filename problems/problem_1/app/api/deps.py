@@ -1,53 +1,100 @@
+from datetime import datetime
 from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, models
+from app.api import read_routing
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.principal_cache import Principal
+from app.core.token_cache import InvalidToken, token_cache
+from app.db.session import SessionLocal, get_db, replica_session
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token"
 )
 
 
-def get_current_user(
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: a read replica, or the primary when none
+    is configured or the client wrote recently (see `app.api.read_routing`).
+    """
+    db = None if read_routing.pinned(request) else replica_session()
+    read_routing.READ_SESSIONS.labels(target="primary" if db is None else "replica").inc()
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_current_principal(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+) -> Principal:
+    """
+    Resolve the caller from the JWT without loading the full `users` row.
+
+    Endpoints that only need `id`/`is_active`/`is_superuser` should depend on
+    this (or the active/superuser variants below); it is served from the
+    principal cache in the common case.
+    """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = schemas.TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+        token_data = token_cache.decode(token)
+    except InvalidToken:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.sub)
+    principal = crud.user.get_principal(db, id=token_data.sub)
+    if not principal:
+        raise HTTPException(status_code=404, detail="User not found")
+    return principal
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+) -> models.User:
+    """Load the full `users` row, for endpoints that return or modify it."""
+    user = crud.user.get(db, id=principal.id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
 def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     if not crud.user.is_active(current_user):
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
 def get_current_active_superuser(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     if not crud.user.is_superuser(current_user):
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def check_due_range(due_after: Optional[datetime], due_before: Optional[datetime]) -> None:
+    """Reject a `due_after` <= due_date < `due_before` filter that can match nothing."""
+    if due_after is None or due_before is None:
+        return
+    try:
+        empty_range = due_after >= due_before
+    except TypeError:
+        raise HTTPException(
+            status_code=400,
+            detail="due_after and due_before must both have a timezone or neither",
+        )
+    if empty_range:
+        raise HTTPException(status_code=400, detail="due_after must be before due_before")
@@ -0,0 +1,81 @@
+import hashlib
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+ETAG_HEADER = "ETag"
+
+
+def version(obj: Any) -> Tuple[Any, ...]:
+    """What identifies one state of a row: its id and last write time."""
+    if obj is None:
+        return (None,)
+    if isinstance(obj, Mapping):
+        return (obj["id"], obj["updated_at"] or obj["created_at"])
+    return (obj.id, obj.updated_at or obj.created_at)
+
+
+def _related(obj: Any, name: str) -> Any:
+    # ORM objects, or the plain dicts list pages are read into (app.crud.rows)
+    return obj[name] if isinstance(obj, Mapping) else getattr(obj, name)
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag over `parts`.
+
+    The app version is mixed in so a deploy that changes a response shape
+    does not answer 304 to bodies cached under the old one.
+    """
+    raw = repr((settings.APP_VERSION,) + parts).encode("utf-8")
+    return f'W/"{hashlib.sha1(raw).hexdigest()[:24]}"'
+
+
+def object_etag(obj: Any, *, related: Sequence[str] = ()) -> str:
+    """ETag for one row plus the nested rows (`related` attributes) its schema includes."""
+    return make_etag(version(obj), *(version(_related(obj, name)) for name in related))
+
+
+def collection_etag(
+    items: Iterable[Any], *, related: Sequence[str] = (), extra: Sequence[Any] = ()
+) -> str:
+    """
+    ETag for a list page: every item's version (and its nested rows') plus `extra`.
+
+    Pass the next-page cursor in `extra`, since it is part of the response.
+    """
+    return make_etag(
+        tuple((version(item), *(version(_related(item, name)) for name in related)) for item in items),
+        *extra,
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set `etag` on the response; return a 304 to send instead if the client has it.
+
+    Returning the 304 from the endpoint skips response-model validation and
+    JSON encoding entirely, so call this before building the body.
+    """
+    response.headers[ETAG_HEADER] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={ETAG_HEADER: etag})
+    return None
@@ -0,0 +1,36 @@
+from typing import Any, List, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.crud.rows import RowShape
+
+
+def list_rows(crud_obj: Any, schema: Type[BaseModel]) -> Optional[RowShape]:
+    """
+    The row shape to read a `schema` list page with, or None for ORM objects.
+
+    Pass the result as `rows=` to the CRUD list method and to `list_response`;
+    it is None when `FAST_LIST_SERIALIZATION` is off.
+    """
+    if not settings.FAST_LIST_SERIALIZATION:
+        return None
+    return crud_obj.row_shape(schema)
+
+
+def list_response(response: Response, items: List[Any], rows: Optional[RowShape]) -> Any:
+    """
+    What a list endpoint returns for `items`.
+
+    Row dicts are encoded to JSON bytes here, carrying over the headers set on
+    `response`: returning a Response bypasses `response_model`, which would
+    otherwise validate every field of every row again. ORM objects are
+    returned as they are, for FastAPI to serialize through the schema.
+    """
+    if rows is None:
+        return items
+    encoded = Response(orjson.dumps(items), media_type="application/json")
+    encoded.raw_headers.extend(response.headers.raw)
+    return encoded
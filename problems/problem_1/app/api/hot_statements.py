@@ -0,0 +1,59 @@
+"""The statements behind Problem 1's hot endpoints, for the startup warmup.
+
+`run` / `run_async` make the same CRUD calls as login, authentication and
+the task/project reads, with ids and an email that match no rows, so each
+engine compiles and caches those statements before the first request (see
+`app.core.warmup`). Writes are left out: they would need a row to change.
+Cached reads are called unwrapped (`__wrapped__`), past the query cache,
+so their statement is compiled too. The calls run once per engine, on one
+of its connections: they fill the engine's compiled cache only, and a
+per-connection cache (asyncpg's prepared statements) stays cold on the
+other connections the `pools` step opened.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api.fast_json import list_rows
+from app.core.principal_cache import load_principal, load_principal_async
+from app.crud import aio as crud_aio
+
+# Ids start at 1
+NO_ID = 0
+NO_EMAIL = "warmup@example.invalid"
+
+
+def run(db: Session) -> None:
+    crud.user.get_by_email(db, email=NO_EMAIL)
+    load_principal(db, NO_ID)
+    crud.task.get_multi_by_assignee(
+        db=db,
+        assignee_id=NO_ID,
+        options=crud.task.load_options(schemas.Task),
+        rows=list_rows(crud.task, schemas.Task),
+    )
+    crud.task.get_with_access(db, id=NO_ID)
+    crud.project.get_multi_by_owner.__wrapped__(
+        crud.project, db, owner_id=NO_ID, rows=list_rows(crud.project, schemas.Project)
+    )
+    crud.project.get_version(db, id=NO_ID)
+    crud.project.get(db, id=NO_ID, options=crud.project.load_options(schemas.ProjectWithTasks))
+
+
+async def run_async(db: AsyncSession) -> None:
+    await crud_aio.user.get_by_email(db, email=NO_EMAIL)
+    await load_principal_async(db, NO_ID)
+    await crud_aio.task.get_multi_by_assignee(
+        db,
+        assignee_id=NO_ID,
+        options=crud_aio.task.load_options(schemas.Task),
+        rows=list_rows(crud_aio.task, schemas.Task),
+    )
+    await crud_aio.task.get_with_access(db, id=NO_ID)
+    await crud_aio.project.get_multi_by_owner.__wrapped__(
+        crud_aio.project, db, owner_id=NO_ID, rows=list_rows(crud_aio.project, schemas.Project)
+    )
+    await crud_aio.project.get_version(db, id=NO_ID)
+    await crud_aio.project.get(
+        db, id=NO_ID, options=crud_aio.project.load_options(schemas.ProjectWithTasks)
+    )
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import Response
+
+# Opaque keyset cursor for the page after the current one; absent on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """
+    Expose the next-page cursor without changing the list response body.
+
+    Clients may start with offset paging (`skip`) and switch to `cursor`
+    at any point, since the cursor is derived from the last returned row.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
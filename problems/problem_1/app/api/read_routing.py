@@ -0,0 +1,63 @@
+"""Read-your-writes for the GET endpoints served from read replicas.
+
+Read-only endpoints take their session from `get_read_db`, which uses a
+replica (`DATABASE_REPLICA_URLS`). A replica may lag the primary, so a
+successful write pins its client to the primary for `REPLICA_PIN_SECONDS`:
+the response carries the pin's expiry (unix seconds) as a cookie and as a
+header, and a read that sends either back, still unexpired, uses the primary.
+Clients without a cookie jar echo the header.
+"""
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+PIN_COOKIE = "db_primary_pin"
+PIN_HEADER = "X-Primary-Pin"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+READ_SESSIONS = counter(
+    "db_read_sessions",
+    "Sessions opened by read-only endpoints, by the database they read from",
+    ["target"],
+)
+
+
+def _pin_until(request: Request) -> Optional[int]:
+    value = request.headers.get(PIN_HEADER) or request.cookies.get(PIN_COOKIE)
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def pinned(request: Request) -> bool:
+    """Whether `request` comes from a client that wrote within the pin window."""
+    until = _pin_until(request)
+    if until is None:
+        return False
+    now = time.time()
+    # A pin never lasts longer than the window, whatever the client sends back
+    return now < until <= now + settings.REPLICA_PIN_SECONDS
+
+
+def pin(response: Response) -> None:
+    """Send this client's next reads to the primary for `REPLICA_PIN_SECONDS`."""
+    until = str(int(time.time()) + settings.REPLICA_PIN_SECONDS)
+    response.headers[PIN_HEADER] = until
+    response.set_cookie(
+        PIN_COOKIE, until, max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="lax"
+    )
+
+
+async def pin_after_writes(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Middleware: pin the client to the primary after every successful write."""
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        pin(response)
+    return response
@@ -1,38 +1,61 @@
-from typing import Any, List
+import itertools
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
-from app.api import deps
+from app.api import deps, export
+from app.api.etag import collection_etag, make_etag, not_modified
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.config import settings
+from app.core.principal_cache import Principal
+from app.crud import task_counter
+from app.crud.base import InvalidCursor
 from app.db.session import get_db
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Project])
 def read_projects(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve projects.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
     """
-    if crud.user.is_superuser(current_user):
-        projects = crud.project.get_multi(db, skip=skip, limit=limit)
-    else:
-        projects = crud.project.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
-        )
-    return projects
+    rows = list_rows(crud.project, schemas.Project)
+    try:
+        if crud.user.is_superuser(current_user):
+            projects = crud.project.get_multi(db, skip=skip, limit=limit, cursor=cursor, rows=rows)
+        else:
+            projects = crud.project.get_multi_by_owner(
+                db=db, owner_id=current_user.id, skip=skip, limit=limit, cursor=cursor, rows=rows
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.project.next_cursor(projects, limit=limit)
+    cached = not_modified(request, response, collection_etag(projects, extra=[next_cursor]))
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, projects, rows)
 
 @router.post("/", response_model=schemas.Project)
 def create_project(
     *,
     db: Session = Depends(get_db),
     project_in: schemas.ProjectCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Create new project.
@@ -42,13 +65,135 @@ def create_project(
     )
     return project
 
+@router.get("/stats", response_model=List[schemas.ProjectStats])
+def read_projects_stats(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    ids: List[int] = Query(..., min_items=1, max_items=schemas.MAX_STATS_PROJECTS),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Task counts by status and overdue counts for several projects.
+
+    Results follow the order of `ids`; projects that do not exist or that the
+    user does not own are left out.
+    """
+    owners = crud.project.get_owner_ids(db, ids=ids)
+    if not crud.user.is_superuser(current_user):
+        owners = {pid: owner_id for pid, owner_id in owners.items() if owner_id == current_user.id}
+    return task_counter.get_stats(db, project_ids=[pid for pid in ids if pid in owners])
+
+@router.get("/{project_id}/stats", response_model=schemas.ProjectStats)
+def read_project_stats(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    project_id: int,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Task counts by status and overdue counts for a project.
+
+    Served from the per-project counters; `tasks` is not read.
+    """
+    owner_id = crud.project.get_owner_ids(db, ids=[project_id]).get(project_id)
+    if owner_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    return task_counter.get_stats(db, project_ids=[project_id])[0]
+
+@router.get("/{project_id}/board", response_model=schemas.ProjectBoard)
+def read_project_board(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    project_id: int,
+    per_column: int = Query(20, ge=1, le=schemas.MAX_BOARD_PER_COLUMN),
+    cursor: List[str] = Query([]),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Kanban board: the first `per_column` tasks of each status column by due
+    date (tasks without one last), with each column's total, in one query.
+
+    To load more of a column, pass its `next_cursor` back as `cursor`; only
+    the columns of the given cursors are returned then.
+    """
+    owner_id = crud.project.get_owner_ids(db, ids=[project_id]).get(project_id)
+    if owner_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    try:
+        columns = crud.task.get_board(
+            db, project_id=project_id, per_column=per_column, cursors=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"project_id": project_id, "columns": columns}
+
+@router.get("/{project_id}/tasks/export")
+def export_project_tasks(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    project_id: int,
+    export_format: export.ExportFormat = Query(export.ExportFormat.NDJSON, alias="format"),
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Stream every task of a project as NDJSON (one `Task` per line) or CSV.
+
+    Tasks are read from a server-side cursor and sent batch by batch, so
+    memory use does not grow with the project. CSV leaves out the nested
+    assignee; its columns are the task's own. With `include_archived`, the
+    project's archived tasks follow the others.
+    """
+    owner_id = crud.project.get_owner_ids(db, ids=[project_id]).get(project_id)
+    if owner_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
+    if not crud.user.is_superuser(current_user) and (owner_id != current_user.id):
+        raise HTTPException(
+            status_code=400, detail="Not enough permissions"
+        )
+    rows = crud.task.row_shape(schemas.Task)
+    # get_read_db's session stays open until the response has been sent
+    batches = crud.task.stream_by_project(
+        db, project_id=project_id, rows=rows, batch_size=settings.EXPORT_BATCH_SIZE
+    )
+    if include_archived:
+        archived = crud.task_archive.stream_by_project(
+            db,
+            project_id=project_id,
+            rows=crud.task_archive.row_shape(schemas.Task),
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
+        batches = itertools.chain(batches, archived)
+    return StreamingResponse(
+        export.encode(batches, rows, export_format),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers=export.content_disposition(f"project-{project_id}-tasks", export_format),
+    )
+
 @router.put("/{project_id}", response_model=schemas.Project)
 def update_project(
     *,
     db: Session = Depends(get_db),
     project_id: int,
     project_in: schemas.ProjectUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update a project.
@@ -69,23 +214,39 @@ def update_project(
 @router.get("/{project_id}", response_model=schemas.ProjectWithTasks)
 def read_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     project_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get project by ID.
+
+    Sends a weak `ETag`; with a matching `If-None-Match` the answer is 304,
+    decided by one aggregate query without loading the tasks.
     """
-    project = crud.project.get(db, id=project_id)
-    if not project:
+    project_version = crud.project.get_version(db, id=project_id)
+    if not project_version:
         raise HTTPException(
             status_code=404,
             detail="The project does not exist in the system",
         )
-    if not crud.user.is_superuser(current_user) and (project.owner_id != current_user.id):
+    if not crud.user.is_superuser(current_user) and (project_version.owner_id != current_user.id):
         raise HTTPException(
             status_code=400, detail="Not enough permissions"
         )
+    cached = not_modified(request, response, make_etag(project_id, *project_version))
+    if cached is not None:
+        return cached
+    project = crud.project.get(
+        db, id=project_id, options=crud.project.load_options(schemas.ProjectWithTasks)
+    )
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail="The project does not exist in the system",
+        )
     return project
 
 @router.delete("/{project_id}", response_model=schemas.Project)
@@ -93,7 +254,7 @@ def delete_project(
     *,
     db: Session = Depends(get_db),
     project_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Delete a project.
@@ -1,10 +1,17 @@
+from datetime import datetime
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.etag import collection_etag, not_modified, object_etag
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.principal_cache import Principal
+from app.crud.base import InvalidCursor
+from app.crud.task import TaskAccess
 from app.db.session import get_db
 from app.models.task import TaskStatus
 
@@ -12,28 +19,156 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Task])
 def read_tasks(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve tasks.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    options = crud.task.load_options(schemas.Task)
+    rows = list_rows(crud.task, schemas.Task)
+    try:
+        if crud.user.is_superuser(current_user):
+            tasks = crud.task.get_multi(
+                db, skip=skip, limit=limit, cursor=cursor, options=options, rows=rows
+            )
+        else:
+            tasks = crud.task.get_multi_by_assignee(
+                db=db,
+                assignee_id=current_user.id,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                options=options,
+                rows=rows,
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
+
+@router.get("/mine", response_model=List[schemas.Task])
+def read_my_tasks(
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
+    status: Optional[TaskStatus] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
     """
-    if crud.user.is_superuser(current_user):
-        tasks = crud.task.get_multi(db, skip=skip, limit=limit)
-    else:
-        tasks = crud.task.get_multi_by_assignee(
-            db=db, assignee_id=current_user.id, skip=skip, limit=limit
+    Tasks assigned to the current user or in projects they own, in one query.
+
+    Optionally filtered by status and due date range (`due_after` <=
+    due_date < `due_before`). Pass the `X-Next-Cursor` response header back
+    as `cursor` to page by keyset.
+    """
+    deps.check_due_range(due_after, due_before)
+    rows = list_rows(crud.task, schemas.Task)
+    try:
+        tasks = crud.task.get_multi_mine(
+            db,
+            user_id=current_user.id,
+            status=status,
+            due_after=due_after,
+            due_before=due_before,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            options=crud.task.load_options(schemas.Task),
+            rows=rows,
         )
-    return tasks
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
+
+@router.get("/search", response_model=List[schemas.Task])
+def search_tasks(
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Search tasks by status, assignee, project, due date range (`due_after` <=
+    due_date < `due_before`) and free text `q` over title and description.
+
+    Non-superusers only see tasks in projects they own or assigned to them.
+    With `include_archived`, archived tasks are searched too.
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
+    """
+    deps.check_due_range(due_after, due_before)
+    visible_to = None if crud.user.is_superuser(current_user) else current_user.id
+    rows = list_rows(crud.task, schemas.Task)
+    filters = dict(
+        status=status,
+        assignee_id=assignee_id,
+        project_id=project_id,
+        due_after=due_after,
+        due_before=due_before,
+        text=q,
+        visible_to=visible_to,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        if include_archived:
+            tasks = crud.task_archive.search_with(
+                db, crud.task, schema=schemas.Task, fast=rows is not None, **filters
+            )
+        else:
+            tasks = crud.task.search(
+                db, options=crud.task.load_options(schemas.Task), rows=rows, **filters
+            )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = crud.task.next_cursor(tasks, limit=limit)
+    etag = collection_etag(tasks, related=("assignee",), extra=[next_cursor])
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, tasks, rows)
 
 @router.post("/", response_model=schemas.Task)
 def create_task(
     *,
     db: Session = Depends(get_db),
     task_in: schemas.TaskCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Create new task.
@@ -62,34 +197,115 @@ def create_task(
     task = crud.task.create(db, obj_in=task_in)
     return task
 
+@router.post("/bulk", response_model=schemas.TaskBulkCreateResult)
+def create_tasks_bulk(
+    *,
+    db: Session = Depends(get_db),
+    bulk_in: schemas.TaskBulkCreate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create many tasks at once.
+
+    Projects and assignees are validated with one query each and the valid
+    tasks are inserted together; invalid items are reported in `errors` by
+    their index in the request without aborting the batch.
+    """
+    project_owners = crud.project.get_owner_ids(
+        db, ids={t.project_id for t in bulk_in.tasks}
+    )
+    assignees = {
+        u.id: u
+        for u in crud.user.get_multi_by_ids(
+            db, ids={t.assignee_id for t in bulk_in.tasks if t.assignee_id}
+        )
+    }
+    is_superuser = crud.user.is_superuser(current_user)
+
+    valid: List[schemas.TaskCreate] = []
+    errors: List[schemas.BulkItemError] = []
+    for index, task_in in enumerate(bulk_in.tasks):
+        owner_id = project_owners.get(task_in.project_id)
+        if owner_id is None:
+            detail = "The project does not exist in the system"
+        elif not is_superuser and owner_id != current_user.id:
+            detail = "Not enough permissions to create task in this project"
+        elif task_in.assignee_id and task_in.assignee_id not in assignees:
+            detail = "The assignee does not exist in the system"
+        else:
+            valid.append(task_in)
+            continue
+        errors.append(schemas.BulkItemError(index=index, detail=detail))
+
+    created = crud.task.create_multi(db, objs_in=valid, assignees=assignees)
+    return {"created": created, "errors": errors}
+
+@router.post("/bulk-status", response_model=schemas.TaskBulkStatusResult)
+def update_task_status_bulk(
+    *,
+    db: Session = Depends(get_db),
+    bulk_in: schemas.TaskBulkStatusUpdate,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Move many tasks to a new status with a single UPDATE.
+
+    Select tasks by `task_ids`, or by `project_id` (optionally only those in
+    `from_status`). Non-superusers only change tasks in projects they own or
+    assigned to them; other requested ids are reported in `errors`.
+    """
+    actor_id = None if crud.user.is_superuser(current_user) else current_user.id
+    if bulk_in.project_id is not None:
+        owner_id = crud.project.get_owner_ids(db, ids=[bulk_in.project_id]).get(bulk_in.project_id)
+        if owner_id is None:
+            raise HTTPException(
+                status_code=404,
+                detail="The project does not exist in the system",
+            )
+        if actor_id is not None and owner_id == actor_id:
+            # Owners may change every task of their project
+            actor_id = None
+
+    updated = crud.task.update_status_multi(
+        db,
+        status=bulk_in.status,
+        ids=bulk_in.task_ids,
+        project_id=bulk_in.project_id,
+        from_status=bulk_in.from_status,
+        actor_id=actor_id,
+    )
+
+    errors: List[schemas.BulkItemError] = []
+    if bulk_in.task_ids is not None:
+        missing = set(bulk_in.task_ids) - set(updated)
+        if missing:
+            # Only the failures need classifying; the happy path is one statement
+            existing = set(crud.task.get_existing_ids(db, ids=missing))
+            for task_id in sorted(missing):
+                if task_id in existing:
+                    detail = "Not enough permissions to update this task"
+                else:
+                    detail = "The task does not exist in the system"
+                errors.append(schemas.BulkItemError(id=task_id, detail=detail))
+    return {"status": bulk_in.status, "updated": updated, "errors": errors}
+
 @router.put("/{task_id}", response_model=schemas.Task)
 def update_task(
     *,
     db: Session = Depends(get_db),
     task_id: int,
     task_in: schemas.TaskUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update a task.
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail="The task does not exist in the system",
-        )
-    
-    # Get the project to check permissions
-    project = crud.project.get(db, id=task.project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404,
-            detail="The project for this task does not exist",
-        )
+    # Task, project owner and the new assignee (if any) in one query
+    access = _get_task_access(db, task_id, assignee_id=task_in.assignee_id)
+    task = access.task
     
     # Check if user is project owner or superuser
-    is_owner = project.owner_id == current_user.id
+    is_owner = task.project.owner_id == current_user.id
     is_assignee = task.assignee_id == current_user.id
     
     if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
@@ -98,44 +314,41 @@ def update_task(
         )
     
     # If updating assignee, verify the new assignee exists
-    if task_in.assignee_id is not None:
-        user = crud.user.get(db, id=task_in.assignee_id)
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="The assignee does not exist in the system",
-            )
+    if task_in.assignee_id is not None and access.assignee is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The assignee does not exist in the system",
+        )
     
     task = crud.task.update(db, db_obj=task, obj_in=task_in)
+    if task is None:
+        # Deleted between the access check and the update
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
     return task
 
 @router.get("/{task_id}", response_model=schemas.TaskWithProject)
 def read_task(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     task_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    include_archived: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get task by ID.
+
+    With `include_archived`, archived tasks are found too (they are read-only).
+    Sends a weak `ETag`; a matching `If-None-Match` gets a 304 without a body.
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail="The task does not exist in the system",
-        )
-    
-    # Get the project to check permissions
-    project = crud.project.get(db, id=task.project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404,
-            detail="The project for this task does not exist",
-        )
+    task = _get_task_access(db, task_id, include_archived=include_archived).task
     
     # Check if user is project owner, task assignee, or superuser
-    is_owner = project.owner_id == current_user.id
+    is_owner = task.project.owner_id == current_user.id
     is_assignee = task.assignee_id == current_user.id
     
     if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
@@ -143,6 +356,9 @@ def read_task(
             status_code=400, detail="Not enough permissions to view this task"
         )
     
+    cached = not_modified(request, response, object_etag(task, related=("project",)))
+    if cached is not None:
+        return cached
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
@@ -150,33 +366,26 @@ def delete_task(
     *,
     db: Session = Depends(get_db),
     task_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Delete a task.
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail="The task does not exist in the system",
-        )
-    
-    # Get the project to check permissions
-    project = crud.project.get(db, id=task.project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404,
-            detail="The project for this task does not exist",
-        )
+    task = _get_task_access(db, task_id).task
     
     # Only project owner or superuser can delete tasks
-    if not (crud.user.is_superuser(current_user) or project.owner_id == current_user.id):
+    if not (crud.user.is_superuser(current_user) or task.project.owner_id == current_user.id):
         raise HTTPException(
             status_code=400, detail="Not enough permissions to delete this task"
         )
     
-    crud.task.remove(db=db, id=task_id)
+    task = crud.task.remove(db=db, id=task_id)
+    if task is None:
+        # Deleted between the access check and the delete
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
     return {"status": "deleted"}
 
 @router.post("/{task_id}/status/{status}", response_model=schemas.Task)
@@ -185,28 +394,15 @@ def update_task_status(
     db: Session = Depends(get_db),
     task_id: int,
     status: TaskStatus,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update task status.
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail="The task does not exist in the system",
-        )
-    
-    # Get the project to check permissions
-    project = crud.project.get(db, id=task.project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404,
-            detail="The project for this task does not exist",
-        )
+    task = _get_task_access(db, task_id).task
     
     # Check if user is project owner, task assignee, or superuser
-    is_owner = project.owner_id == current_user.id
+    is_owner = task.project.owner_id == current_user.id
     is_assignee = task.assignee_id == current_user.id
     
     if not (crud.user.is_superuser(current_user) or is_owner or is_assignee):
@@ -214,7 +410,13 @@ def update_task_status(
             status_code=400, detail="Not enough permissions to update this task"
         )
     
-    task = crud.task.update_status(db, db_obj=task, status=status)
+    task = crud.task.update_status_returning(db, db_obj=task, status=status)
+    if task is None:
+        # Deleted between the access check and the update
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
     return task
 
 @router.post("/{task_id}/assign/{user_id}", response_model=schemas.Task)
@@ -223,40 +425,50 @@ def assign_task(
     db: Session = Depends(get_db),
     task_id: int,
     user_id: Optional[int] = None,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Assign a task to a user.
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
+    access = _get_task_access(db, task_id, assignee_id=user_id)
+    task = access.task
+    
+    # Only project owner or superuser can assign tasks
+    if not (crud.user.is_superuser(current_user) or task.project.owner_id == current_user.id):
         raise HTTPException(
-            status_code=404,
-            detail="The task does not exist in the system",
+            status_code=400, detail="Not enough permissions to assign this task"
         )
     
-    # Get the project to check permissions
-    project = crud.project.get(db, id=task.project_id)
-    if not project:
+    # If user_id is provided, verify the user exists
+    if user_id is not None and access.assignee is None:
         raise HTTPException(
             status_code=404,
-            detail="The project for this task does not exist",
+            detail="The user does not exist in the system",
         )
     
-    # Only project owner or superuser can assign tasks
-    if not (crud.user.is_superuser(current_user) or project.owner_id == current_user.id):
+    task = crud.task.update_assignee_returning(db, db_obj=task, assignee=access.assignee)
+    if task is None:
+        # Deleted between the access check and the update
         raise HTTPException(
-            status_code=400, detail="Not enough permissions to assign this task"
+            status_code=404,
+            detail="The task does not exist in the system",
         )
-    
-    # If user_id is provided, verify the user exists
-    if user_id is not None:
-        user = crud.user.get(db, id=user_id)
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="The user does not exist in the system",
-            )
-    
-    task = crud.task.update_assignee(db, db_obj=task, assignee_id=user_id)
     return task
+
+def _get_task_access(
+    db: Session,
+    task_id: int,
+    *,
+    assignee_id: Optional[int] = None,
+    include_archived: bool = False,
+) -> TaskAccess:
+    """Load the task with its access context, or raise 404; archived tasks only with `include_archived`."""
+    access = crud.task.get_with_access(db, id=task_id, assignee_id=assignee_id)
+    if access is None and include_archived:
+        access = crud.task_archive.get_with_access(db, id=task_id)
+    if access is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The task does not exist in the system",
+        )
+    return access
@@ -1,44 +1,71 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.etag import collection_etag, not_modified, object_etag
+from app.api.fast_json import list_response, list_rows
+from app.api.pagination import set_next_cursor
+from app.core.principal_cache import Principal
+from app.crud.base import InvalidCursor
 from app.db.session import get_db
 
 router = APIRouter()
 
+MAX_BULK_USERS = 100
+
 @router.get("/", response_model=List[schemas.User])
 def read_users(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to page by keyset.
     """
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
-    # Defensive: filter out any rows with invalid emails to avoid pydantic EmailStr serialization errors
-    safe_users = []
-    for u in users:
-        try:
-            # Validate email format
-            _ = EmailStr.validate(u.email)
-            safe_users.append(u)
-        except Exception:
-            # Skip invalid row
-            continue
-    return safe_users
+    rows = list_rows(crud.user, schemas.User)
+    try:
+        users = crud.user.get_multi(db, skip=skip, limit=limit, cursor=cursor, rows=rows)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Cursor comes from the last fetched row so skipped invalid rows don't stall paging
+    next_cursor = crud.user.next_cursor(users, limit=limit)
+    if rows is not None:
+        # Emails were validated on the way in (UserCreate/UserUpdate) and
+        # schemas.User renders them as plain strings: nothing to filter
+        safe_users = users
+    else:
+        # Defensive: filter out any rows with invalid emails to avoid pydantic EmailStr serialization errors
+        safe_users = []
+        for u in users:
+            try:
+                # Validate email format
+                _ = EmailStr.validate(u.email)
+                safe_users.append(u)
+            except Exception:
+                # Skip invalid row
+                continue
+    cached = not_modified(request, response, collection_etag(safe_users, extra=[next_cursor]))
+    if cached is not None:
+        return cached
+    set_next_cursor(response, next_cursor)
+    return list_response(response, safe_users, rows)
 
 @router.post("/", response_model=schemas.User)
 def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: schemas.UserCreate,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Create new user.
@@ -52,31 +79,69 @@ def create_user(
     user = crud.user.create(db, obj_in=user_in)
     return user
 
+@router.post("/bulk", response_model=List[schemas.User])
+def create_users_bulk(
+    *,
+    db: Session = Depends(get_db),
+    users_in: List[schemas.UserCreate],
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Create several users at once.
+
+    Passwords are hashed in parallel; the whole batch is rejected if any
+    email is duplicated or already registered.
+    """
+    if len(users_in) > MAX_BULK_USERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_USERS} users can be created per request",
+        )
+    emails = [u.email for u in users_in]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate emails in request")
+    existing = crud.user.get_existing_emails(db, emails=emails)
+    if existing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Users with these emails already exist: {', '.join(sorted(existing))}",
+        )
+    return crud.user.create_multi(db, objs_in=users_in)
+
 @router.get("/me", response_model=schemas.User)
 def read_user_me(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get current user.
     """
+    cached = not_modified(request, response, object_etag(current_user))
+    if cached is not None:
+        return cached
     return current_user
 
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user_by_id(
+    request: Request,
+    response: Response,
     user_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_principal),
+    db: Session = Depends(deps.get_read_db),
 ) -> Any:
     """
     Get a specific user by id.
     """
     user = crud.user.get(db, id=user_id)
-    if user == current_user:
-        return user
-    if not crud.user.is_superuser(current_user):
+    is_self = user is not None and user.id == current_user.id
+    if not is_self and not crud.user.is_superuser(current_user):
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
+    cached = not_modified(request, response, object_etag(user))
+    if cached is not None:
+        return cached
     return user
 
 @router.put("/me", response_model=schemas.User)
@@ -84,12 +149,16 @@ def update_user_me(
     *,
     db: Session = Depends(get_db),
     user_in: schemas.UserUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update own user.
     """
-    user = crud.user.update(db, db_obj=current_user, obj_in=user_in)
+    user = crud.user.get(db, id=current_user.id)
+    if not user:
+        # Deleted while another process still had the principal cached
+        raise HTTPException(status_code=404, detail="User not found")
+    user = crud.user.update(db, db_obj=user, obj_in=user_in)
     return user
 
 @router.put("/{user_id}", response_model=schemas.User)
@@ -98,7 +167,7 @@ def update_user(
     db: Session = Depends(get_db),
     user_id: int,
     user_in: schemas.UserUpdate,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Update a user.
@@ -117,7 +186,7 @@ def delete_user(
     *,
     db: Session = Depends(get_db),
     user_id: int,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Delete a user.
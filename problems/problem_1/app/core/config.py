@@ -15,7 +15,9 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
-    DATABASE_URL: Optional[PostgresDsn] = None
+    # A plain str: validating a PostgresDsn compiles pydantic's URL regex, which
+    # took a large share of import time; the engine parses the URL anyway
+    DATABASE_URL: Optional[str] = None
 
     @validator("DATABASE_URL", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
@@ -29,6 +31,49 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
     
+    # Connection pool, shared by every get_db in the process (see app.db.session).
+    # Size it so workers * (POOL_SIZE + MAX_OVERFLOW) stays under max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 30
+    # Server-side statement_timeout per connection; 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    # Read replicas (JSON list or comma-separated DSNs) serving the read-only
+    # GET endpoints, in turn; empty sends every query to DATABASE_URL
+    DATABASE_REPLICA_URLS: List[str] = []
+    # After a write, that client's reads stay on the primary this long so it
+    # sees its own changes; keep it above the replicas' usual lag
+    REPLICA_PIN_SECONDS: int = 5
+    # Statements slower than this are logged with their route; 0 disables the log
+    SLOW_QUERY_MS: int = 200
+    # Writes fill server defaults through INSERT/UPDATE ... RETURNING; false
+    # goes back to a refresh SELECT after every commit (benchmark baseline)
+    DB_WRITE_RETURNING: bool = True
+    # Before serving, open this many connections per pool (default and at most
+    # DB_POOL_SIZE), run each service's hot statements and ping Redis; /health
+    # answers 503 until that is done (see app.core.warmup)
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: Optional[int] = None
+
+    # List endpoints read only the response columns as rows and encode them
+    # straight to JSON (orjson), skipping ORM objects and pydantic; false goes
+    # back to response_model serialization (benchmark baseline)
+    FAST_LIST_SERIALIZATION: bool = True
+    # Rows fetched per server-side cursor round trip by the streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Task archival (archive_tasks.py): Done tasks unchanged for this many days
+    # move to tasks_archive, BATCH_SIZE per transaction with PAUSE_MS between
+    # batches; with --loop the job runs again every INTERVAL_SECONDS
+    TASK_ARCHIVE_AFTER_DAYS: int = 365
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_PAUSE_MS: int = 100
+    TASK_ARCHIVE_INTERVAL_SECONDS: int = 3600
+
+    # Serve /api/v1 from the async (asyncpg) stack instead of the sync one
+    USE_ASYNC_DB: bool = False
+
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -40,7 +85,34 @@ class Settings(BaseSettings):
     # Messaging / Caching
     REDIS_URL: str = "redis://redis:6379/0"
 
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
+    # Principal cache (id/is_active/is_superuser per user). The local TTL bounds
+    # how long another process may still accept a deactivated user.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 5
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Decoded access tokens, each kept until its `exp`; 0 disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Query cache for the owner's project list
+    # (app.core.query_cache): writes invalidate it through Redis generation
+    # counters. Results longer than MAX_ITEMS are not cached. A positive
+    # GENERATION_TTL saves the per-lookup Redis read but lets another process's
+    # writes go unseen that long.
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_TTL_SECONDS: int = 30
+    QUERY_CACHE_MAX_ENTRIES: int = 1000
+    QUERY_CACHE_MAX_ITEMS: int = 500
+    QUERY_CACHE_GENERATION_TTL_SECONDS: float = 0
+
+    # Password hashing pool. Keep WORKERS + MAX_PENDING below the anyio
+    # threadpool size (40) so waiting callers cannot take every thread.
+    # WORKERS=0 hashes inline in the request thread.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    @validator("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS", pre=True)
     def assemble_cors_origins(cls, v):
         if isinstance(v, str):
             # Try JSON list first, fallback to comma-separated
@@ -57,4 +129,11 @@ class Settings(BaseSettings):
         case_sensitive = True
         env_file = ".env"
 
+        @classmethod
+        def parse_env_var(cls, field_name: str, raw_val: str) -> Any:
+            # Left to the validator above, which also takes comma-separated lists
+            if field_name in ("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS"):
+                return raw_val
+            return cls.json_loads(raw_val)
+
 settings = Settings()
@@ -1,19 +1,21 @@
-from sqlalchemy import create_engine
+"""Declarative base for the models; engines and sessions live in `app.db.session`.
+
+`SessionLocal`, `get_db` and `engine` are re-exported so existing imports
+keep working and still draw from the one process-wide pool.
+"""
+from typing import Any
+
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+
 from .config import settings
+from ..db.session import SessionLocal, get_db, get_engine  # noqa: F401
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 Base = declarative_base()
 
-def get_db():
-    """Dependency that provides a database session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def __getattr__(name: str) -> Any:
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,15 +2,13 @@ from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import settings
+from app.core.principal_cache import Principal, get_principal
 from app.db.session import SessionLocal
-from app.models.user import User
-from app.schemas.token import TokenPayload
+from app.core.token_cache import InvalidToken, token_cache
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -31,32 +29,32 @@ def get_db() -> Generator:
 
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+) -> Principal:
     """
     Get the current user from the JWT token.
     
+    The user's id and flags come from the principal cache, so the `users`
+    row is only read on a cache miss.
+    
     Args:
         db: Database session.
         token: JWT token from the request header.
         
     Returns:
-        User: The current authenticated user.
+        Principal: The current authenticated user's id and flags.
         
     Raises:
         HTTPException: If the token is invalid or the user doesn't exist.
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+        token_data = token_cache.decode(token)
+    except InvalidToken:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
     
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    user = get_principal(db, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -66,8 +64,8 @@ def get_current_user(
     return user
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Check if the current user is a superuser.
     
@@ -75,7 +73,7 @@ def get_current_active_superuser(
         current_user: The current authenticated user.
         
     Returns:
-        User: The current authenticated superuser.
+        Principal: The current authenticated superuser.
         
     Raises:
         HTTPException: If the user is not a superuser.
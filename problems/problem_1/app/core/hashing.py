@@ -0,0 +1,225 @@
+"""bcrypt hashing and verification on a dedicated process pool.
+
+bcrypt is deliberately slow CPU work. Run inline in sync endpoints it holds
+an anyio worker thread for its whole duration, so a burst of logins starves
+every other sync endpoint of threads. Here the work runs in a bounded
+process pool, and admission control rejects calls beyond
+`PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING` in flight with a 503
+instead of letting them queue up behind the pool.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence
+
+import anyio
+from fastapi import HTTPException, status
+
+from .config import settings
+from .metrics import counter, gauge, histogram
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+HASH_SECONDS = histogram(
+    "password_hash_seconds",
+    "Wall time of password hashing operations, including time queued for the pool",
+    ["op"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+IN_FLIGHT = gauge("password_hash_in_flight", "Password hashing operations running or queued")
+REJECTED = counter("password_hash_rejected", "Hashing calls rejected because the pool was saturated")
+
+
+class HashingOverloaded(HTTPException):
+    """Raised when the hashing pool is saturated; surfaces as 503 with Retry-After."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is overloaded, retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """The passlib context, built on first use (in each pool worker, not at import)."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def __getattr__(name: str) -> Any:
+    # `pwd_context` used to be a module attribute; keep it importable without building it eagerly
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, *, workers: int, max_pending: int, retry_after: int):
+        """
+        `workers` processes hash concurrently and up to `max_pending` more calls
+        may wait for them. With `workers=0` hashing runs in the calling thread
+        and admission control is disabled.
+        """
+        self.workers = workers
+        self.retry_after = retry_after
+        self._capacity = workers + max_pending
+        self._slots = threading.BoundedSemaphore(max(self._capacity, 1))
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run("verify", _verify, plain_password, hashed_password)
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Hash a batch in parallel across the pool.
+
+        Items wait up to `retry_after` seconds each for a free slot, so a batch
+        larger than the pool is fed through it rather than rejected outright.
+        """
+        if not self.workers:
+            return [self.hash(p) for p in passwords]
+        started = time.perf_counter()
+        futures: List[Future] = []
+        try:
+            for password in passwords:
+                futures.append(self._submit(_hash, password, timeout=self.retry_after))
+            hashes = [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+        HASH_SECONDS.labels(op="hash_many").observe(time.perf_counter() - started)
+        return hashes
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async("hash", _hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run_async("verify", _verify, plain_password, hashed_password)
+
+    async def _run_async(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        # Awaits the pool future directly, so no event-loop thread is held while hashing
+        started = time.perf_counter()
+        if self.workers:
+            result = await asyncio.wrap_future(self._submit(fn, *args))
+        else:
+            result = await anyio.to_thread.run_sync(fn, *args)
+        HASH_SECONDS.labels(op=op).observe(time.perf_counter() - started)
+        return result
+
+    def _run(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        if self.workers:
+            result = self._submit(fn, *args).result()
+        else:
+            result = fn(*args)
+        HASH_SECONDS.labels(op=op).observe(time.perf_counter() - started)
+        return result
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Future:
+        acquired = (
+            self._slots.acquire(timeout=timeout) if timeout else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            REJECTED.inc()
+            raise HashingOverloaded(self.retry_after)
+        self._track(1)
+        try:
+            future = self._pool().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool once
+            self._reset_pool()
+            try:
+                future = self._pool().submit(fn, *args)
+            except BaseException:
+                self._release()
+                raise
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        self._release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._reset_pool()
+
+    def _release(self) -> None:
+        self._track(-1)
+        self._slots.release()
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._in_flight += delta
+            IN_FLIGHT.set(self._in_flight)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a process that holds DB/Redis sockets and threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash on the hashing pool."""
+    return hasher.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Generate a password hash on the hashing pool."""
+    return hasher.hash(password)
+
+
+def get_password_hashes(passwords: Sequence[str]) -> List[str]:
+    """Generate hashes for a batch of passwords in parallel."""
+    return hasher.hash_many(passwords)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hasher.verify_async(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hasher.hash_async(password)
@@ -0,0 +1,45 @@
+"""Prometheus collectors shared by the services.
+
+Modules under `app.core` are imported both as `app.core.*` (Problem 1/2) and
+as `problems.problem_1.app.core.*` (Problem 2/3), sometimes in the same
+process. Registering a collector twice raises, so these helpers return the
+collector already registered under the same name instead.
+"""
+from typing import Any, Sequence, Type, TypeVar
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+CollectorType = TypeVar("CollectorType", Counter, Gauge, Histogram)
+
+
+def _get_or_create(
+    cls: Type[CollectorType],
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    **kwargs: Any,
+) -> CollectorType:
+    existing = REGISTRY._names_to_collectors.get(name)  # type: ignore[attr-defined]
+    if existing is not None:
+        return existing  # type: ignore[return-value]
+    return cls(name, documentation, labelnames, **kwargs)
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Return the process-wide Counter called `name` (without the `_total` suffix)."""
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Return the process-wide Gauge called `name`."""
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    **kwargs: Any,
+) -> Histogram:
+    """Return the process-wide Histogram called `name`; `kwargs` may set `buckets`."""
+    return _get_or_create(Histogram, name, documentation, labelnames, **kwargs)
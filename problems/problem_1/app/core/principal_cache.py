@@ -0,0 +1,278 @@
+"""Cache of the authorization-relevant columns of `users`, keyed by user id.
+
+Every authenticated request needs only `id`, `is_active` and `is_superuser`
+of the caller. Lookups go through a per-process TTL LRU first, then Redis
+(shared by all services), and only then Postgres.
+
+Writes invalidate both layers of the writing process plus Redis. Other
+processes may keep a stale entry for up to `PRINCIPAL_CACHE_TTL_SECONDS`,
+which bounds how long a deactivation can go unnoticed.
+
+An invalidation also bumps a per-user generation in Redis. A miss reads the
+generation together with the entry, before loading, and the loaded principal
+is written back only while the generation is unchanged: a load that read
+the row before a write cannot land in Redis after that write invalidated it.
+The per-process layer skips the fill the same way if this process
+invalidated anything meanwhile.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Tuple
+
+import anyio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+from .config import settings
+from .metrics import counter
+from .ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import redis
+
+logger = logging.getLogger(__name__)
+
+LOOKUPS = counter(
+    "principal_cache_lookups",
+    "Principal cache lookups by the layer that answered them",
+    ["result"],
+)
+
+# After a Redis error, skip Redis for this long instead of paying a timeout per request
+REDIS_RETRY_SECONDS = 5.0
+
+# KEYS: entry, generation; ARGV: generation read before loading, entry, ttl
+SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def _redis() -> ModuleType:
+    # Imported with the first client, not at startup
+    import redis
+
+    return redis
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, as far as authorization is concerned."""
+
+    id: int
+    is_active: bool
+    is_superuser: bool
+
+
+class PrincipalCache:
+    def __init__(
+        self,
+        *,
+        redis_url: Optional[str],
+        ttl: float,
+        redis_ttl: int,
+        maxsize: int,
+        key_prefix: str = "principal:",
+    ):
+        self.redis_url = redis_url
+        self.redis_ttl = redis_ttl
+        self.key_prefix = key_prefix
+        self._local: TTLCache[Principal] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._redis: Optional["redis.Redis"] = None
+        self._set_if_current: Optional["redis.commands.core.Script"] = None
+        self._redis_lock = threading.Lock()
+        self._redis_down_until = 0.0
+        # Bumped by every invalidate; a fill started before one is not kept locally
+        self._invalidations = 0
+
+    def get(
+        self, user_id: int, loader: Callable[[int], Optional[Principal]]
+    ) -> Optional[Principal]:
+        """Return the principal for `user_id`, calling `loader` only on a full miss."""
+        principal = self._local.get(user_id)
+        if principal is not None:
+            LOOKUPS.labels(result="local_hit").inc()
+            return principal
+
+        invalidations = self._invalidations
+        principal, generation = self._redis_get(user_id)
+        if principal is not None:
+            LOOKUPS.labels(result="redis_hit").inc()
+            self._local_set(principal, invalidations)
+            return principal
+
+        LOOKUPS.labels(result="miss").inc()
+        principal = loader(user_id)
+        if principal is not None:
+            self._local_set(principal, invalidations)
+            self._redis_set(principal, generation)
+        return principal
+
+    async def get_async(
+        self, user_id: int, loader: Callable[[int], Awaitable[Optional[Principal]]]
+    ) -> Optional[Principal]:
+        """Async `get`: Redis calls run in a worker thread, `loader` is awaited."""
+        principal = self._local.get(user_id)
+        if principal is not None:
+            LOOKUPS.labels(result="local_hit").inc()
+            return principal
+
+        invalidations = self._invalidations
+        principal, generation = await anyio.to_thread.run_sync(self._redis_get, user_id)
+        if principal is not None:
+            LOOKUPS.labels(result="redis_hit").inc()
+            self._local_set(principal, invalidations)
+            return principal
+
+        LOOKUPS.labels(result="miss").inc()
+        principal = await loader(user_id)
+        if principal is not None:
+            self._local_set(principal, invalidations)
+            await anyio.to_thread.run_sync(self._redis_set, principal, generation)
+        return principal
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the user's entries and start a new generation; call once the write has committed."""
+        self._invalidations += 1
+        self._local.pop(user_id)
+        client = self._client()
+        if client is None:
+            return
+        generation_key = self._generation_key(user_id)
+        try:
+            # MULTI: no reader sees the new generation alongside the old entry
+            pipe = client.pipeline()
+            pipe.incr(generation_key)
+            # Only has to outlive a load in flight; a missing key reads as 0
+            pipe.expire(generation_key, self.redis_ttl)
+            pipe.delete(self._key(user_id))
+            pipe.execute()
+        except _redis().RedisError:
+            self._mark_redis_down()
+
+    def ping(self) -> bool:
+        """Open the Redis connection ahead of the first lookup; False if Redis is unavailable."""
+        client = self._client()
+        if client is None:
+            return False
+        try:
+            return bool(client.ping())
+        except _redis().RedisError:
+            self._mark_redis_down()
+            return False
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}gen:{user_id}"
+
+    def _client(self) -> Optional["redis.Redis"]:
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            with self._redis_lock:
+                if self._redis is None:
+                    client = _redis().from_url(
+                        self.redis_url,
+                        decode_responses=True,
+                        socket_connect_timeout=0.25,
+                        socket_timeout=0.25,
+                    )
+                    self._set_if_current = client.register_script(SET_IF_CURRENT)
+                    self._redis = client
+        return self._redis
+
+    def _mark_redis_down(self) -> None:
+        logger.warning("Principal cache: Redis unavailable, using local cache and DB only")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _local_set(self, principal: Principal, invalidations: int) -> None:
+        # An invalidate since the lookup started may have dropped this very entry
+        if invalidations == self._invalidations:
+            self._local.set(principal.id, principal)
+
+    def _redis_get(self, user_id: int) -> Tuple[Optional[Principal], Optional[str]]:
+        """The Redis entry (if any) and the user's generation; the generation is None if Redis is unavailable."""
+        client = self._client()
+        if client is None:
+            return None, None
+        try:
+            raw, generation = client.mget([self._key(user_id), self._generation_key(user_id)])
+        except _redis().RedisError:
+            self._mark_redis_down()
+            return None, None
+        generation = generation or "0"
+        if raw is None:
+            return None, generation
+        try:
+            return Principal(**json.loads(raw)), generation
+        except (TypeError, ValueError):
+            return None, generation
+
+    def _redis_set(self, principal: Principal, generation: Optional[str]) -> None:
+        """Store the principal unless the user was invalidated since `generation` was read."""
+        if generation is None:
+            return
+        client = self._client()
+        if client is None:
+            return
+        try:
+            self._set_if_current(
+                keys=[self._key(principal.id), self._generation_key(principal.id)],
+                args=[generation, json.dumps(asdict(principal)), self.redis_ttl],
+                client=client,
+            )
+        except _redis().RedisError:
+            self._mark_redis_down()
+
+
+principal_cache = PrincipalCache(
+    redis_url=settings.REDIS_URL,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    redis_ttl=settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Read the principal columns straight from `users`, bypassing the cache."""
+    row = (
+        db.query(User.id, User.is_active, User.is_superuser)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return Principal(id=row.id, is_active=bool(row.is_active), is_superuser=bool(row.is_superuser))
+
+
+def get_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Cached principal lookup; `db` is only used on a miss."""
+    return principal_cache.get(user_id, lambda uid: load_principal(db, uid))
+
+
+async def load_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    row = (
+        await db.execute(
+            select(User.id, User.is_active, User.is_superuser).where(User.id == user_id)
+        )
+    ).first()
+    if row is None:
+        return None
+    return Principal(id=row.id, is_active=bool(row.is_active), is_superuser=bool(row.is_superuser))
+
+
+async def get_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    return await principal_cache.get_async(user_id, lambda uid: load_principal_async(db, uid))
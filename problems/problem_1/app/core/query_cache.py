@@ -0,0 +1,342 @@
+"""Versioned cache of CRUD read results, invalidated through generation counters.
+
+A cached read is stored under a key that includes the current generation of
+every scope its result depends on (for example `projects:owner:7`). A write
+bumps the generation of each scope it changes, one INCR apiece, which makes
+every result cached under the old generation unreachable: invalidation is
+O(1), and no key is ever scanned or deleted (orphaned entries expire).
+
+Results are looked up in a per-process TTL LRU first, then Redis (shared by
+all processes), and only then loaded. Generations live in Redis, or
+in-process when `REDIS_URL` is empty (exact for a single process only).
+Each lookup reads its generations with one MGET, or from a local copy kept
+for `QUERY_CACHE_GENERATION_TTL_SECONDS` (default 0: always read them),
+which is how long another process's write may go unnoticed. While Redis is
+unreachable, lookups bypass the cache and store nothing. A bump Redis did
+not take is logged, counted, clears this process's copies and is kept: it
+is replayed before the next lookup once Redis answers, and lookups bypass
+the cache until then. Other processes may serve the old generation
+meanwhile, for at most the TTL.
+
+Bump after the write has committed, so a result read before the commit can
+only be stored under the old generation. Reads from a replica pass
+`fill=False`: they are served from the cache but never stored, since a
+lagging replica could return a result from before the write, which would
+then be cached under the new generation.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import hashlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set
+
+import anyio
+import orjson
+
+from .config import settings
+from .metrics import counter, gauge
+from .ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import redis
+
+logger = logging.getLogger(__name__)
+
+LOOKUPS = counter(
+    "query_cache_lookups",
+    "Cached CRUD reads by the layer that answered them (bypass: Redis unavailable)",
+    ["name", "result"],
+)
+ENTRIES = gauge("query_cache_entries", "CRUD read results held in the per-process cache")
+BUMP_FAILURES = counter(
+    "query_cache_bump_failures",
+    "Scope generations Redis failed to bump, replayed once it is back",
+)
+
+# After a Redis error, skip Redis for this long instead of paying a timeout per lookup
+REDIS_RETRY_SECONDS = 5.0
+
+Items = List[Any]
+
+
+def _redis() -> ModuleType:
+    # Imported with the first client, not at startup
+    import redis
+
+    return redis
+
+
+class QueryCache:
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        redis_url: Optional[str],
+        ttl: float,
+        maxsize: int,
+        max_items: int,
+        generation_ttl: float,
+        key_prefix: str = "query:",
+    ):
+        self.enabled = enabled
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.max_items = max_items
+        self.key_prefix = key_prefix
+        self._local: TTLCache[Items] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # maxsize 0 keeps nothing: every lookup reads the generations from Redis
+        self._generations: TTLCache[int] = TTLCache(
+            maxsize=maxsize if generation_ttl > 0 else 0, ttl=generation_ttl
+        )
+        # The generations themselves when there is no Redis
+        self._own_generations: Dict[str, int] = {}
+        self._own_lock = threading.Lock()
+        self._redis: Optional["redis.Redis"] = None
+        self._redis_lock = threading.Lock()
+        self._redis_down_until = 0.0
+        # Scopes whose bump Redis missed, replayed before the next lookup
+        self._pending: Set[str] = set()
+        self._pending_lock = threading.Lock()
+
+    def get(
+        self,
+        name: str,
+        params: Mapping[str, Any],
+        scopes: Sequence[str],
+        loader: Callable[[], Items],
+        *,
+        restore: Optional[Callable[[Any], Any]] = None,
+        ttl: Optional[float] = None,
+        fill: bool = True,
+    ) -> Items:
+        """
+        The result of read `name` with `params`, calling `loader` only on a miss.
+
+        `restore` turns an item read back from Redis (JSON) into what `loader`
+        returns; `fill=False` leaves what `loader` returns uncached. Callers
+        must not modify the items: they may be shared.
+        """
+        key = self._key(name, params, scopes)
+        if key is None:
+            LOOKUPS.labels(name=name, result="bypass").inc()
+            return loader()
+        items = self._local.get(key)
+        if items is not None:
+            LOOKUPS.labels(name=name, result="local_hit").inc()
+            return items
+        items = self._redis_get(key, restore)
+        if items is not None:
+            LOOKUPS.labels(name=name, result="redis_hit").inc()
+            self._local_set(key, items, ttl)
+            return items
+        LOOKUPS.labels(name=name, result="miss").inc()
+        items = loader()
+        if fill:
+            self._store(key, items, ttl)
+        return items
+
+    async def get_async(
+        self,
+        name: str,
+        params: Mapping[str, Any],
+        scopes: Sequence[str],
+        loader: Callable[[], Awaitable[Items]],
+        *,
+        restore: Optional[Callable[[Any], Any]] = None,
+        ttl: Optional[float] = None,
+        fill: bool = True,
+    ) -> Items:
+        """Async `get`: Redis calls run in a worker thread, `loader` is awaited."""
+        key = await anyio.to_thread.run_sync(self._key, name, params, scopes)
+        if key is None:
+            LOOKUPS.labels(name=name, result="bypass").inc()
+            return await loader()
+        items = self._local.get(key)
+        if items is not None:
+            LOOKUPS.labels(name=name, result="local_hit").inc()
+            return items
+        items = await anyio.to_thread.run_sync(self._redis_get, key, restore)
+        if items is not None:
+            LOOKUPS.labels(name=name, result="redis_hit").inc()
+            self._local_set(key, items, ttl)
+            return items
+        LOOKUPS.labels(name=name, result="miss").inc()
+        items = await loader()
+        if fill:
+            await anyio.to_thread.run_sync(self._store, key, items, ttl)
+        return items
+
+    def generations(self, scopes: Sequence[str]) -> Optional[List[int]]:
+        """
+        The current generation of each scope, or None while Redis is
+        unreachable or still owed a bump.
+        """
+        if not self.redis_url:
+            with self._own_lock:
+                return [self._own_generations.get(scope, 0) for scope in scopes]
+        # Checked even when every generation is known locally
+        client = self._client()
+        if client is None or not self._replay_pending(client):
+            return None
+        found = {scope: self._generations.get(scope) for scope in scopes}
+        missing = [scope for scope, generation in found.items() if generation is None]
+        if missing:
+            try:
+                values = client.mget([self._generation_key(scope) for scope in missing])
+            except _redis().RedisError:
+                self._mark_redis_down()
+                return None
+            for scope, value in zip(missing, values):
+                found[scope] = int(value or 0)
+                self._generations.set(scope, found[scope])
+        return [found[scope] for scope in scopes]
+
+    def bump(self, *scopes: str) -> None:
+        """Start a new generation of each scope; call once the write has committed."""
+        scopes = tuple(sorted(set(scopes)))
+        if not self.enabled or not scopes:
+            return
+        if not self.redis_url:
+            with self._own_lock:
+                for scope in scopes:
+                    self._own_generations[scope] = self._own_generations.get(scope, 0) + 1
+            return
+        for scope in scopes:
+            self._generations.pop(scope)
+        client = self._client()
+        if client is None or not self._incr(client, scopes):
+            self._bump_failed(scopes)
+
+    async def bump_async(self, *scopes: str) -> None:
+        """`bump` from async code, with the Redis round trip in a worker thread."""
+        if self.enabled and scopes:
+            await anyio.to_thread.run_sync(self.bump, *scopes)
+
+    def ping(self) -> bool:
+        """Open the Redis connection ahead of the first lookup; False if Redis is unavailable."""
+        client = self._client()
+        if client is None:
+            return False
+        try:
+            return bool(client.ping())
+        except _redis().RedisError:
+            self._mark_redis_down()
+            return False
+
+    def clear(self) -> None:
+        """Drop this process's copies (results and generations); Redis is left alone."""
+        self._local.clear()
+        self._generations.clear()
+        ENTRIES.set(0)
+
+    def _key(self, name: str, params: Mapping[str, Any], scopes: Sequence[str]) -> Optional[str]:
+        generations = self.generations(scopes)
+        if generations is None:
+            return None
+        digest = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"{self.key_prefix}{name}:{'.'.join(map(str, generations))}:{digest}"
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self.key_prefix}gen:{scope}"
+
+    def _incr(self, client: "redis.Redis", scopes: Sequence[str]) -> bool:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.incr(self._generation_key(scope))
+            values = pipe.execute()
+        except _redis().RedisError:
+            self._mark_redis_down()
+            return False
+        for scope, value in zip(scopes, values):
+            self._generations.set(scope, int(value))
+        return True
+
+    def _bump_failed(self, scopes: Sequence[str]) -> None:
+        logger.warning(
+            "Query cache: Redis missed the bump of %s, bypassing the cache until it is replayed",
+            ", ".join(scopes),
+        )
+        BUMP_FAILURES.inc(len(scopes))
+        with self._pending_lock:
+            self._pending.update(scopes)
+        # Our copies may be of the old generation; other processes' expire with their TTL
+        self.clear()
+
+    def _replay_pending(self, client: "redis.Redis") -> bool:
+        """Bump the scopes Redis missed; False while that still fails."""
+        if not self._pending:
+            return True
+        # Held across the round trip, so a bump that fails meanwhile is not dropped
+        with self._pending_lock:
+            scopes = sorted(self._pending)
+            if scopes and not self._incr(client, scopes):
+                return False
+            self._pending.clear()
+        return True
+
+    def _client(self) -> Optional["redis.Redis"]:
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            with self._redis_lock:
+                if self._redis is None:
+                    self._redis = _redis().from_url(
+                        self.redis_url,
+                        socket_connect_timeout=0.25,
+                        socket_timeout=0.25,
+                    )
+        return self._redis
+
+    def _mark_redis_down(self) -> None:
+        logger.warning("Query cache: Redis unavailable, reading from the database")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _redis_get(self, key: str, restore: Optional[Callable[[Any], Any]]) -> Optional[Items]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(key)
+        except _redis().RedisError:
+            self._mark_redis_down()
+            return None
+        if raw is None:
+            return None
+        try:
+            items = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(items, list):
+            return None
+        return [restore(item) for item in items] if restore is not None else items
+
+    def _local_set(self, key: str, items: Items, ttl: Optional[float]) -> None:
+        self._local.set(key, items, ttl=ttl)
+        ENTRIES.set(len(self._local))
+
+    def _store(self, key: str, items: Items, ttl: Optional[float]) -> None:
+        # Long results are not worth the memory, here or in Redis
+        if len(items) > self.max_items:
+            return
+        self._local_set(key, items, ttl)
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.set(key, orjson.dumps(items), ex=int(ttl or self.ttl))
+        except _redis().RedisError:
+            self._mark_redis_down()
+
+
+query_cache = QueryCache(
+    enabled=settings.QUERY_CACHE_ENABLED,
+    redis_url=settings.REDIS_URL,
+    ttl=settings.QUERY_CACHE_TTL_SECONDS,
+    maxsize=settings.QUERY_CACHE_MAX_ENTRIES,
+    max_items=settings.QUERY_CACHE_MAX_ITEMS,
+    generation_ttl=settings.QUERY_CACHE_GENERATION_TTL_SECONDS,
+)
@@ -1,12 +1,22 @@
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-
 from app.core.config import settings
+# bcrypt runs on a dedicated process pool; re-exported for existing callers
+from app.core.hashing import (  # noqa: F401
+    get_password_hash,
+    get_password_hashes,
+    get_pwd_context,
+    verify_password,
+)
+
+
+def __getattr__(name: str) -> Any:
+    # `pwd_context` is built on first use (see app.core.hashing)
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -19,6 +29,8 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     Returns:
         str: Encoded JWT token
     """
+    from jose import jwt  # loaded on first login, not at startup
+
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -31,11 +43,3 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
         algorithm=settings.ALGORITHM
     )
     return encoded_jwt
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Generate a password hash."""
-    return pwd_context.hash(password)
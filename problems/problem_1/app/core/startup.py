@@ -0,0 +1,151 @@
+"""Startup profiling for the three services.
+
+Each `main` module imports this first, marks the end of its import and
+app-construction phases with `mark`, and calls `report` from its lifespan
+once the app is ready to serve. The report is logged at boot and exported as
+`startup_phase_seconds{phase}`:
+
+* `imports`: from this module's import until `mark("imports")`
+* `app`: building the FastAPI app, middleware and routes
+* `lifespan`: the lifespan startup work, mostly the warmup, whose steps are
+  timed as `warmup_<step>` phases (see `warmup`)
+* `total`: process start (this import) until `report`
+
+With `STARTUP_PROFILE_IMPORTS=1` every first-time import after this module is
+timed as well and listed in `python -X importtime` format (self and
+cumulative microseconds), slowest first, for those taking at least
+`STARTUP_PROFILE_MIN_US` (default 1000) cumulatively.
+
+Only the standard library is imported here (the metric is imported when
+reporting), so the timings include everything the service itself loads.
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# uvicorn configures this logger at INFO, so the report shows in the boot log
+logger = logging.getLogger("uvicorn.error")
+
+PROFILE_IMPORTS = os.getenv("STARTUP_PROFILE_IMPORTS", "").lower() in ("1", "true", "yes")
+PROFILE_MIN_US = int(os.getenv("STARTUP_PROFILE_MIN_US", "1000"))
+
+_started = time.perf_counter()
+_last_mark = _started
+_phases: Dict[str, float] = {}
+_reported = False
+
+# (self us, cumulative us, module) per traced import; the stack holds the
+# children's cumulative time of each import in progress
+_imports: List[Tuple[int, int, str]] = []
+_stack: List[int] = []
+_original_import = builtins.__import__
+
+
+def _timed_import(module: str) -> None:
+    # Parent packages first, so each is listed on its own as with -X importtime
+    parent = module.rpartition(".")[0]
+    if parent and parent not in sys.modules:
+        _timed_import(parent)
+        if module in sys.modules:
+            return
+    _stack.append(0)
+    start = time.perf_counter_ns()
+    try:
+        _original_import(module)
+    finally:
+        cumulative = (time.perf_counter_ns() - start) // 1000
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += cumulative
+    _imports.append((cumulative - children, cumulative, module))
+
+
+def _traced_import(
+    name: str,
+    globals: Optional[Dict[str, Any]] = None,
+    locals: Optional[Dict[str, Any]] = None,
+    fromlist: Any = (),
+    level: int = 0,
+) -> Any:
+    module = name
+    if level:
+        module = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+    if module not in sys.modules:
+        _timed_import(module)
+    # importlib loads the submodules named in a fromlist without going through
+    # __import__; load them here so they are not counted as the package's own time
+    package = sys.modules.get(module)
+    for attr in fromlist or ():
+        submodule = f"{module}.{attr}"
+        if attr == "*" or submodule in sys.modules or hasattr(package, attr):
+            continue
+        try:
+            _timed_import(submodule)
+        except ModuleNotFoundError as e:
+            if e.name != submodule:
+                raise
+    return _original_import(name, globals, locals, fromlist, level)
+
+
+if PROFILE_IMPORTS:
+    builtins.__import__ = _traced_import
+
+
+def mark(name: str) -> None:
+    """Record the time since the previous mark (or process start) as phase `name`."""
+    global _last_mark
+    now = time.perf_counter()
+    _phases[name] = _phases.get(name, 0.0) + now - _last_mark
+    _last_mark = now
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as phase `name` (added to any earlier time for it)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = _phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def timings() -> Dict[str, float]:
+    """Seconds per phase so far, with `total` since process start."""
+    return {**_phases, "total": time.perf_counter() - _started}
+
+
+def report(service: str) -> Dict[str, float]:
+    """Log the startup timings of `service` and export them; only the first call reports."""
+    global _reported
+    result = timings()
+    if _reported:
+        return result
+    _reported = True
+    if PROFILE_IMPORTS:
+        builtins.__import__ = _original_import
+
+    from .metrics import gauge
+
+    seconds = gauge("startup_phase_seconds", "Time spent in each startup phase", ["phase"])
+    for name, value in result.items():
+        seconds.labels(phase=name).set(value)
+
+    if _imports:
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for self_us, cumulative, module in sorted(_imports, key=lambda i: i[1], reverse=True):
+            if cumulative >= PROFILE_MIN_US:
+                lines.append(f"import time: {self_us:>9} | {cumulative:>10} | {module}")
+        logger.info("%s slowest imports:\n%s", service, "\n".join(lines))
+    logger.info(
+        "%s started in %.3fs (%s)",
+        service,
+        result["total"],
+        ", ".join(f"{name} {value:.3f}s" for name, value in result.items() if name != "total"),
+    )
+    return result
@@ -0,0 +1,84 @@
+"""Decoded access tokens, cached until they expire.
+
+Every authenticated request used to verify the JWT signature and validate
+its claims with python-jose. Each process now keeps a bounded LRU from the
+raw token string to its `TokenPayload`; an entry lives exactly until the
+token's `exp`, so a cached token is never accepted after jose would have
+rejected it. Tokens that fail to decode, or carry no `exp`, are never
+cached, so every invalid token pays for a full verification. python-jose is
+imported on the first decode rather than at startup.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import time
+from typing import Optional
+
+from pydantic import BaseModel, ValidationError
+
+from .config import settings
+from .metrics import counter, gauge
+from .ttl_cache import TTLCache
+
+LOOKUPS = counter(
+    "token_cache_lookups",
+    "Access token decodes by outcome (hit: served from the cache)",
+    ["result"],
+)
+ENTRIES = gauge("token_cache_entries", "Decoded access tokens held in the cache")
+
+
+class TokenPayload(BaseModel):
+    sub: Optional[int] = None
+
+
+class InvalidToken(ValueError):
+    """Raised when a token fails verification or its claims do not validate."""
+
+
+class TokenCache:
+    def __init__(self, *, secret_key: str, algorithm: str, maxsize: int):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        # Every entry gets its own TTL (up to its `exp`); the default is unused
+        self._local: TTLCache[TokenPayload] = TTLCache(maxsize=maxsize, ttl=0)
+
+    def decode(self, token: str) -> TokenPayload:
+        """
+        Return the payload of a valid `token`.
+
+        Raises `InvalidToken` where a direct `jwt.decode` followed by
+        `TokenPayload(**claims)` would raise `JWTError` or `ValidationError`.
+        """
+        payload = self._local.get(token)
+        if payload is not None:
+            LOOKUPS.labels(result="hit").inc()
+            return payload
+        from jose import jwt
+
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = TokenPayload(**claims)
+        except (jwt.JWTError, ValidationError) as e:
+            LOOKUPS.labels(result="invalid").inc()
+            raise InvalidToken(str(e)) from e
+        LOOKUPS.labels(result="miss").inc()
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = exp - time.time()
+            if ttl > 0:
+                self._local.set(token, payload, ttl=ttl)
+        return payload
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+token_cache = TokenCache(
+    secret_key=settings.SECRET_KEY,
+    algorithm=settings.ALGORITHM,
+    maxsize=settings.TOKEN_CACHE_MAX_ENTRIES,
+)
+ENTRIES.set_function(lambda: len(token_cache))
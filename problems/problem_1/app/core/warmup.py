@@ -0,0 +1,218 @@
+"""Warm a service up in its lifespan, before it takes traffic.
+
+Right after a deploy the first requests would otherwise pay for opening
+database and Redis connections (TCP, TLS, auth), for SQLAlchemy configuring
+the mappers and compiling their statements, and for FastAPI's first pass over
+each response model. `warm_up` does that work first, in steps:
+
+* `pools`: open `WARMUP_CONNECTIONS` connections in every pool of the stacks
+  the service uses (primary and replicas)
+* `statements`: run the service's hot read statements once per engine,
+  which fills that engine's compiled cache
+* `redis`: open the service's Redis connections
+* `schemas`: serialize a sample of every route's response model
+
+Each step is timed as a `warmup_<step>` startup phase (see `startup`). A
+failing step is logged and counted in `warmup_failures_total{step}` but does
+not stop the service; `/health` answers 503 until `warm_up` has returned.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3; a service
+must use the same module copy as its `get_db`.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Sequence
+
+import anyio
+from fastapi import FastAPI
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel, EmailStr
+from pydantic.fields import MAPPING_LIKE_SHAPES, SHAPE_SINGLETON, ModelField
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from ..db.session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    get_async_engine,
+    get_async_replica_engines,
+    get_engine,
+    get_replica_engines,
+)
+from . import startup
+from .config import settings
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+FAILURES = counter("warmup_failures", "Warmup steps that failed", ["step"])
+
+SyncStatements = Callable[[Session], Any]
+AsyncStatements = Callable[[AsyncSession], Awaitable[Any]]
+Ping = Callable[[], Any]
+
+_SAMPLES: Dict[type, Any] = {
+    bool: True,
+    int: 1,
+    float: 1.0,
+    Decimal: Decimal(1),
+    str: "warmup",
+    datetime: datetime(2000, 1, 1, tzinfo=timezone.utc),
+    date: date(2000, 1, 1),
+    dt_time: dt_time(0, 0),
+    timedelta: timedelta(seconds=1),
+}
+
+
+def is_ready(app: FastAPI) -> bool:
+    """Whether `app` has finished warming up."""
+    return getattr(app.state, "ready", False)
+
+
+def connections() -> int:
+    """Connections to open per pool: `WARMUP_CONNECTIONS`, at most `DB_POOL_SIZE`."""
+    wanted = settings.WARMUP_CONNECTIONS
+    if wanted is None:
+        return settings.DB_POOL_SIZE
+    return max(0, min(wanted, settings.DB_POOL_SIZE))
+
+
+async def warm_up(
+    app: FastAPI,
+    *,
+    sync_statements: Optional[SyncStatements] = None,
+    async_statements: Optional[AsyncStatements] = None,
+    redis_pings: Sequence[Ping] = (),
+) -> None:
+    """
+    Warm `app` up, then mark it ready.
+
+    `sync_statements(db)` / `await async_statements(db)` should run the hot
+    read statements of the sync / async stack; passing one also warms that
+    stack's pools, so pass those the service serves from. `redis_pings` open
+    the Redis clients (functions, or coroutine functions, called with no
+    arguments). Nothing is warmed with `WARMUP_ENABLED` off.
+    """
+    if settings.WARMUP_ENABLED:
+        sync_engines = [get_engine(), *get_replica_engines()] if sync_statements else []
+        async_engines = (
+            [get_async_engine(), *get_async_replica_engines()] if async_statements else []
+        )
+        n = connections()
+
+        async def pools() -> None:
+            await asyncio.gather(
+                *(_open_sync(engine, n) for engine in sync_engines),
+                *(_open_async(engine, n) for engine in async_engines),
+            )
+
+        async def statements() -> None:
+            for engine in sync_engines:
+                await anyio.to_thread.run_sync(_run_sync, sync_statements, engine)
+            for async_engine in async_engines:
+                async with AsyncSessionLocal(bind=async_engine) as db:
+                    await async_statements(db)  # type: ignore[misc]
+                    await db.rollback()
+
+        async def redis() -> None:
+            for ping in redis_pings:
+                if asyncio.iscoroutinefunction(ping):
+                    await ping()
+                else:
+                    await anyio.to_thread.run_sync(ping)
+
+        await _step("pools", pools)
+        await _step("statements", statements)
+        await _step("redis", redis)
+        await _step("schemas", lambda: _serialize_samples(app))
+    app.state.ready = True
+
+
+async def _step(name: str, work: Callable[[], Awaitable[None]]) -> None:
+    with startup.phase(f"warmup_{name}"):
+        try:
+            await work()
+        except Exception:
+            FAILURES.labels(step=name).inc()
+            logger.warning("Warmup step %r failed, continuing without it", name, exc_info=True)
+
+
+async def _open_sync(engine: Engine, n: int) -> None:
+    # Held at the same time, so the pool has to open n distinct connections
+    opened = await asyncio.gather(
+        *(anyio.to_thread.run_sync(engine.connect) for _ in range(n)), return_exceptions=True
+    )
+    for conn in opened:
+        if isinstance(conn, Connection):
+            conn.close()
+    for conn in opened:
+        if isinstance(conn, BaseException):
+            raise conn
+
+
+async def _open_async(engine: AsyncEngine, n: int) -> None:
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(n)), return_exceptions=True
+    )
+    for conn in opened:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    for conn in opened:
+        if isinstance(conn, BaseException):
+            raise conn
+
+
+def _run_sync(statements: SyncStatements, engine: Engine) -> None:
+    with SessionLocal(bind=engine) as db:
+        statements(db)
+        db.rollback()
+
+
+async def _serialize_samples(app: FastAPI) -> None:
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.response_field is None:
+            continue
+        try:
+            sample = _sample(route.response_field, frozenset())
+            await serialize_response(field=route.response_field, response_content=sample)
+        except Exception:
+            # No sample value for some field type, or one a validator rejects:
+            # this route's model is left for its first request
+            logger.debug("No warmup sample for %s %s", route.methods, route.path, exc_info=True)
+
+
+def _sample(field: ModelField, seen: FrozenSet[type]) -> Any:
+    """A value `field` accepts, with one item in each list; raises TypeError if unknown."""
+    if field.shape == SHAPE_SINGLETON:
+        if field.sub_fields:
+            return _sample(field.sub_fields[0], seen)
+        return _sample_type(field.type_, seen, field.allow_none)
+    if field.shape in MAPPING_LIKE_SHAPES:
+        return {}
+    return [_sample_type(field.type_, seen, False)]
+
+
+def _sample_type(tp: Any, seen: FrozenSet[type], allow_none: bool) -> Any:
+    if tp is Any:
+        return None
+    if not isinstance(tp, type):
+        raise TypeError(f"no sample for {tp!r}")
+    if issubclass(tp, BaseModel):
+        if tp in seen:
+            # A recursive schema: stop at the first repeat
+            if allow_none:
+                return None
+            raise TypeError(f"no sample for recursive {tp!r}")
+        return {f.alias: _sample(f, seen | {tp}) for f in tp.__fields__.values()}
+    if issubclass(tp, Enum):
+        return next(iter(tp))
+    if issubclass(tp, EmailStr):
+        return "warmup@example.com"
+    for base in tp.__mro__:
+        if base in _SAMPLES:
+            return _SAMPLES[base]
+    raise TypeError(f"no sample for {tp!r}")
@@ -2,5 +2,6 @@ from .base import CRUDBase  # noqa
 from .user import user
 from .project import project
 from .task import task
+from .task_archive import task_archive
 
 # This ensures that all CRUD operations are properly imported and available for use
@@ -0,0 +1,5 @@
+# Async (AsyncSession) counterparts of the CRUD objects in app.crud
+from .base import AsyncCRUDBase  # noqa
+from .user import user
+from .project import project
+from .task import task, task_archive
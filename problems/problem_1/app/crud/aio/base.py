@@ -0,0 +1,118 @@
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel
+from sqlalchemy import Executable, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CreateSchemaType, CRUDBase, ModelType, UpdateSchemaType
+from app.crud.rows import RowShape
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, sync: CRUDBase[ModelType, CreateSchemaType, UpdateSchemaType]):
+        """
+        Async counterpart of a sync CRUD object, for `AsyncSession`.
+
+        Query shaping (cursor fields, pagination, schema loaders) is delegated
+        to the sync CRUD object so both stacks page and eager-load identically.
+
+        **Parameters**
+        * `sync`: The sync CRUD object for the same model
+        """
+        self.sync = sync
+        self.model: Type[ModelType] = sync.model
+
+    def load_options(self, schema: Optional[Type[BaseModel]]) -> List[Any]:
+        return self.sync.load_options(schema)
+
+    def row_shape(self, schema: Type[BaseModel]) -> RowShape:
+        return self.sync.row_shape(schema)
+
+    def next_cursor(self, items: Sequence[Any], *, limit: int) -> Optional[str]:
+        return self.sync.next_cursor(items, limit=limit)
+
+    def statement(self, *, options: Sequence[Any] = (), rows: Optional[RowShape] = None) -> Select:
+        """Select this model's entities with `options`, or with `rows` just the columns it selects."""
+        if rows is not None:
+            return rows.select()
+        return select(self.model).options(*options)
+
+    async def get(
+        self, db: AsyncSession, id: Any, *, options: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        stmt = select(self.model).options(*options).where(self.model.id == id)
+        return (await db.scalars(stmt)).first()
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[ModelType]:
+        stmt = self.statement(options=options, rows=rows)
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def all(self, db: AsyncSession, stmt: Any, *, rows: Optional[RowShape] = None) -> List[Any]:
+        if rows is not None:
+            return rows.load_all((await db.execute(stmt)).all())
+        return list((await db.scalars(stmt)).unique())
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType, options: Sequence[Any] = ()
+    ) -> ModelType:
+        # .dict() rather than jsonable_encoder: asyncpg wants datetimes, not ISO strings
+        db_obj = self.model(**obj_in.dict())  # type: ignore
+        db.add(db_obj)
+        await db.commit()
+        return await self.reload(db, db_obj, options=options)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        options: Sequence[Any] = (),
+    ) -> ModelType:
+        self.sync.assign(db_obj, obj_in)
+        db.add(db_obj)
+        await db.commit()
+        return await self.reload(db, db_obj, options=options)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def execute_delete(
+        self, db: AsyncSession, statements: Sequence[Executable]
+    ) -> Optional[ModelType]:
+        """Async `CRUDBase.execute_delete`."""
+        *dependents, parent = statements
+        for stmt in dependents:
+            await db.execute(stmt)
+        obj = (await db.execute(parent)).scalar_one_or_none()
+        await db.commit()
+        return obj
+
+    async def reload(
+        self, db: AsyncSession, db_obj: ModelType, *, options: Sequence[Any] = ()
+    ) -> ModelType:
+        """
+        Refresh `db_obj` plus the relationships in `options` in one SELECT.
+
+        Lazy loading is not available under asyncio, so anything a response
+        schema nests must be loaded here rather than on attribute access.
+        """
+        stmt = (
+            select(self.model)
+            .options(*options)
+            .where(self.model.id == db_obj.id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(stmt)).one()
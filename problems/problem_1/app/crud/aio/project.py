@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.query_cache import query_cache
+from app.crud import cache
+from app.crud.aio.base import AsyncCRUDBase
+from app.crud.rows import RowShape
+from app.models import Project
+from app.schemas.project import ProjectCreate, ProjectUpdate
+
+
+class AsyncCRUDProject(AsyncCRUDBase[Project, ProjectCreate, ProjectUpdate]):
+    @cache.cached(lambda owner_id, **_: [cache.owner_projects(owner_id)])
+    async def get_multi_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Project]:
+        stmt = self.statement(options=options, rows=rows).where(Project.owner_id == owner_id)
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Project,
+        obj_in: Union[ProjectUpdate, Dict[str, Any]],
+        options: Sequence[Any] = (),
+    ) -> Project:
+        project = await super().update(db, db_obj=db_obj, obj_in=obj_in, options=options)
+        await query_cache.bump_async(cache.owner_projects(project.owner_id))
+        return project
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Project]:
+        project = await self.execute_delete(db, self.sync.delete_statements(id))
+        if project is not None:
+            await query_cache.bump_async(cache.owner_projects(project.owner_id))
+        return project
+
+    async def get_version(self, db: AsyncSession, *, id: int) -> Optional[Row]:
+        return (await db.execute(self.sync.version_statement(id))).first()
+
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: ProjectCreate, owner_id: int
+    ) -> Project:
+        db_obj = Project(**obj_in.dict(), owner_id=owner_id)
+        db.add(db_obj)
+        await db.commit()
+        await query_cache.bump_async(cache.owner_projects(owner_id))
+        return await self.reload(db, db_obj)
+
+
+project = AsyncCRUDProject(crud.project)
@@ -0,0 +1,241 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import crud
+from app.crud import task_counter
+from app.crud.aio.base import AsyncCRUDBase
+from app.crud.rows import RowShape
+from app.crud.task import TaskAccess, normalize_status
+from app.crud.task_archive import merge_pages
+from app.models import Project, Task, TaskStatus, User
+from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate
+
+
+class AsyncCRUDTask(AsyncCRUDBase[Task, TaskCreate, TaskUpdate]):
+    async def get_multi_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Task]:
+        stmt = (
+            self.statement(options=options, rows=rows)
+            .join(Task.project)
+            .where(Project.owner_id == owner_id)
+        )
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def get_multi_by_project(
+        self,
+        db: AsyncSession,
+        *,
+        project_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Task]:
+        stmt = self.statement(options=options, rows=rows).where(Task.project_id == project_id)
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def get_multi_by_assignee(
+        self,
+        db: AsyncSession,
+        *,
+        assignee_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Task]:
+        stmt = self.statement(options=options, rows=rows).where(Task.assignee_id == assignee_id)
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def stream_by_project(
+        self, db: AsyncSession, *, project_id: int, rows: RowShape, batch_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        stmt = (
+            self.sync.export_statement(project_id=project_id, rows=rows)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield rows.load_all(partition)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+        **filters: Any,
+    ) -> List[Task]:
+        stmt = self.sync.filter_search(self.statement(options=options, rows=rows), **filters)
+        return await self.all(db, stmt, rows=rows)
+
+    async def search_with(
+        self,
+        db: AsyncSession,
+        live: "AsyncCRUDTask",
+        *,
+        schema: Type[BaseModel],
+        fast: bool = False,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Any]:
+        """Async `CRUDTaskArchive.search_with`, called on `task_archive`."""
+        if cursor is not None:
+            skip = 0
+        pages = [
+            await crud_obj.search(
+                db,
+                skip=0,
+                limit=skip + limit,
+                cursor=cursor,
+                options=crud_obj.load_options(schema),
+                rows=crud_obj.row_shape(schema) if fast else None,
+                **filters,
+            )
+            for crud_obj in (live, self)
+        ]
+        return merge_pages(pages, skip=skip, limit=limit)
+
+    async def get_multi_mine(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Task]:
+        ids = self.sync.mine_ids(
+            user_id=user_id, status=status, due_after=due_after, due_before=due_before,
+            skip=skip, limit=limit, cursor=cursor,
+        )
+        stmt = self.statement(options=options, rows=rows).join(ids, ids.c.id == Task.id)
+        return await self.all(db, self.sync.paginate(stmt, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    async def get_board(
+        self, db: AsyncSession, *, project_id: int, per_column: int, cursors: Sequence[str] = ()
+    ) -> List[Dict[str, Any]]:
+        positions = self.sync.board_positions(cursors)
+        stmt = self.sync.board_statement(project_id=project_id, per_column=per_column, positions=positions)
+        rows = (await db.execute(stmt)).all()
+        return self.sync.to_board(rows, per_column=per_column, positions=positions)
+
+    async def get_with_access(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        assignee_id: Optional[int] = None,
+        options: Sequence[Any] = (),
+    ) -> Optional[TaskAccess]:
+        row = (await db.execute(self.sync.access_statement(id, assignee_id, options))).first()
+        return self.sync.to_access(row)
+
+    async def create(self, db: AsyncSession, *, obj_in: TaskCreate) -> Task:
+        data = obj_in.dict()
+        data["status"] = normalize_status(data["status"])
+        db_obj = Task(**data)
+        db.add(db_obj)
+        await self._flush_with_counters(db, Counter([task_counter.task_key(db_obj)]))
+        await db.commit()
+        return await self.reload(db, db_obj, options=self.load_options(TaskSchema))
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Task,
+        obj_in: Union[TaskUpdate, Dict[str, Any]],
+        options: Sequence[Any] = (),
+    ) -> Optional[Task]:
+        if not await self.lock(db, db_obj):
+            await db.rollback()
+            return None
+        old_key = task_counter.task_key(db_obj)
+        update_data = self.sync.assign(db_obj, obj_in)
+        if "status" in update_data:
+            db_obj.status = normalize_status(db_obj.status)
+        db.add(db_obj)
+        await self._flush_with_counters(
+            db, task_counter.moved(old_key, task_counter.task_key(db_obj))
+        )
+        await db.commit()
+        return await self.reload(db, db_obj, options=options)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Task]:
+        row = (await db.execute(self.sync.delete_returning_statement(id))).mappings().one_or_none()
+        if row is None:
+            await db.rollback()
+            return None
+        key = task_counter.counter_key(row["project_id"], row["status"], row["due_date"])
+        await db.execute(task_counter.upsert_statement(Counter({key: -1})))
+        await db.commit()
+        return self.sync.deleted_task(row)
+
+    async def lock(self, db: AsyncSession, db_obj: Task) -> bool:
+        row = (await db.execute(self.sync.lock_statement(db_obj.id))).mappings().one_or_none()
+        if row is None:
+            return False
+        self.sync.apply_returned_row(db_obj, row)
+        return True
+
+    async def _flush_with_counters(self, db: AsyncSession, deltas: Mapping[Any, int]) -> None:
+        # Same lock order as the sync CRUD: tasks, then counters
+        await db.flush()
+        stmt = task_counter.upsert_statement(deltas)
+        if stmt is not None:
+            await db.execute(stmt)
+
+    async def update_status_returning(
+        self, db: AsyncSession, *, db_obj: Task, status: TaskStatus
+    ) -> Optional[Task]:
+        return await self._update_returning(db, db_obj, {"status": normalize_status(status)})
+
+    async def update_assignee_returning(
+        self, db: AsyncSession, *, db_obj: Task, assignee: Optional[User]
+    ) -> Optional[Task]:
+        assignee_id = assignee.id if assignee is not None else None
+        if await self._update_returning(db, db_obj, {"assignee_id": assignee_id}) is None:
+            return None
+        set_committed_value(db_obj, "assignee", assignee)
+        return db_obj
+
+    async def _update_returning(self, db: AsyncSession, db_obj: Task, values: dict) -> Optional[Task]:
+        stmt = self.sync.update_returning_statement(db_obj.id, values)
+        row = (await db.execute(stmt)).mappings().one_or_none()
+        if row is None:
+            await db.rollback()
+            return None
+        counters = task_counter.upsert_statement(self.sync.returned_row_deltas(row))
+        if counters is not None:
+            await db.execute(counters)
+        await db.commit()
+        return self.sync.apply_returned_row(db_obj, row)
+
+
+task = AsyncCRUDTask(crud.task)
+# Only the read paths (get_with_access, stream_by_project, search) apply to the archive
+task_archive = AsyncCRUDTask(crud.task_archive)
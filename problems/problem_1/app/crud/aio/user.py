@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional, Union
+
+import anyio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.hashing import get_password_hash_async, verify_password_async
+from app.core.principal_cache import Principal, get_principal_async, principal_cache
+from app.core.query_cache import query_cache
+from app.crud import cache
+from app.crud.aio.base import AsyncCRUDBase
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        return (await db.scalars(select(User).where(User.email == email))).first()
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = User(
+            email=obj_in.email,
+            hashed_password=await get_password_hash_async(obj_in.password),
+            full_name=obj_in.full_name,
+            is_superuser=obj_in.is_superuser,
+        )
+        db.add(db_obj)
+        await db.commit()
+        return await self.reload(db, db_obj)
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+
+        if "password" in update_data and update_data["password"]:
+            hashed_password = await get_password_hash_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+
+        user = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        await anyio.to_thread.run_sync(principal_cache.invalidate, user.id)
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        user = await self.execute_delete(db, self.sync.delete_statements(id))
+        await anyio.to_thread.run_sync(principal_cache.invalidate, id)
+        await query_cache.bump_async(cache.owner_projects(id))
+        return user
+
+    async def get_principal(self, db: AsyncSession, *, id: int) -> Optional[Principal]:
+        return await get_principal_async(db, id)
+
+    async def authenticate(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Optional[User]:
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.hashed_password):
+            return None
+        return user
+
+    def is_active(self, user: Union[User, Principal]) -> bool:
+        return self.sync.is_active(user)
+
+    def is_superuser(self, user: Union[User, Principal]) -> bool:
+        return self.sync.is_superuser(user)
+
+
+user = AsyncCRUDUser(crud.user)
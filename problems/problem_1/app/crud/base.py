@@ -1,16 +1,90 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Iterable, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Executable, Select, inspect, tuple_
+from sqlalchemy.orm import Query, Session
 
+from app.crud.rows import RowShape
 from app.db.base_class import Base
+from app.db.session import commit_write
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+QueryType = TypeVar("QueryType", Query, Select)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor` back into keyset values."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error):
+        raise InvalidCursor("Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid pagination cursor")
+    return values
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Keyset used for cursor pagination; must be unique and NOT NULL as a whole.
+    cursor_fields: Tuple[str, ...] = ("id",)
+    # Per-field conversions applied when rows are read without the ORM (see `row_shape`)
+    row_converters: Mapping[str, Callable[[Any], Any]] = {}
+
+    def schema_loaders(self) -> Dict[Type[BaseModel], Sequence[Any]]:
+        """
+        Loader options per response schema, overridden by models with relationships.
+
+        Keys are the pydantic schemas returned by endpoints; values are the
+        `selectinload`/`joinedload` options that pre-load every relationship
+        the schema nests, so serialization never triggers lazy loads.
+        """
+        return {}
+
+    def load_options(self, schema: Optional[Type[BaseModel]]) -> List[Any]:
+        """Return the loader options needed to serialize rows as `schema`."""
+        if schema is None:
+            return []
+        return list(self.schema_loaders().get(schema, ()))
+
+    def row_shape(self, schema: Type[BaseModel]) -> RowShape:
+        """The columns `schema` renders, to fetch list pages as plain dicts (built once per schema)."""
+        shape = self._row_shapes.get(schema)
+        if shape is None:
+            shape = self._row_shapes[schema] = RowShape(self.model, schema, converters=self.row_converters)
+        return shape
+
+    def query(
+        self, db: Session, *, options: Sequence[Any] = (), rows: Optional[RowShape] = None
+    ) -> Query:
+        """Query this model's entities with `options`, or with `rows` just the columns it selects."""
+        if rows is not None:
+            return rows.query(db)
+        return db.query(self.model).options(*options)
+
+    def fetch(self, query: Query, *, rows: Optional[RowShape] = None) -> List[Any]:
+        """Run `query`; results of a `rows` query come back as plain dicts."""
+        if rows is not None:
+            return rows.load_all(query.all())
+        return query.all()
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -20,21 +94,88 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         * `schema`: A Pydantic model (schema) class
         """
         self.model = model
+        self._row_shapes: Dict[Type[BaseModel], RowShape] = {}
+
+    def get(
+        self, db: Session, id: Any, *, options: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        return db.query(self.model).options(*options).filter(self.model.id == id).first()
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def get_multi_by_ids(self, db: Session, *, ids: Iterable[Any]) -> List[ModelType]:
+        """Fetch all rows whose id is in `ids` with a single IN query."""
+        ids = list(ids)
+        if not ids:
+            return []
+        return db.query(self.model).filter(self.model.id.in_(ids)).all()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        query = self.query(db, options=options, rows=rows)
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    def paginate(
+        self,
+        query: QueryType,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> QueryType:
+        """
+        Apply a stable ORDER BY plus either keyset (`cursor`) or offset (`skip`) paging.
+
+        Accepts a legacy `Query` or a 2.0 `select()` (used by the async CRUD).
+
+        Keyset paging seeks directly to the row after the cursor through the
+        primary key index, so its cost does not grow with the page depth.
+        Offset paging is kept as a fallback for existing clients.
+        """
+        columns = [getattr(self.model, field) for field in self.cursor_fields]
+        query = query.order_by(*columns)
+        if cursor is not None:
+            values = self._cursor_values(cursor, columns)
+            if len(columns) == 1:
+                query = query.filter(columns[0] > values[0])
+            else:
+                query = query.filter(tuple_(*columns) > tuple_(*values))
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def next_cursor(self, items: Sequence[Any], *, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `items`, or None on the last page."""
+        if limit <= 0 or len(items) < limit:
+            return None
+        last = items[-1]
+        if isinstance(last, Mapping):
+            return encode_cursor([last[field] for field in self.cursor_fields])
+        return encode_cursor([getattr(last, field) for field in self.cursor_fields])
+
+    def _cursor_values(self, cursor: str, columns: List[Any]) -> List[Any]:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns) or any(v is None for v in values):
+            raise InvalidCursor("Invalid pagination cursor")
+        try:
+            return [
+                datetime.fromisoformat(v) if isinstance(c.type, DateTime) else c.type.python_type(v)
+                for c, v in zip(columns, values)
+            ]
+        except (TypeError, ValueError):
+            raise InvalidCursor("Invalid pagination cursor")
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)  # type: ignore
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_write(db, db_obj)
         return db_obj
 
     def update(
@@ -44,7 +185,18 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        update_data = self.assign(db_obj, obj_in)
+        db.add(db_obj)
+        commit_write(db, db_obj)
+        self.expire_stale_relationships(db, db_obj, update_data)
+        return db_obj
+
+    def assign(
+        self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Set the column attributes present in `obj_in` on `db_obj`; return the update data."""
+        # Column names from the mapper: encoding db_obj would walk loaded relationships
+        obj_data = [attr.key for attr in inspect(db_obj).mapper.column_attrs]
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
@@ -53,14 +205,42 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
-        
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return update_data
+
+    def expire_stale_relationships(
+        self, db: Session, db_obj: ModelType, changed: Iterable[str]
+    ) -> None:
+        """
+        Expire relationships whose foreign key was just changed.
+
+        Without a refresh, a loaded `task.assignee` would still point at the
+        old user after `assignee_id` changes; expiring it reloads on access.
+        """
+        changed = set(changed)
+        stale = [
+            rel.key
+            for rel in inspect(db_obj).mapper.relationships
+            if any(column.key in changed for column in rel.local_columns)
+        ]
+        if stale:
+            db.expire(db_obj, stale)
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
         return obj
+
+    def execute_delete(self, db: Session, statements: Sequence[Executable]) -> Optional[ModelType]:
+        """
+        Run set-based delete `statements` in one transaction; return the deleted row.
+
+        Dependent rows go first; the last statement deletes the row itself
+        with RETURNING, which replaces the SELECT an ORM delete would need.
+        """
+        *dependents, parent = statements
+        for stmt in dependents:
+            db.execute(stmt)
+        obj = db.execute(parent).scalar_one_or_none()
+        db.commit()
+        return obj
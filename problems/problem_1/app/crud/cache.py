@@ -0,0 +1,80 @@
+"""
+Opt-in caching of CRUD list reads through `app.core.query_cache`.
+
+A method decorated with `cached` declares the scopes its result depends on;
+every write that can change such a result bumps those scopes once it has
+committed. The scopes in use:
+
+* `owner_projects(owner_id)`: the projects of one owner
+"""
+import functools
+import inspect
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from app.core.query_cache import query_cache
+from app.crud.rows import RowShape
+from app.db.session import is_replica
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+def owner_projects(owner_id: int) -> str:
+    return f"projects:owner:{owner_id}"
+
+
+def cached(scopes: Callable[..., Sequence[str]], *, ttl: Optional[float] = None) -> Callable[[F], F]:
+    """
+    Serve a sync or async CRUD read from the query cache when it returns rows.
+
+    `scopes` receives the method's keyword arguments. Only calls with a
+    `rows` shape are cached: ORM objects belong to their session. Reads on a
+    replica session use the cache but never fill it: the replica may not have
+    replayed the write that started the current generation. The key is
+    the table and method name, the arguments (minus `options`, which only
+    apply to ORM reads) and the rows' schema, so the sync and async CRUD
+    share entries.
+    """
+
+    def decorate(method: F) -> F:
+        def lookup(self: Any, rows: RowShape, kwargs: Any) -> Any:
+            name = f"{self.model.__tablename__}.{method.__name__}"
+            params = {key: value for key, value in kwargs.items() if key != "options"}
+            params["rows"] = rows.schema.__name__
+            return name, params, scopes(**kwargs)
+
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self: Any, db: Any, *, rows: Optional[RowShape] = None, **kwargs: Any) -> Any:
+                if rows is None or not query_cache.enabled:
+                    return await method(self, db, rows=rows, **kwargs)
+                name, params, keys = lookup(self, rows, kwargs)
+                return await query_cache.get_async(
+                    name,
+                    params,
+                    keys,
+                    lambda: method(self, db, rows=rows, **kwargs),
+                    restore=rows.restore,
+                    ttl=ttl,
+                    fill=not is_replica(db),
+                )
+
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(method)
+        def wrapper(self: Any, db: Any, *, rows: Optional[RowShape] = None, **kwargs: Any) -> Any:
+            if rows is None or not query_cache.enabled:
+                return method(self, db, rows=rows, **kwargs)
+            name, params, keys = lookup(self, rows, kwargs)
+            return query_cache.get(
+                name,
+                params,
+                keys,
+                lambda: method(self, db, rows=rows, **kwargs),
+                restore=rows.restore,
+                ttl=ttl,
+                fill=not is_replica(db),
+            )
+
+        return wrapper  # type: ignore
+
+    return decorate
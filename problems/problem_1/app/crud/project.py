@@ -1,45 +1,135 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type, Union
 
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy import Executable, Row, Select, delete, func, select
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 
+from app.core.query_cache import query_cache
+from app.crud import cache
 from app.crud.base import CRUDBase
-from app.models import Project, User
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.crud.rows import RowShape
+from app.db.session import commit_write
+from app.models import Project, Task, User
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectWithTasks
 
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
+    def schema_loaders(self) -> Dict[Type[BaseModel], Sequence[Any]]:
+        # One IN query for the whole task collection, with each task's assignee joined in
+        return {
+            ProjectWithTasks: (selectinload(Project.tasks).joinedload(Task.assignee),),
+        }
+
+    @cache.cached(lambda owner_id, **_: [cache.owner_projects(owner_id)])
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
     ) -> List[Project]:
+        query = self.query(db, options=options, rows=rows).filter(Project.owner_id == owner_id)
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    def get_version(self, db: Session, *, id: int) -> Optional[Row]:
+        """Return `version_statement`'s row for project `id`, or None if it does not exist."""
+        return db.execute(self.version_statement(id)).first()
+
+    def version_statement(self, id: int) -> Select:
+        """
+        The owner plus everything a `ProjectWithTasks` body depends on, in one row.
+
+        The project's timestamps, the task count (catches deletes) and the
+        latest write to any of its tasks or their assignees; used to answer
+        conditional GETs without loading the tasks.
+        """
+        assignee = aliased(User)
         return (
-            db.query(self.model)
-            .filter(Project.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+            select(
+                Project.owner_id,
+                Project.created_at,
+                Project.updated_at,
+                func.count(Task.id),
+                func.max(func.coalesce(Task.updated_at, Task.created_at)),
+                func.max(func.coalesce(assignee.updated_at, assignee.created_at)),
+            )
+            .outerjoin(Task, Task.project_id == Project.id)
+            .outerjoin(assignee, assignee.id == Task.assignee_id)
+            .where(Project.id == id)
+            .group_by(Project.id)
         )
 
+    def update(
+        self, db: Session, *, db_obj: Project, obj_in: Union[ProjectUpdate, Dict[str, Any]]
+    ) -> Project:
+        project = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        query_cache.bump(cache.owner_projects(project.owner_id))
+        return project
+
+    def remove(self, db: Session, *, id: int) -> Optional[Project]:
+        project = self.execute_delete(db, self.delete_statements(id))
+        if project is not None:
+            query_cache.bump(cache.owner_projects(project.owner_id))
+        return project
+
+    def delete_statements(self, id: int) -> List[Executable]:
+        """
+        Delete project `id` with one statement for its tasks and one for itself.
+
+        The tasks are never loaded, so the cost is an index scan on
+        `tasks.project_id` rather than one DELETE per task. The project's
+        counters go through ON DELETE CASCADE; the project row comes back
+        from DELETE ... RETURNING for the response.
+        """
+        return [
+            delete(Task)
+            .where(Task.project_id == id)
+            .execution_options(synchronize_session=False),
+            delete(Project)
+            .where(Project.id == id)
+            .returning(Project)
+            .execution_options(synchronize_session=False),
+        ]
+
+    def get_owner_ids(self, db: Session, *, ids: Iterable[int]) -> Dict[int, int]:
+        """Map each existing project id in `ids` to its owner id, in one query."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        rows = db.query(Project.id, Project.owner_id).filter(Project.id.in_(ids)).all()
+        return {row.id: row.owner_id for row in rows}
+
     def create_with_owner(
         self, db: Session, *, obj_in: ProjectCreate, owner_id: int
     ) -> Project:
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_write(db, db_obj)
+        query_cache.bump(cache.owner_projects(owner_id))
         return db_obj
 
     def get_multi_by_collaborator(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Project]:
-        return (
-            db.query(Project)
-            .join(Project.tasks)
-            .filter(Project.owner_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        """
+        Projects with at least one task assigned to `user_id`.
+
+        EXISTS rather than a join, so a project appears once however many of
+        its tasks the user has.
+        """
+        query = db.query(Project).filter(Project.tasks.any(Task.assignee_id == user_id))
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor).all()
 
 
 project = CRUDProject(Project)
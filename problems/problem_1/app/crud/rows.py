@@ -0,0 +1,112 @@
+"""
+Read list pages as plain rows instead of ORM objects.
+
+A `RowShape` selects exactly the columns a response schema renders (plus
+those of the many-to-one relationships it nests, through LEFT JOINs) and
+loads each result row into a plain dict with the schema's field names. The
+dicts go straight to the JSON encoder (`app.api.fast_json`), skipping ORM
+identity-map bookkeeping and pydantic revalidation of rows the database
+already constrains.
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import DateTime, Select, inspect, select
+from sqlalchemy.orm import Query, Session, aliased
+
+
+class RowShape:
+    def __init__(
+        self,
+        entity: Any,
+        schema: Type[BaseModel],
+        *,
+        converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ):
+        """
+        Columns of `entity` rendered by `schema`, and how to load them back.
+
+        **Parameters**
+        * `entity`: A SQLAlchemy model class (or an alias of one)
+        * `schema`: The pydantic response schema whose fields are selected
+        * `converters`: Per-field functions applied to non-NULL values, for
+          columns whose stored form differs from what the schema renders
+        """
+        insp = inspect(entity)
+        mapper = insp.mapper
+        self.entity = entity
+        self.schema = schema
+        self.fields: List[str] = []
+        self.columns: List[Any] = []
+        self.converters = [
+            (name, convert) for name, convert in (converters or {}).items()
+        ]
+        # (field name, nested shape) in column order, and the joins they need
+        self.nested: List[Tuple[str, "RowShape"]] = []
+        self.joins: List[Any] = []
+        for name, field in schema.__fields__.items():
+            if name in mapper.column_attrs:
+                self.fields.append(name)
+                self.columns.append(getattr(entity, name))
+            elif name in mapper.relationships:
+                relationship = mapper.relationships[name]
+                if relationship.uselist or not issubclass(field.type_, BaseModel):
+                    raise ValueError(f"{schema.__name__}.{name}: only many-to-one relationships can be selected as rows")
+                target = aliased(relationship.mapper.class_)
+                nested = RowShape(target, field.type_)
+                self.nested.append((name, nested))
+                self.joins.append(getattr(entity, name).of_type(target))
+                self.joins.extend(nested.joins)
+            else:
+                raise ValueError(f"{schema.__name__}.{name} is not a column or relationship of {mapper.class_.__name__}")
+        self.width = len(self.fields) + sum(nested.width for _, nested in self.nested)
+        self.datetime_fields = [
+            name for name, column in zip(self.fields, self.columns) if isinstance(column.type, DateTime)
+        ]
+
+    def all_columns(self) -> List[Any]:
+        columns = list(self.columns)
+        for _, nested in self.nested:
+            columns.extend(nested.all_columns())
+        return columns
+
+    def query(self, db: Session) -> Query:
+        """A legacy `Query` over the shape's columns, for the sync CRUD."""
+        query = db.query(*self.all_columns()).select_from(self.entity)
+        for join in self.joins:
+            query = query.outerjoin(join)
+        return query
+
+    def select(self) -> Select:
+        """The same as `query`, as a 2.0 `select()` for the async CRUD."""
+        stmt = select(*self.all_columns()).select_from(self.entity)
+        for join in self.joins:
+            stmt = stmt.outerjoin(join)
+        return stmt
+
+    def load(self, row: Sequence[Any], start: int = 0) -> Dict[str, Any]:
+        item = dict(zip(self.fields, row[start:start + len(self.fields)]))
+        for name, convert in self.converters:
+            if item[name] is not None:
+                item[name] = convert(item[name])
+        position = start + len(self.fields)
+        for name, nested in self.nested:
+            values = row[position:position + nested.width]
+            # Every column NULL: the LEFT JOIN found no related row
+            item[name] = None if all(v is None for v in values) else nested.load(row, position)
+            position += nested.width
+        return item
+
+    def load_all(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        return [self.load(row) for row in rows]
+
+    def restore(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a loaded dict that went through JSON back into what `load` returned (datetimes)."""
+        for name in self.datetime_fields:
+            if isinstance(item[name], str):
+                item[name] = datetime.fromisoformat(item[name])
+        for name, nested in self.nested:
+            if item[name] is not None:
+                nested.restore(item[name])
+        return item
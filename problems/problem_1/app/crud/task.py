@@ -1,55 +1,523 @@
-from typing import List, Optional, Any, Dict
+from datetime import datetime
+from collections import Counter
+from typing import Iterable, Iterator, List, Mapping, NamedTuple, Optional, Any, Dict, Sequence, Type, Union
 
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy import Delete, Row, Select, Subquery, Update, and_, delete, func, insert, literal_column, not_, or_, select, true, union, update
+from sqlalchemy.orm import Query, Session, aliased, contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.crud.base import CRUDBase
-from app.models import Task, TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.crud import task_counter
+from app.crud.base import CRUDBase, InvalidCursor, QueryType, decode_cursor, encode_cursor
+from app.crud.rows import RowShape
+from app.db.session import commit_write
+from app.models import Project, Task, TaskStatus, User
+from app.models.task import normalize_status  # noqa: F401 (re-exported)
+from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate, TaskWithProject
 from fastapi.encoders import jsonable_encoder
 
 
+def search_document(table: str = "tasks") -> Any:
+    """The title/description tsvector of `table`'s rows, searched by `text`."""
+    # For `tasks` this must match the expression of ix_tasks_search_document
+    # (migration 0007) for the GIN index to be used; the regconfig is inlined
+    # rather than bound for that reason.
+    return literal_column(
+        "to_tsvector('simple'::regconfig, "
+        f"coalesce({table}.title, '') || ' ' || coalesce({table}.description, ''))"
+    )
+
+
+class TaskAccess(NamedTuple):
+    """A task with its project loaded, plus the prospective assignee (if one was asked for)."""
+
+    task: Task
+    assignee: Optional[User]
+
+
+class BoardPosition(NamedTuple):
+    """Where a board column continues: after this task in board order."""
+
+    status: str
+    due_date: Optional[datetime]
+    id: int
+
+
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    # Legacy rows may still hold the upper-case enum names
+    row_converters = {"status": normalize_status}
+
+    def schema_loaders(self) -> Dict[Type[BaseModel], Sequence[Any]]:
+        # Many-to-one relationships: a LEFT JOIN adds no extra round trip
+        return {
+            TaskSchema: (joinedload(Task.assignee),),
+            TaskWithProject: (joinedload(Task.project),),
+        }
+
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
     ) -> List[Task]:
-        return (
-            db.query(self.model)
-            .filter(Task.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        # Tasks have no owner of their own; ownership comes from the project
+        query = (
+            self.query(db, options=options, rows=rows)
+            .join(Task.project)
+            .filter(Project.owner_id == owner_id)
         )
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
 
     def get_multi_by_project(
-        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        project_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
     ) -> List[Task]:
-        return (
-            db.query(self.model)
-            .filter(Task.project_id == project_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = self.query(db, options=options, rows=rows).filter(Task.project_id == project_id)
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
 
     def get_multi_by_assignee(
-        self, db: Session, *, assignee_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        assignee_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
     ) -> List[Task]:
+        query = self.query(db, options=options, rows=rows).filter(Task.assignee_id == assignee_id)
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    def stream_by_project(
+        self, db: Session, *, project_id: int, rows: RowShape, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield every task of a project as row dicts, `batch_size` at a time.
+
+        Rows come from a server-side cursor (`yield_per`), so only one batch
+        is in memory at a time. There is no ORDER BY, which would make
+        Postgres sort the whole project before sending the first row.
+        """
+        stmt = (
+            self.export_statement(project_id=project_id, rows=rows)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in db.execute(stmt).partitions():
+            yield rows.load_all(partition)
+
+    def export_statement(self, *, project_id: int, rows: RowShape) -> Select:
+        return rows.select().where(self.model.project_id == project_id)
+
+    def search(self, db: Session, *, rows: Optional[RowShape] = None, **filters: Any) -> List[Task]:
+        """Run `search_query` with the given filters and paging."""
+        return self.fetch(self.search_query(db, rows=rows, **filters), rows=rows)
+
+    def search_query(
+        self,
+        db: Session,
+        *,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+        **filters: Any,
+    ) -> Query:
+        """`filter_search` over this model's entities with `options`, or the columns of `rows`."""
+        return self.filter_search(self.query(db, options=options, rows=rows), **filters)
+
+    def filter_search(
+        self,
+        query: QueryType,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        text: Optional[str] = None,
+        visible_to: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> QueryType:
+        """
+        Filter tasks by any combination of the given criteria, then page.
+
+        Accepts a legacy `Query` or a 2.0 `select()` (used by the async CRUD).
+
+        Each filter maps onto an index: `(project_id, status, due_date)`
+        (migration 0011), and `(assignee_id, status, due_date)` and a GIN index
+        over the title/description tsvector for `text` (migration 0007). With `visible_to`, only tasks
+        in projects that user owns or that are assigned to them are returned.
+        """
+        model = self.model
+        query = query.filter(
+            *self.task_filters(status=status, due_after=due_after, due_before=due_before, model=model)
+        )
+        if assignee_id is not None:
+            query = query.filter(model.assignee_id == assignee_id)
+        if project_id is not None:
+            query = query.filter(model.project_id == project_id)
+        if text:
+            tsquery = func.plainto_tsquery(literal_column("'simple'::regconfig"), text)
+            query = query.filter(search_document(model.__tablename__).op("@@")(tsquery))
+        if visible_to is not None:
+            query = query.join(model.project).filter(
+                or_(Project.owner_id == visible_to, model.assignee_id == visible_to)
+            )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor)
+
+    @staticmethod
+    def task_filters(
+        *,
+        status: Optional[TaskStatus] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        model: Any = Task,
+    ) -> List[Any]:
+        """WHERE clauses for a status and a `due_after` <= due_date < `due_before` range."""
+        clauses: List[Any] = []
+        if status is not None:
+            clauses.append(model.status == normalize_status(status))
+        if due_after is not None:
+            clauses.append(model.due_date >= due_after)
+        if due_before is not None:
+            clauses.append(model.due_date < due_before)
+        return clauses
+
+    def get_multi_mine(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        rows: Optional[RowShape] = None,
+    ) -> List[Task]:
+        """Tasks assigned to `user_id` or in projects they own (see `mine_ids`)."""
+        ids = self.mine_ids(
+            user_id=user_id, status=status, due_after=due_after, due_before=due_before,
+            skip=skip, limit=limit, cursor=cursor,
+        )
+        query = self.query(db, options=options, rows=rows).join(ids, ids.c.id == Task.id)
+        return self.fetch(self.paginate(query, skip=skip, limit=limit, cursor=cursor), rows=rows)
+
+    def mine_ids(
+        self,
+        *,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Subquery:
+        """
+        Ids of the page of tasks assigned to `user_id` or in projects they own.
+
+        One UNION of two branches, each walking its own index: tasks by
+        `assignee_id` and tasks of the projects found through
+        `projects.owner_id`. Both branches are cut to the first `skip + limit`
+        ids after the cursor, which is all the outer page can use, and UNION
+        drops tasks that match both.
+        """
+        filters = self.task_filters(status=status, due_after=due_after, due_before=due_before)
+        assigned = select(Task.id).where(Task.assignee_id == user_id, *filters)
+        owned = (
+            select(Task.id)
+            .join(Project, Project.id == Task.project_id)
+            .where(Project.owner_id == user_id, *filters)
+        )
+        branches = [
+            self.paginate(branch, limit=skip + limit, cursor=cursor).subquery()
+            for branch in (assigned, owned)
+        ]
+        return union(*(select(branch.c.id) for branch in branches)).subquery("mine")
+
+    def get_board(
+        self, db: Session, *, project_id: int, per_column: int, cursors: Sequence[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """A project's board: per status column, its first tasks by due date and its total."""
+        positions = self.board_positions(cursors)
+        stmt = self.board_statement(project_id=project_id, per_column=per_column, positions=positions)
+        return self.to_board(db.execute(stmt).all(), per_column=per_column, positions=positions)
+
+    def board_positions(self, cursors: Sequence[str]) -> Dict[str, Optional[BoardPosition]]:
+        """
+        The columns to read and where each one starts, from per-column cursors.
+
+        Without cursors every column starts at its first task; with cursors only
+        their columns are read, each after its cursor's task.
+        """
+        if not cursors:
+            return {s.value: None for s in TaskStatus}
+        positions: Dict[str, Optional[BoardPosition]] = {}
+        for cursor in cursors:
+            values = decode_cursor(cursor)
+            try:
+                status, due_date, id = values
+                position = BoardPosition(
+                    TaskStatus(status).value,
+                    None if due_date is None else datetime.fromisoformat(due_date),
+                    int(id),
+                )
+            except (TypeError, ValueError):
+                raise InvalidCursor("Invalid pagination cursor")
+            if position.status in positions:
+                raise InvalidCursor("More than one cursor for the same column")
+            positions[position.status] = position
+        return positions
+
+    def board_statement(
+        self, *, project_id: int, per_column: int, positions: Mapping[str, Optional[BoardPosition]]
+    ) -> Select:
+        """
+        One window-function query over the project's tasks in the `positions` columns.
+
+        Rows are numbered per column in board order (due date, then id; no due
+        date last), separately for the tasks after the column's cursor. The
+        first `per_column + 1` of those are returned (the extra one tells
+        whether there is more), each with its column total; one more task
+        before the cursor comes back only so an exhausted column still has its
+        total. `ix_tasks_project_id_status_due_date` serves the scan in order.
+        """
+        after = or_(
+            *(
+                and_(Task.status == status, true() if position is None else self._after(position))
+                for status, position in positions.items()
+            )
+        )
+        ranked = (
+            select(
+                Task,
+                func.count().over(partition_by=Task.status).label("column_total"),
+                func.row_number()
+                .over(partition_by=(Task.status, after), order_by=self.board_order())
+                .label("position"),
+                after.label("after_cursor"),
+            )
+            .where(Task.project_id == project_id, Task.status.in_(list(positions)))
+            .subquery("ranked")
+        )
+        task = aliased(Task, ranked)
         return (
-            db.query(self.model)
-            .filter(Task.assignee_id == assignee_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+            select(task, ranked.c.column_total, ranked.c.after_cursor)
+            .options(joinedload(task.assignee))
+            .where(
+                or_(
+                    and_(ranked.c.after_cursor, ranked.c.position <= per_column + 1),
+                    and_(not_(ranked.c.after_cursor), ranked.c.position == 1),
+                )
+            )
+            .order_by(ranked.c.status, ranked.c.position)
+        )
+
+    @staticmethod
+    def board_order() -> List[Any]:
+        return [Task.due_date.asc().nulls_last(), Task.id]
+
+    @staticmethod
+    def _after(position: BoardPosition) -> Any:
+        """Tasks after `position` in board order, within its column."""
+        if position.due_date is None:
+            return and_(Task.due_date.is_(None), Task.id > position.id)
+        return or_(
+            Task.due_date > position.due_date,
+            and_(Task.due_date == position.due_date, Task.id > position.id),
+            Task.due_date.is_(None),
+        )
+
+    def to_board(
+        self,
+        rows: Iterable[Row],
+        *,
+        per_column: int,
+        positions: Mapping[str, Optional[BoardPosition]],
+    ) -> List[Dict[str, Any]]:
+        """Group `board_statement` rows into columns, with each one's `next_cursor`."""
+        columns = {
+            status: {"status": status, "total": 0, "tasks": [], "next_cursor": None}
+            for status in positions
+        }
+        for task, total, after_cursor in rows:
+            column = columns[task.status]
+            column["total"] = total
+            if after_cursor:
+                column["tasks"].append(task)
+        for column in columns.values():
+            tasks = column["tasks"]
+            if len(tasks) > per_column:
+                del tasks[per_column:]
+                last = tasks[-1]
+                column["next_cursor"] = encode_cursor([last.status, last.due_date, last.id])
+        return list(columns.values())
+
+    def get_with_access(
+        self,
+        db: Session,
+        *,
+        id: int,
+        assignee_id: Optional[int] = None,
+        options: Sequence[Any] = (),
+    ) -> Optional[TaskAccess]:
+        """
+        Load a task together with everything needed to authorize a change to it.
+
+        One round trip returns the task, its project (for the owner check) and
+        its current assignee, plus the user `assignee_id` refers to when the
+        caller is about to reassign the task. Returns None if the task is missing.
+        """
+        row = db.execute(self.access_statement(id, assignee_id, options)).first()
+        return self.to_access(row)
+
+    def access_statement(
+        self, id: int, assignee_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> Select:
+        """The SELECT behind `get_with_access`, shared with the async CRUD."""
+        model = self.model
+        stmt = (
+            select(model)
+            .join(model.project)
+            .options(contains_eager(model.project), joinedload(model.assignee), *options)
+            .where(model.id == id)
         )
+        if assignee_id is not None:
+            new_assignee = aliased(User)
+            stmt = stmt.add_columns(new_assignee).outerjoin(
+                new_assignee, new_assignee.id == assignee_id
+            )
+        return stmt
+
+    @staticmethod
+    def to_access(row: Optional[Row]) -> Optional[TaskAccess]:
+        if row is None:
+            return None
+        return TaskAccess(row[0], row[1] if len(row) > 1 else None)
+
+    def update_status_returning(
+        self, db: Session, *, db_obj: Task, status: TaskStatus
+    ) -> Optional[Task]:
+        """
+        Set the status with a single UPDATE ... RETURNING instead of UPDATE plus refresh.
+
+        None if the task was deleted since it was loaded.
+        """
+        return self._update_returning(db, db_obj, {"status": normalize_status(status)})
+
+    def update_assignee_returning(
+        self, db: Session, *, db_obj: Task, assignee: Optional[User]
+    ) -> Optional[Task]:
+        """
+        Reassign with a single UPDATE ... RETURNING; None if the task is gone.
+
+        `assignee` is the already loaded user (see `get_with_access`), so the
+        relationship is set without another query.
+        """
+        assignee_id = assignee.id if assignee is not None else None
+        if self._update_returning(db, db_obj, {"assignee_id": assignee_id}) is None:
+            return None
+        set_committed_value(db_obj, "assignee", assignee)
+        return db_obj
+
+    def _update_returning(self, db: Session, db_obj: Task, values: Dict[str, Any]) -> Optional[Task]:
+        row = db.execute(self.update_returning_statement(db_obj.id, values)).mappings().one_or_none()
+        if row is None:
+            # Deleted after the access check: nothing was updated
+            db.rollback()
+            return None
+        task_counter.apply(db, self.returned_row_deltas(row))
+        db.commit()
+        return self.apply_returned_row(db_obj, row)
+
+    def returned_row_deltas(self, row: Mapping[str, Any]) -> Counter:
+        """Counter deltas from an `update_returning_statement` row: replaced values to new ones."""
+        return task_counter.moved(
+            task_counter.counter_key(row["old_project_id"], row["old_status"], row["old_due_date"]),
+            task_counter.counter_key(row["project_id"], row["status"], row["due_date"]),
+        )
+
+    def update_returning_statement(self, id: int, values: Dict[str, Any]) -> Update:
+        """
+        UPDATE task `id`, returning the new row and the counter columns it replaced.
+
+        As in `update_status_multi`, the row is locked first and the replaced
+        values (`old_project_id`, `old_status`, `old_due_date`) come from that
+        locking read, not from the object loaded for the access check, which a
+        concurrent write may have changed since.
+        """
+        table = self.model.__table__
+        locked = (
+            select(table.c.id, table.c.project_id, table.c.status, table.c.due_date)
+            .where(table.c.id == id)
+            .with_for_update()
+            .cte("locked")
+            .prefix_with("MATERIALIZED")
+        )
+        return (
+            update(table)
+            .where(table.c.id == locked.c.id)
+            .values(**values)
+            .returning(
+                *table.c,
+                locked.c.project_id.label("old_project_id"),
+                locked.c.status.label("old_status"),
+                locked.c.due_date.label("old_due_date"),
+            )
+        )
+
+    def apply_returned_row(self, db_obj: Task, row: Mapping[str, Any]) -> Task:
+        # Sessions are created with expire_on_commit=False, so these stay loaded
+        for column in self.model.__table__.c:
+            set_committed_value(db_obj, column.key, row[column.name])
+        return db_obj
+
+    def lock_statement(self, id: int) -> Select:
+        table = self.model.__table__
+        return select(*table.c).where(table.c.id == id).with_for_update()
+
+    def lock(self, db: Session, db_obj: Task) -> bool:
+        """
+        Lock the task's row and load its current columns into `db_obj`; False
+        if it was deleted since it was loaded.
+
+        ORM updates call this first, so their counter deltas start from the
+        values the UPDATE replaces rather than those of the access check.
+        """
+        row = db.execute(self.lock_statement(db_obj.id)).mappings().one_or_none()
+        if row is None:
+            return False
+        self.apply_returned_row(db_obj, row)
+        return True
 
     def update_status(
         self, db: Session, *, db_obj: Task, status: TaskStatus
-    ) -> Task:
+    ) -> Optional[Task]:
+        if not self.lock(db, db_obj):
+            db.rollback()
+            return None
         # Persist enum value as canonical string
-        db_obj.status = status.value if hasattr(status, 'value') else str(status)
+        old_key = task_counter.task_key(db_obj)
+        db_obj.status = normalize_status(status)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._flush_with_counters(db, task_counter.moved(old_key, task_counter.task_key(db_obj)))
+        commit_write(db, db_obj)
         return db_obj
 
     def update_assignee(
@@ -57,31 +525,171 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
     ) -> Task:
         db_obj.assignee_id = assignee_id
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_write(db, db_obj)
+        self.expire_stale_relationships(db, db_obj, ["assignee_id"])
         return db_obj
 
     def create(self, db: Session, *, obj_in: TaskCreate) -> Task:
         data: Dict[str, Any] = jsonable_encoder(obj_in)
         # Normalize status to match DB CHECK constraint
-        mapping = {
-            'TODO': 'ToDo',
-            'IN_PROGRESS': 'InProgress',
-            'DONE': 'Done',
-            'ToDo': 'ToDo',
-            'InProgress': 'InProgress',
-            'Done': 'Done',
-        }
-        status_val = data.get('status')
-        if hasattr(status_val, 'value'):
-            data['status'] = status_val.value
-        elif isinstance(status_val, str):
-            data['status'] = mapping.get(status_val, status_val)
+        if data.get('status') is not None:
+            data['status'] = normalize_status(data['status'])
         db_obj = self.model(**data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        # obj_in rather than db_obj: jsonable_encoder turned due_date into a string
+        key = task_counter.counter_key(obj_in.project_id, data['status'], obj_in.due_date)
+        self._flush_with_counters(db, Counter([key]))
+        commit_write(db, db_obj)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Task,
+        obj_in: Union[TaskUpdate, Dict[str, Any]]
+    ) -> Optional[Task]:
+        """Apply `obj_in` to the task; None if it was deleted since it was loaded."""
+        if not self.lock(db, db_obj):
+            db.rollback()
+            return None
+        old_key = task_counter.task_key(db_obj)
+        update_data = self.assign(db_obj, obj_in)
+        if 'status' in update_data:
+            db_obj.status = normalize_status(db_obj.status)
+        db.add(db_obj)
+        self._flush_with_counters(db, task_counter.moved(old_key, task_counter.task_key(db_obj)))
+        commit_write(db, db_obj)
+        self.expire_stale_relationships(db, db_obj, update_data)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> Optional[Task]:
+        """
+        Delete task `id` with DELETE ... RETURNING; None if it was already gone.
+
+        The counter delta comes from the deleted row itself, so it is applied
+        only for a row actually deleted, with the status it had then.
+        """
+        row = db.execute(self.delete_returning_statement(id)).mappings().one_or_none()
+        if row is None:
+            db.rollback()
+            return None
+        key = task_counter.counter_key(row["project_id"], row["status"], row["due_date"])
+        task_counter.apply(db, Counter({key: -1}))
+        db.commit()
+        return self.deleted_task(row)
+
+    def delete_returning_statement(self, id: int) -> Delete:
+        table = self.model.__table__
+        return delete(table).where(table.c.id == id).returning(*table.c)
+
+    def deleted_task(self, row: Mapping[str, Any]) -> Task:
+        """The deleted row as a transient `Task`."""
+        return self.model(**{column.key: row[column.name] for column in self.model.__table__.c})
+
+    def _flush_with_counters(self, db: Session, deltas: Mapping[Any, int]) -> None:
+        # Tasks first, then counters: the same lock order as the Core paths
+        # (UPDATE ... RETURNING, bulk), so concurrent writers cannot deadlock
+        db.flush()
+        task_counter.apply(db, deltas)
+
+    def create_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[TaskCreate],
+        assignees: Optional[Mapping[int, User]] = None,
+    ) -> List[Task]:
+        """
+        Insert many tasks with one multi-row INSERT ... RETURNING.
+
+        Rows come back in input order with server defaults populated, so no
+        refresh is needed. `assignees` are users the caller already loaded,
+        keyed by id; they are attached without another query.
+        """
+        rows = []
+        for obj_in in objs_in:
+            data = obj_in.dict()
+            data['status'] = normalize_status(data['status'])
+            rows.append(data)
+        if not rows:
+            return []
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        tasks = list(db.scalars(stmt, rows))
+        task_counter.apply(db, Counter(task_counter.task_key(t) for t in tasks))
+        db.commit()
+        if assignees is not None:
+            for task_obj in tasks:
+                set_committed_value(task_obj, "assignee", assignees.get(task_obj.assignee_id))
+        return tasks
+
+    def update_status_multi(
+        self,
+        db: Session,
+        *,
+        status: TaskStatus,
+        ids: Optional[Sequence[int]] = None,
+        project_id: Optional[int] = None,
+        from_status: Optional[TaskStatus] = None,
+        actor_id: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Move the selected tasks to `status` in one statement and return the ids changed.
+
+        Tasks are selected by `ids` and/or `project_id` (and `from_status`).
+        With `actor_id`, only tasks whose project that user owns or that are
+        assigned to them are touched; the permission check is part of the
+        statement itself rather than a prior SELECT.
+
+        The selected rows are locked first (FOR UPDATE, in id order), and the
+        UPDATE takes their pre-update status from that locking read. A row
+        changed by a concurrent write is re-read once its lock is released,
+        so the counters always move from the status actually replaced.
+        """
+        table = self.model.__table__
+        locked = select(table.c.id, table.c.status)
+        if ids is not None:
+            locked = locked.where(table.c.id.in_(ids))
+        if project_id is not None:
+            locked = locked.where(table.c.project_id == project_id)
+        if from_status is not None:
+            locked = locked.where(table.c.status == normalize_status(from_status))
+        if actor_id is not None:
+            projects = Project.__table__
+            locked = locked.where(
+                table.c.project_id == projects.c.id,
+                or_(projects.c.owner_id == actor_id, table.c.assignee_id == actor_id),
+            )
+        locked = (
+            locked.order_by(table.c.id)
+            .with_for_update(of=table)
+            .cte("locked")
+            .prefix_with("MATERIALIZED")
+        )
+        stmt = (
+            update(table)
+            .values(status=normalize_status(status))
+            .where(table.c.id == locked.c.id)
+            .returning(table.c.id, table.c.project_id, table.c.due_date, locked.c.status.label("old_status"))
+        )
+        rows = db.execute(stmt).all()
+        deltas: Counter = Counter()
+        for row in rows:
+            deltas.update(
+                task_counter.moved(
+                    task_counter.counter_key(row.project_id, row.old_status, row.due_date),
+                    task_counter.counter_key(row.project_id, status, row.due_date),
+                )
+            )
+        task_counter.apply(db, deltas)
+        db.commit()
+        return [row.id for row in rows]
+
+    def get_existing_ids(self, db: Session, *, ids: Iterable[int]) -> List[int]:
+        ids = list(ids)
+        if not ids:
+            return []
+        return [task_id for (task_id,) in db.query(Task.id).filter(Task.id.in_(ids)).all()]
+
 
 task = CRUDTask(Task)
@@ -0,0 +1,157 @@
+"""
+Old Done tasks, moved out of `tasks` into `tasks_archive`.
+
+`tasks` is the working set every listing walks; tasks that have been Done
+for a long time only bloat its indexes. `archive` moves the ones unchanged
+for longer than a cutoff in batches: each batch is one statement (DELETE ...
+RETURNING feeding an INSERT) in its own short transaction, so row locks are
+held for one batch only, and SKIP LOCKED passes over tasks a request is
+writing instead of waiting for them. See `archive_tasks.py`.
+
+Reads consult the archive only when asked (`include_archived`): the read
+paths of `crud.task` run over `tasks_archive` as well, and the results are
+merged. The counters are not touched, so archived tasks still count in the
+project stats (`task_counter.rebuild` reads both tables).
+"""
+import time
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Insert, Table, delete, func, insert, literal, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.crud.task import CRUDTask
+from app.models import Task, TaskArchive, TaskStatus
+from app.schemas.task import Task as TaskSchema, TaskWithProject
+
+# Legacy rows may still hold the upper-case enum name; both must match the
+# predicate of ix_tasks_done_last_changed (migration 0012)
+DONE_STATUSES = (TaskStatus.DONE.value, "DONE")
+
+
+def last_changed(table: Table) -> Any:
+    """When a task last changed; the expression of ix_tasks_done_last_changed."""
+    return func.coalesce(table.c.updated_at, table.c.created_at)
+
+
+def item_id(item: Any) -> int:
+    return item["id"] if isinstance(item, Mapping) else item.id
+
+
+def merge_pages(pages: Iterable[List[Any]], *, skip: int, limit: int) -> List[Any]:
+    """Cut a page from per-table results, each fetched with `skip=0, limit=skip + limit`."""
+    return sorted(chain.from_iterable(pages), key=item_id)[skip:skip + limit]
+
+
+class CRUDTaskArchive(CRUDTask):
+    """
+    The read paths of `CRUDTask` over `tasks_archive`, plus the archive job.
+
+    Archived tasks are read-only: they are never written through the API,
+    only moved in by `archive_batch`.
+    """
+
+    def schema_loaders(self) -> Dict[Type[BaseModel], Sequence[Any]]:
+        return {
+            TaskSchema: (joinedload(TaskArchive.assignee),),
+            TaskWithProject: (joinedload(TaskArchive.project),),
+        }
+
+    def search_with(
+        self,
+        db: Session,
+        live: CRUDTask,
+        *,
+        schema: Type[BaseModel],
+        fast: bool = False,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Any]:
+        """
+        `live.search` over tasks and archived tasks together, paged by id.
+
+        Ids are unique across both tables (archived tasks keep theirs), so
+        each table returns its first `skip + limit` matches after the cursor
+        and the page is cut from the merge. Rows come back as `schema`
+        objects, or as plain dicts with `fast` (see `row_shape`).
+        """
+        if cursor is not None:
+            # paginate ignores skip after a cursor
+            skip = 0
+        pages = [
+            crud_obj.search(
+                db,
+                skip=0,
+                limit=skip + limit,
+                cursor=cursor,
+                options=crud_obj.load_options(schema),
+                rows=crud_obj.row_shape(schema) if fast else None,
+                **filters,
+            )
+            for crud_obj in (live, self)
+        ]
+        return merge_pages(pages, skip=skip, limit=limit)
+
+    def archive_statement(self, *, before: datetime, batch_size: int) -> Insert:
+        """
+        Move up to `batch_size` Done tasks last changed before `before`, oldest
+        first, and return their ids.
+
+        The batch is found through ix_tasks_done_last_changed and locked with
+        SKIP LOCKED; the tasks are deleted and inserted into the archive by
+        the same statement.
+        """
+        tasks = Task.__table__
+        archive = self.model.__table__
+        changed = last_changed(tasks)
+        batch = (
+            select(tasks.c.id)
+            .where(tasks.c.status.in_(DONE_STATUSES), changed < before)
+            .order_by(changed)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        moved = (
+            delete(tasks)
+            .where(tasks.c.id == batch.c.id)
+            .returning(*tasks.c)
+            .cte("moved")
+        )
+        columns = [column.name for column in tasks.c]
+        # Every moved task is Done; legacy 'DONE' rows are archived as 'Done'
+        values = [
+            literal(TaskStatus.DONE.value).label(name) if name == "status" else moved.c[name]
+            for name in columns
+        ]
+        return insert(archive).from_select(columns, select(*values)).returning(archive.c.id)
+
+    def archive_batch(self, db: Session, *, before: datetime, batch_size: int) -> int:
+        """Run one `archive_statement` in its own transaction; return how many tasks moved."""
+        moved = len(db.execute(self.archive_statement(before=before, batch_size=batch_size)).all())
+        db.commit()
+        return moved
+
+    def archive(
+        self, db: Session, *, before: datetime, batch_size: int, pause: float = 0
+    ) -> int:
+        """
+        Archive every Done task last changed before `before`, batch by batch.
+
+        Sleeps `pause` seconds between batches so replicas and autovacuum keep
+        up; stops at the first batch that is not full. Returns the total moved.
+        """
+        total = 0
+        while True:
+            moved = self.archive_batch(db, before=before, batch_size=batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+            time.sleep(pause)
+
+
+task_archive = CRUDTaskArchive(TaskArchive)
@@ -0,0 +1,176 @@
+"""
+Per-project task counters, so project statistics never scan `tasks`.
+
+`project_task_counters` holds one row per (project, status, due day) with the
+number of tasks in it. Every task write in `crud.task` (and its async
+counterpart) turns its effect into deltas and applies them with one upsert in
+the same transaction as the write. `rebuild` recomputes the table from
+`tasks` and `tasks_archive` (see `reconcile_counters.py`); archiving a task
+does not change its counter.
+
+Overdue means not Done and due before today (UTC), which is why due dates
+are kept at day granularity.
+"""
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import Insert, Select, case, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import ProjectTaskCounter, TaskStatus
+from app.models.task import normalize_status
+
+# Stands in for "no due date": never overdue, and keeps due_on part of the primary key
+NO_DUE_DATE = date(9999, 12, 31)
+
+CounterKey = Tuple[int, str, date]
+
+_TODAY_UTC = literal_column("(now() AT TIME ZONE 'UTC')::date")
+
+
+def due_day(due_date: Optional[datetime]) -> date:
+    if due_date is None:
+        return NO_DUE_DATE
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc)
+    return due_date.date()
+
+
+def counter_key(project_id: int, status: Any, due_date: Optional[datetime]) -> CounterKey:
+    return (project_id, normalize_status(status), due_day(due_date))
+
+
+def task_key(task: Any) -> CounterKey:
+    """The counter a task (or a row with the same attributes) is counted under."""
+    return counter_key(task.project_id, task.status, task.due_date)
+
+
+def moved(old: CounterKey, new: CounterKey) -> Counter:
+    """Deltas for a task that moved from counter `old` to `new`."""
+    deltas: Counter = Counter()
+    if old != new:
+        deltas[old] -= 1
+        deltas[new] += 1
+    return deltas
+
+
+def upsert_statement(deltas: Mapping[CounterKey, int]) -> Optional[Insert]:
+    """
+    One multi-row INSERT ... ON CONFLICT adding `deltas` to the counters.
+
+    Keys are sorted so concurrent writers lock counter rows in the same order.
+    Returns None when there is nothing to change.
+    """
+    rows = [
+        {"project_id": project_id, "status": status, "due_on": due_on, "task_count": delta}
+        for (project_id, status, due_on), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return None
+    table = ProjectTaskCounter.__table__
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.status, table.c.due_on],
+        set_={"task_count": table.c.task_count + stmt.excluded.task_count},
+    )
+
+
+def apply(db: Session, deltas: Mapping[CounterKey, int]) -> None:
+    """Add `deltas` to the counters; the caller commits together with the task write."""
+    stmt = upsert_statement(deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def stats_statement(project_ids: Iterable[int]) -> Select:
+    table = ProjectTaskCounter.__table__
+    overdue = case(
+        (
+            (table.c.status != TaskStatus.DONE.value) & (table.c.due_on < _TODAY_UTC),
+            table.c.task_count,
+        ),
+        else_=0,
+    )
+    return (
+        select(
+            table.c.project_id,
+            table.c.status,
+            func.sum(table.c.task_count).label("task_count"),
+            func.sum(overdue).label("overdue"),
+        )
+        .where(table.c.project_id.in_(list(project_ids)))
+        .group_by(table.c.project_id, table.c.status)
+    )
+
+
+def empty_stats(project_id: int) -> Dict[str, Any]:
+    return {
+        "project_id": project_id,
+        "total": 0,
+        "overdue": 0,
+        "by_status": {s.value: 0 for s in TaskStatus},
+        "overdue_by_status": {s.value: 0 for s in TaskStatus},
+    }
+
+
+def to_stats(project_ids: Iterable[int], rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Fold `stats_statement` rows into one stats dict per project, in `project_ids` order."""
+    stats = {project_id: empty_stats(project_id) for project_id in project_ids}
+    for row in rows:
+        entry = stats[row.project_id]
+        status = normalize_status(row.status)
+        entry["by_status"][status] = entry["by_status"].get(status, 0) + int(row.task_count)
+        entry["overdue_by_status"][status] = entry["overdue_by_status"].get(status, 0) + int(row.overdue)
+        entry["total"] += int(row.task_count)
+        entry["overdue"] += int(row.overdue)
+    return list(stats.values())
+
+
+def get_stats(db: Session, *, project_ids: Iterable[int]) -> List[Dict[str, Any]]:
+    """Task counts by status and overdue counts for each project, from the counters only."""
+    project_ids = list(dict.fromkeys(project_ids))
+    if not project_ids:
+        return []
+    return to_stats(project_ids, db.execute(stats_statement(project_ids)))
+
+
+REBUILD_SQL = (
+    """
+    INSERT INTO project_task_counters (project_id, status, due_on, task_count)
+    SELECT project_id,
+           CASE status
+               WHEN 'TODO' THEN 'ToDo'
+               WHEN 'IN_PROGRESS' THEN 'InProgress'
+               WHEN 'DONE' THEN 'Done'
+               ELSE status
+           END,
+           coalesce((due_date AT TIME ZONE 'UTC')::date, DATE '%s'),
+           count(*)
+    FROM (
+        SELECT project_id, status, due_date FROM tasks
+        UNION ALL
+        SELECT project_id, status, due_date FROM tasks_archive
+    ) AS all_tasks
+    GROUP BY 1, 2, 3
+    """
+    % NO_DUE_DATE.isoformat()
+)
+
+
+def rebuild(db: Session) -> int:
+    """
+    Recompute every counter from `tasks` and `tasks_archive` and return the
+    number of counter rows.
+
+    The EXCLUSIVE lock waits for in-flight task writes (which hold the counter
+    table while they commit) and holds new ones back until the rebuild commits,
+    so no delta is lost or counted twice.
+    """
+    db.execute(text("LOCK TABLE project_task_counters IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM project_task_counters"))
+    rows = db.execute(text(REBUILD_SQL)).rowcount
+    db.commit()
+    return rows
@@ -1,9 +1,15 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+from sqlalchemy import Executable, delete, insert, select, update
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.principal_cache import Principal, get_principal, principal_cache
+from app.core.query_cache import query_cache
+from app.crud import cache
+from app.core.security import get_password_hash, get_password_hashes, verify_password
 from app.crud.base import CRUDBase
+from app.db.session import commit_write
+from app.models import Project, Task
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -12,6 +18,11 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
+    def get_existing_emails(self, db: Session, *, emails: Sequence[str]) -> List[str]:
+        if not emails:
+            return []
+        return [email for (email,) in db.query(User.email).filter(User.email.in_(emails)).all()]
+
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
@@ -20,10 +31,28 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_superuser=obj_in.is_superuser,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_write(db, db_obj)
         return db_obj
 
+    def create_multi(self, db: Session, *, objs_in: Sequence[UserCreate]) -> List[User]:
+        """Create many users; passwords are hashed in parallel on the hashing pool."""
+        hashes = get_password_hashes([obj_in.password for obj_in in objs_in])
+        rows = [
+            {
+                "email": obj_in.email,
+                "hashed_password": hashed_password,
+                "full_name": obj_in.full_name,
+                "is_superuser": obj_in.is_superuser,
+            }
+            for obj_in, hashed_password in zip(objs_in, hashes)
+        ]
+        if not rows:
+            return []
+        # One multi-row INSERT ... RETURNING instead of an INSERT and refresh per user
+        users = list(db.scalars(insert(User).returning(User), rows))
+        db.commit()
+        return users
+
     def update(
         self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
@@ -37,7 +66,35 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
         
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(user.id)
+        return user
+
+    def remove(self, db: Session, *, id: int) -> Optional[User]:
+        user = self.execute_delete(db, self.delete_statements(id))
+        principal_cache.invalidate(id)
+        query_cache.bump(cache.owner_projects(id))
+        return user
+
+    def delete_statements(self, id: int) -> List[Executable]:
+        """
+        Delete user `id`, their projects and those projects' tasks set by set.
+
+        Tasks assigned to the user in other projects are unassigned (which
+        also bumps their `updated_at`) instead of being loaded by the ORM.
+        """
+        owned = select(Project.id).where(Project.owner_id == id)
+        bulk = {"synchronize_session": False}
+        return [
+            delete(Task).where(Task.project_id.in_(owned)).execution_options(**bulk),
+            delete(Project).where(Project.owner_id == id).execution_options(**bulk),
+            update(Task).where(Task.assignee_id == id).values(assignee_id=None).execution_options(**bulk),
+            delete(User).where(User.id == id).returning(User).execution_options(**bulk),
+        ]
+
+    def get_principal(self, db: Session, *, id: int) -> Optional[Principal]:
+        """Return id/is_active/is_superuser for `id`, served from the principal cache."""
+        return get_principal(db, id)
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
@@ -47,10 +104,10 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             return None
         return user
 
-    def is_active(self, user: User) -> bool:
+    def is_active(self, user: Union[User, Principal]) -> bool:
         return user.is_active
 
-    def is_superuser(self, user: User) -> bool:
+    def is_superuser(self, user: Union[User, Principal]) -> bool:
         return user.is_superuser
 
 
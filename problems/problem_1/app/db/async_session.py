@@ -0,0 +1,22 @@
+"""Async session dependency for the asyncpg-backed API (`USE_ASYNC_DB`).
+
+The engine and `AsyncSessionLocal` come from `app.db.session`, which sizes
+and instruments the async pool the same way as the sync one. This module is
+only imported by `app.api.aio` and `app.crud.aio`.
+"""
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, async_database_url, get_async_engine  # noqa: F401
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function that yields async database sessions.
+
+    Yields:
+        AsyncSession: A SQLAlchemy async session object.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
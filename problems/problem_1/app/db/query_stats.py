@@ -0,0 +1,141 @@
+"""Per-request SQL statistics and the slow-query log.
+
+`instrument` hooks an engine's `before/after_cursor_execute` events; every
+engine built by `app.db.session` (sync, async and replicas) is hooked, so
+this covers Problems 1, 2 and 3. `QueryStatsMiddleware` gives each HTTP
+request a counter that the hooks add to, and on the way out records how many
+statements the request ran and how long they took, per route:
+
+* `db_queries_per_request{method,route}` (histogram of statement counts)
+* `db_time_per_request_seconds{method,route}`
+
+Statements slower than `SLOW_QUERY_MS` are logged with their normalized SQL
+(literals and bind parameters replaced by `?`) and the route that ran them,
+and counted in `db_slow_queries_total{route}`.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3; a service
+must add the middleware from the same module copy as the engine it uses.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from prometheus_fastapi_instrumentator.routing import get_route_name
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.config import settings
+from ..core.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+QUERIES = histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+DB_TIME = histogram(
+    "db_time_per_request_seconds",
+    "Time per HTTP request spent executing SQL statements",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0),
+)
+SLOW_QUERIES = counter(
+    "db_slow_queries", "Statements slower than SLOW_QUERY_MS", ["route"]
+)
+
+# Requests outside any route (and statements outside any request) are labelled so
+UNMATCHED = "none"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """`statement` on one line, with literals and bind parameters as `?` and IN lists folded."""
+    sql = _SPACE.sub(" ", statement).strip()
+    sql = _LITERALS.sub("?", _PARAMS.sub("?", sql))
+    return _LISTS.sub("?, ...", sql)
+
+
+class RequestQueries:
+    """Statements run so far by one request."""
+
+    __slots__ = ("scope", "count", "seconds", "_route")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self._route: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        """The route template, as the `handler` label of the HTTP metrics."""
+        if self._route is None:
+            self._route = get_route_name(Request(self.scope)) or UNMATCHED
+        return self._route
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        route = stats.route if stats is not None else UNMATCHED
+        SLOW_QUERIES.labels(route=route).inc()
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, normalize_sql(statement)
+        )
+
+
+def _handle_error(exception_context: Any) -> None:
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument(engine: Engine) -> None:
+    """Record the statements `engine` runs (for an AsyncEngine, pass its `sync_engine`)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware recording the statements each HTTP request runs."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestQueries(scope)
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            labels = {"method": scope["method"], "route": stats.route}
+            QUERIES.labels(**labels).observe(stats.count)
+            DB_TIME.labels(**labels).observe(stats.seconds)
@@ -1,18 +1,255 @@
+"""The process-wide database engines and session factories.
+
+Every `get_db` in the three services draws from the engine built here, so a
+process holds one sync pool (and, if the async stack is used, one async
+pool) sized by the `DB_POOL_*` settings, plus one more of each per read
+replica in `DATABASE_REPLICA_URLS`. Engines are created on first use, so
+importing this package under a second name (it is importable both as
+`app.*` and `problems.problem_1.app.*`) opens nothing by itself. Each
+module copy keeps its own engines, though: a process that gets sessions
+from both copies holds two sets of pools, so a service must take all of
+them from one.
+
+Imports are relative so the module is shared by Problems 1, 2 and 3.
+"""
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..core.config import settings
+from ..core.metrics import gauge, histogram
+from . import query_stats
+
+POOL_CHECKED_OUT = gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["pool"]
+)
+POOL_OVERFLOW = gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (up to max_overflow)", ["pool"]
+)
+POOL_CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class _InstrumentedPoolMixin:
+    """Times checkouts and publishes pool occupancy to Prometheus."""
+
+    metrics_label = "sync"
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.metrics_label).observe(time.perf_counter() - started)
+            self._publish()
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)  # type: ignore[misc]
+        self._publish()
+
+    def _publish(self) -> None:
+        POOL_CHECKED_OUT.labels(pool=self.metrics_label).set(self.checkedout())  # type: ignore[attr-defined]
+        POOL_OVERFLOW.labels(pool=self.metrics_label).set(max(self.overflow(), 0))  # type: ignore[attr-defined]
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def pool_options() -> Dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+
+def async_database_url(url: str) -> str:
+    """Return `url` with the asyncpg driver, e.g. postgresql:// -> postgresql+asyncpg://."""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+_lock = threading.Lock()
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_replica_engines: Optional[List[Engine]] = None
+_async_replica_engines: Optional[List[AsyncEngine]] = None
+# Round-robin position over the replicas, shared by both stacks
+_replica_turn = itertools.count()
+
+
+def _create_sync_engine(url: str, label: str) -> Engine:
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    engine = create_engine(
+        url, poolclass=InstrumentedQueuePool, connect_args=connect_args, **pool_options()
+    )
+    engine.pool.metrics_label = label  # type: ignore[attr-defined]
+    query_stats.instrument(engine)
+    return engine
+
+
+def _create_async_engine(url: str, label: str) -> AsyncEngine:
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    engine = create_async_engine(
+        async_database_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=connect_args,
+        **pool_options(),
+    )
+    engine.pool.metrics_label = label  # type: ignore[attr-defined]
+    query_stats.instrument(engine.sync_engine)
+    return engine
+
+
+def get_engine() -> Engine:
+    """Return the process-wide sync engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _create_sync_engine(settings.DATABASE_URL, "sync")
+    return _engine
 
-from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide asyncpg engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                _async_engine = _create_async_engine(settings.DATABASE_URL, "async")
+    return _async_engine
+
+
+def get_replica_engines() -> List[Engine]:
+    """Return one sync engine per `DATABASE_REPLICA_URLS` entry (empty without replicas)."""
+    global _replica_engines
+    if _replica_engines is None:
+        with _lock:
+            if _replica_engines is None:
+                _replica_engines = [
+                    _create_sync_engine(url, f"replica{i}")
+                    for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+                ]
+    return _replica_engines
+
+
+def get_async_replica_engines() -> List[AsyncEngine]:
+    """Return one asyncpg engine per `DATABASE_REPLICA_URLS` entry (empty without replicas)."""
+    global _async_replica_engines
+    if _async_replica_engines is None:
+        with _lock:
+            if _async_replica_engines is None:
+                _async_replica_engines = [
+                    _create_async_engine(url, f"async-replica{i}")
+                    for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+                ]
+    return _async_replica_engines
+
+
+class _LazySessionmaker(sessionmaker):
+    """A sessionmaker bound to `get_engine()` the first time it is called."""
+
+    def __call__(self, **local_kw: Any) -> Any:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """An async_sessionmaker bound to `get_async_engine()` the first time it is called."""
+
+    def __call__(self, **local_kw: Any) -> Any:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
+
+
+# Keep loaded attributes after commit: responses are serialized from the
+# committed objects, and expiring them would cost a SELECT per object.
+SessionLocal = _LazySessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False
+)
+AsyncSessionLocal = _LazyAsyncSessionmaker(expire_on_commit=False, class_=AsyncSession)
 
 Base = declarative_base()
 
+
+def replica_session() -> Optional[Session]:
+    """A session on the next read replica in turn, or None when none is configured."""
+    engines = get_replica_engines()
+    if not engines:
+        return None
+    return SessionLocal(bind=engines[next(_replica_turn) % len(engines)], info={"replica": True})
+
+
+def async_replica_session() -> Optional[AsyncSession]:
+    """An async session on the next read replica in turn, or None when none is configured."""
+    engines = get_async_replica_engines()
+    if not engines:
+        return None
+    return AsyncSessionLocal(bind=engines[next(_replica_turn) % len(engines)], info={"replica": True})
+
+
+def is_replica(db: Any) -> bool:
+    """Whether `db` (sync or async) came from `replica_session` and may lag the primary."""
+    return bool(db.info.get("replica"))
+
+
+def __getattr__(name: str) -> Any:
+    # `engine` used to be a module attribute; keep it importable without creating it eagerly
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def commit_write(db: Session, *objs: Any) -> None:
+    """
+    Commit a write and leave `objs` loaded without another round trip.
+
+    The models map with `eager_defaults`, so server-generated columns
+    (`created_at`, `updated_at`) come back from the INSERT/UPDATE itself via
+    RETURNING, and sessions keep them because they do not expire on commit.
+    With `DB_WRITE_RETURNING=false` each object is refreshed after the commit
+    instead, which is the old behaviour.
+    """
+    db.commit()
+    if not settings.DB_WRITE_RETURNING:
+        for obj in objs:
+            db.refresh(obj)
+
+
 def get_db():
     """
     Dependency function that yields database sessions.
-    
+
     Yields:
         Session: A SQLAlchemy session object.
     """
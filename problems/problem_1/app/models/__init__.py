@@ -1,5 +1,7 @@
 from .user import User  # noqa
 from .project import Project  # noqa
 from .task import Task, TaskStatus  # noqa
+from .task_counter import ProjectTaskCounter  # noqa
+from .task_archive import TaskArchive  # noqa
 
 # This ensures that all models are imported and registered with SQLAlchemy's metadata
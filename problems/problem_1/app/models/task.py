@@ -1,26 +1,46 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 import enum
+from typing import Any
 
 class TaskStatus(str, enum.Enum):
     TODO = "ToDo"
     IN_PROGRESS = "InProgress"
     DONE = "Done"
 
+_STATUS_ALIASES = {
+    'TODO': 'ToDo',
+    'IN_PROGRESS': 'InProgress',
+    'DONE': 'Done',
+    'ToDo': 'ToDo',
+    'InProgress': 'InProgress',
+    'Done': 'Done',
+}
+
+
+def normalize_status(status: Any) -> str:
+    """Return the canonical string stored in `tasks.status` for an enum or alias."""
+    if hasattr(status, 'value'):
+        return status.value
+    return _STATUS_ALIASES.get(str(status), str(status))
+
 class Task(Base):
     __tablename__ = "tasks"
+    # Server defaults come back from the INSERT/UPDATE (RETURNING), not a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     # Store status as string; API layer still uses TaskStatus enum
     status = Column(String, default=TaskStatus.TODO.value, nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # default=null() puts NULL in the INSERT so eager_defaults need not SELECT it back
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
     due_date = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
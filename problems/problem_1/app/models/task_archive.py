@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+class TaskArchive(Base):
+    """
+    Done tasks moved out of `tasks` by `crud.task_archive.archive_batch`.
+
+    Same columns and ids as `tasks`, so the task schemas and read paths work
+    on either table; rows are never written through the API. Archived tasks
+    stay counted in `project_task_counters` and go away with their project.
+    """
+    __tablename__ = "tasks_archive"
+
+    # Keeps the id the task had in `tasks`
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(String, nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Read-only: archived rows are not part of Project.tasks or User.assigned_tasks
+    project = relationship("Project", viewonly=True)
+    assignee = relationship("User", viewonly=True)
+
+    def __repr__(self):
+        return f"<TaskArchive {self.title} - {self.status}>"
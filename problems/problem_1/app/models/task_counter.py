@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from ..core.database import Base
+
+class ProjectTaskCounter(Base):
+    """
+    Number of tasks per (project, status, due day), kept in step by `crud.task`.
+
+    Tasks without a due date are counted under `task_counter.NO_DUE_DATE`.
+    Rows go away with their project (ON DELETE CASCADE).
+    """
+    __tablename__ = "project_task_counters"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String, primary_key=True)
+    due_on = Column(Date, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProjectTaskCounter {self.project_id} {self.status} {self.due_on}: {self.task_count}>"
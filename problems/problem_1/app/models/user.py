@@ -1,10 +1,12 @@
 from sqlalchemy import Boolean, Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # Server defaults come back from the INSERT/UPDATE (RETURNING), not a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -13,11 +15,14 @@ class User(Base):
     is_active = Column(Boolean(), default=True)
     is_superuser = Column(Boolean(), default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # default=null() puts NULL in the INSERT so eager_defaults need not SELECT it back
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
-    projects = relationship("Project", back_populates="owner", cascade="all, delete-orphan")
-    assigned_tasks = relationship("Task", back_populates="assignee")
+    # The database cascades (projects) and nulls (tasks.assignee_id) on delete;
+    # passive_deletes keeps the ORM from loading either collection first
+    projects = relationship("Project", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    assigned_tasks = relationship("Task", back_populates="assignee", passive_deletes=True)
 
     def __repr__(self):
         return f"<User {self.email}>"
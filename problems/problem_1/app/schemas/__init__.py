@@ -1,7 +1,16 @@
 from .base import BaseSchema  # noqa
 from .user import User, UserCreate, UserInDB, UserUpdate  # noqa
 from .project import Project, ProjectCreate, ProjectUpdate, ProjectWithTasks  # noqa
+from .project import MAX_STATS_PROJECTS, ProjectStats  # noqa
 from .task import Task, TaskCreate, TaskUpdate, TaskWithProject, TaskStatus  # noqa
+from .task import MAX_BOARD_PER_COLUMN, BoardColumn, ProjectBoard  # noqa
+from .task import (  # noqa
+    BulkItemError,
+    TaskBulkCreate,
+    TaskBulkCreateResult,
+    TaskBulkStatusResult,
+    TaskBulkStatusUpdate,
+)
 from .token import Token, TokenPayload  # noqa
 
 # This ensures that all schemas are properly imported and available for use
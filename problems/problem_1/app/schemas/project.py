@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from .base import BaseSchema
 from .user import User
@@ -39,6 +39,17 @@ class ProjectInDB(ProjectInDBBase):
 class ProjectWithTasks(ProjectInDBBase):
     tasks: List["Task"] = []
 
+# Task counts for dashboards, served from the per-project counters
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int
+    # Not Done and due before today (UTC)
+    overdue: int
+    by_status: Dict[str, int]
+    overdue_by_status: Dict[str, int]
+
+MAX_STATS_PROJECTS = 100
+
 # Update forward refs for Task
 from .task import Task  # noqa
 ProjectWithTasks.update_forward_refs()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 from typing import Optional, List
 from datetime import datetime
 from .base import BaseSchema
@@ -51,3 +51,52 @@ class TaskWithProject(TaskInDBBase):
 # Update forward refs for Project
 from .project import Project  # noqa
 TaskWithProject.update_forward_refs()
+
+# Bulk operations
+MAX_BULK_TASKS = 1000
+
+class BulkItemError(BaseModel):
+    index: Optional[int] = None  # position in the request list (bulk create)
+    id: Optional[int] = None  # task id (bulk status)
+    detail: str
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_items=1, max_items=MAX_BULK_TASKS)
+
+class TaskBulkCreateResult(BaseModel):
+    created: List[Task] = []
+    errors: List[BulkItemError] = []
+
+class TaskBulkStatusUpdate(BaseModel):
+    status: TaskStatus
+    # Either explicit ids, or every task of a project (optionally only those in `from_status`)
+    task_ids: Optional[List[int]] = Field(None, min_items=1, max_items=MAX_BULK_TASKS)
+    project_id: Optional[int] = None
+    from_status: Optional[TaskStatus] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_selector(cls, values):
+        if (values.get("task_ids") is None) == (values.get("project_id") is None):
+            raise ValueError("Provide exactly one of task_ids or project_id")
+        if values.get("from_status") is not None and values.get("project_id") is None:
+            raise ValueError("from_status can only be combined with project_id")
+        return values
+
+class TaskBulkStatusResult(BaseModel):
+    status: TaskStatus
+    updated: List[int] = []
+    errors: List[BulkItemError] = []
+
+# Kanban board: each status column's first tasks by due date, and its total
+MAX_BOARD_PER_COLUMN = 100
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    total: int
+    tasks: List[Task] = []
+    # Pass back as `cursor` to load more of this column only
+    next_cursor: Optional[str] = None
+
+class ProjectBoard(BaseModel):
+    project_id: int
+    columns: List[BoardColumn]
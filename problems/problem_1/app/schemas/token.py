@@ -1,9 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+
+# Defined next to the decode cache, which Problem 3 imports without app.schemas
+from ..core.token_cache import TokenPayload  # noqa: F401
 
 class Token(BaseModel):
     access_token: str
     token_type: str
-
-class TokenPayload(BaseModel):
-    sub: Optional[int] = None
@@ -0,0 +1,43 @@
+"""
+Move Done tasks unchanged for `TASK_ARCHIVE_AFTER_DAYS` into `tasks_archive`.
+
+Runs in batches of `TASK_ARCHIVE_BATCH_SIZE`, one short transaction each
+(see `app.crud.task_archive`), so it can run while the API is serving:
+
+    python problems/problem_1/archive_tasks.py          # once
+    python problems/problem_1/archive_tasks.py --loop   # every TASK_ARCHIVE_INTERVAL_SECONDS
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.crud import task_archive
+from app.db.session import SessionLocal
+
+
+def run_once() -> int:
+    before = datetime.now(timezone.utc) - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    db = SessionLocal()
+    try:
+        return task_archive.archive(
+            db,
+            before=before,
+            batch_size=settings.TASK_ARCHIVE_BATCH_SIZE,
+            pause=settings.TASK_ARCHIVE_PAUSE_MS / 1000,
+        )
+    finally:
+        db.close()
+
+
+def main() -> None:
+    while True:
+        moved = run_once()
+        print(f"[archive] moved {moved} tasks to tasks_archive", flush=True)
+        if "--loop" not in sys.argv[1:]:
+            return
+        time.sleep(settings.TASK_ARCHIVE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Throughput of the Problem 1 API under many concurrent clients, sync vs async stack.
+
+Start one server per mode (same database), then point the benchmark at both:
+
+    uvicorn app.main:app --app-dir problems/problem_1 --port 8000
+    USE_ASYNC_DB=true uvicorn app.main:app --app-dir problems/problem_1 --port 8003
+
+    python problems/problem_1/benchmarks/concurrency.py \
+        --target sync=http://localhost:8000 --target async=http://localhost:8003 \
+        --concurrency 200 --duration 30
+
+Each client logs in once and then loops over a read-heavy mix (list tasks,
+get task, /users/me, list projects) for `--duration` seconds. Per target it
+prints requests/s, error count and latency percentiles; `--json` writes the
+same numbers to a file for comparison across runs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class Result:
+    target: str
+    concurrency: int
+    duration: float
+    requests: int = 0
+    errors: int = 0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "target": self.target,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 2),
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "mean_ms": round(statistics.fmean(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+        }
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    r = await client.post(
+        f"{API_PREFIX}/auth/login/access-token",
+        data={"username": email, "password": password},
+    )
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def prepare(client: httpx.AsyncClient, token: str) -> Optional[int]:
+    """Make sure there is at least one task to read; return its id."""
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.get(f"{API_PREFIX}/tasks/", headers=headers, params={"limit": 1})
+    r.raise_for_status()
+    if r.json():
+        return r.json()[0]["id"]
+    r = await client.post(
+        f"{API_PREFIX}/projects/", headers=headers, json={"title": "Benchmark", "description": "load"}
+    )
+    r.raise_for_status()
+    r = await client.post(
+        f"{API_PREFIX}/tasks/",
+        headers=headers,
+        json={"title": "Benchmark task", "project_id": r.json()["id"]},
+    )
+    r.raise_for_status()
+    return r.json()["id"]
+
+
+def request_mix(task_id: Optional[int]) -> List[Tuple[str, Dict[str, int]]]:
+    mix = [
+        (f"{API_PREFIX}/tasks/", {"limit": 20}),
+        (f"{API_PREFIX}/users/me", {}),
+        (f"{API_PREFIX}/projects/", {"limit": 20}),
+    ]
+    if task_id is not None:
+        mix.append((f"{API_PREFIX}/tasks/{task_id}", {}))
+    return mix
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    mix: List[Tuple[str, Dict[str, int]]],
+    deadline: float,
+    result: Result,
+) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        path, params = mix[i % len(mix)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            r = await client.get(path, headers=headers, params=params)
+            ok = r.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        result.latencies_ms.append((time.perf_counter() - started) * 1000)
+        result.requests += 1
+        if not ok:
+            result.errors += 1
+
+
+async def run_target(
+    name: str, base_url: str, *, concurrency: int, duration: float, email: str, password: str
+) -> Result:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        token = await login(client, email, password)
+        task_id = await prepare(client, token)
+        headers = {"Authorization": f"Bearer {token}"}
+        mix = request_mix(task_id)
+
+        # Short warm-up so connection setup is not part of the measurement
+        warmup = Result(name, concurrency, 0.0)
+        deadline = time.perf_counter() + min(2.0, duration / 10)
+        await asyncio.gather(*(worker(client, headers, mix, deadline, warmup) for _ in range(concurrency)))
+
+        result = Result(name, concurrency, duration)
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, headers, mix, deadline, result) for _ in range(concurrency)))
+        result.duration = time.perf_counter() - started
+        return result
+
+
+def parse_targets(values: List[str]) -> List[Tuple[str, str]]:
+    targets = []
+    for value in values:
+        name, sep, url = value.partition("=")
+        if not sep:
+            name, url = value, value
+        targets.append((name, url))
+    return targets
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", default=[], help="name=base_url (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per target")
+    parser.add_argument("--email", default=os.getenv("BENCH_EMAIL", "admin@example.com"))
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD", "Secret123!"))
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    targets = parse_targets(args.target) or [
+        ("sync", "http://localhost:8000"),
+        ("async", "http://localhost:8003"),
+    ]
+    summaries = []
+    for name, url in targets:
+        result = await run_target(
+            name,
+            url,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            email=args.email,
+            password=args.password,
+        )
+        summary = result.summary()
+        summaries.append(summary)
+        print(
+            f"[{name}] {summary['rps']} req/s  errors={summary['errors']}  "
+            f"p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms p99={summary['p99_ms']}ms"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
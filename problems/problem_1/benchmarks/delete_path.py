@@ -0,0 +1,123 @@
+"""
+Cost of deleting a project as its task count grows.
+
+For each size and each path below, seeds a project with that many tasks
+(server-side, with generate_series) and deletes it, against the configured
+database (DATABASE_URL):
+
+* `orm`: the old path. The project and its whole task collection are loaded
+  and the ORM deletes them one statement per task.
+* `set`: `crud.project.remove`. One DELETE for the tasks, then one
+  DELETE ... RETURNING for the project.
+
+It prints the wall time and the number of statements SQLAlchemy executed for
+each. The ORM's per-task DELETEs go out as one executemany, which counts once
+here but is still one round trip per task with psycopg2. With the set-based
+path the statement count is constant, and the time only grows with the work
+Postgres does to delete the rows.
+
+    cd problems/problem_1
+    python benchmarks/delete_path.py --sizes 1000 10000 50000
+
+The projects belong to a throwaway user, deleted afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.db.session import SessionLocal, get_engine  # noqa: E402
+from app.models import Project, User  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(get_engine(), "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(get_engine(), "before_cursor_execute", self._on_execute)
+
+
+def seed_project(db, owner_id: int, tasks: int) -> int:
+    project_id = db.execute(
+        text("INSERT INTO projects (title, owner_id) VALUES ('delete bench', :owner) RETURNING id"),
+        {"owner": owner_id},
+    ).scalar_one()
+    db.execute(
+        text(
+            "INSERT INTO tasks (title, status, project_id) "
+            "SELECT 'delete bench ' || g, 'ToDo', :project FROM generate_series(1, :n) g"
+        ),
+        {"project": project_id, "n": tasks},
+    )
+    db.commit()
+    return project_id
+
+
+def orm_delete(db, project_id: int) -> None:
+    project = db.query(Project).options(selectinload(Project.tasks)).get(project_id)
+    for task in project.tasks:
+        db.delete(task)
+    db.delete(project)
+    db.commit()
+
+
+def set_delete(db, project_id: int) -> None:
+    crud.project.remove(db, id=project_id)
+
+
+def measure(delete: Callable, db, owner_id: int, tasks: int, counter: StatementCounter) -> Dict[str, float]:
+    project_id = seed_project(db, owner_id, tasks)
+    db.expunge_all()
+    counter.count = 0
+    started = time.perf_counter()
+    delete(db, project_id)
+    elapsed = (time.perf_counter() - started) * 1000
+    return {"ms": round(elapsed, 1), "statements": counter.count}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    owner = User(email=f"delete-bench-{uuid.uuid4().hex}@example.com", hashed_password="!")
+    db.add(owner)
+    db.commit()
+    counter = StatementCounter()
+    results: Dict[str, List[Dict[str, float]]] = {"orm": [], "set": []}
+    try:
+        for size in args.sizes:
+            for name, delete in (("orm", orm_delete), ("set", set_delete)):
+                numbers = measure(delete, db, owner.id, size, counter)
+                results[name].append({"tasks": size, **numbers})
+                print(f"[{name}] {size} tasks: {numbers['ms']}ms, {numbers['statements']} statements")
+    finally:
+        counter.close()
+        db.rollback()
+        crud.user.remove(db, id=owner.id)
+        db.close()
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
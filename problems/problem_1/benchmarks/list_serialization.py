@@ -0,0 +1,126 @@
+"""
+CPU cost of serving a full list page with and without the row fast path.
+
+Serves `GET /users`, `/projects` and `/tasks` (limit=100) through the real
+sync routers, in process, against the configured database (DATABASE_URL),
+twice: once with FAST_LIST_SERIALIZATION on (response columns read as rows
+and encoded with orjson) and once with it off (ORM objects validated
+through the response_model and encoded with jsonable_encoder). Auth is
+replaced by a fixed superuser so only the endpoint itself is measured.
+For each mode it prints the mean process CPU time and wall time per request.
+
+    cd problems/problem_1
+    python benchmarks/list_serialization.py --iterations 500
+
+It adds 100 throwaway users, projects and tasks (deleted afterwards) so
+every page is full.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.api.v1.endpoints import projects, tasks, users  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.principal_cache import Principal  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models import Project, Task, User  # noqa: E402
+
+PAGE = 100
+PATHS = ("/users/", "/projects/", "/tasks/")
+
+
+def seed(db, tag: str) -> int:
+    users_ = [User(email=f"list-bench-{tag}-{i}@example.com", hashed_password="!", full_name=f"Bench {i}") for i in range(PAGE)]
+    db.add_all(users_)
+    db.flush()
+    projects_ = [Project(title=f"list bench {i}", owner_id=users_[0].id) for i in range(PAGE)]
+    db.add_all(projects_)
+    db.flush()
+    db.add_all(
+        Task(title=f"list bench {i}", project_id=projects_[i].id, assignee_id=users_[i].id)
+        for i in range(PAGE)
+    )
+    db.commit()
+    return users_[0].id
+
+
+def cleanup(db, tag: str) -> None:
+    owners = db.query(User.id).filter(User.email.like(f"list-bench-{tag}-%"))
+    project_ids = db.query(Project.id).filter(Project.owner_id.in_(owners))
+    db.query(Task).filter(Task.project_id.in_(project_ids)).delete(synchronize_session=False)
+    db.query(Project).filter(Project.owner_id.in_(owners)).delete(synchronize_session=False)
+    db.query(User).filter(User.email.like(f"list-bench-{tag}-%")).delete(synchronize_session=False)
+    db.commit()
+
+
+def build_client(user_id: int) -> TestClient:
+    app = FastAPI()
+    app.include_router(users.router, prefix="/users")
+    app.include_router(projects.router, prefix="/projects")
+    app.include_router(tasks.router, prefix="/tasks")
+    principal = Principal(id=user_id, is_active=True, is_superuser=True)
+    for dependency in (deps.get_current_active_user, deps.get_current_active_superuser):
+        app.dependency_overrides[dependency] = lambda: principal
+    return TestClient(app)
+
+
+def measure(client: TestClient, path: str, iterations: int) -> Dict[str, float]:
+    cpu: List[float] = []
+    wall: List[float] = []
+    for _ in range(iterations):
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        response = client.get(path, params={"limit": PAGE})
+        cpu.append((time.process_time() - cpu_started) * 1000)
+        wall.append((time.perf_counter() - wall_started) * 1000)
+        response.raise_for_status()
+    return {
+        "cpu_mean_ms": round(statistics.fmean(cpu), 3),
+        "wall_mean_ms": round(statistics.fmean(wall), 3),
+        "wall_p95_ms": round(sorted(wall)[int(len(wall) * 0.95) - 1], 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    try:
+        client = build_client(seed(db, tag))
+        for name, fast in (("response_model", False), ("rows", True)):
+            settings.FAST_LIST_SERIALIZATION = fast
+            for path in PATHS:
+                client.get(path, params={"limit": PAGE}).raise_for_status()  # warm up
+                numbers = measure(client, path, args.iterations)
+                results.setdefault(name, {})[path] = numbers
+                print(
+                    f"[{name}] GET {path}?limit={PAGE}: {numbers['cpu_mean_ms']}ms CPU, "
+                    f"{numbers['wall_mean_ms']}ms mean, {numbers['wall_p95_ms']}ms p95"
+                )
+    finally:
+        cleanup(db, tag)
+        db.close()
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Query plans for `GET /api/v1/tasks/search` on a large tasks table.
+
+Prints `EXPLAIN (ANALYZE, BUFFERS)` for representative searches, built with
+the same `crud.task.search_query` the endpoint uses, so you can check that
+they hit the indexes from migration 0007 rather than scanning `tasks`.
+
+    cd problems/problem_1
+    # optional: add 10M synthetic tasks (owned by a throwaway user), then ANALYZE
+    python benchmarks/search_plans.py --seed 10000000
+    python benchmarks/search_plans.py
+    python benchmarks/search_plans.py --cleanup
+
+Seeding runs server-side with generate_series and takes a few minutes for 10M rows.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models import Project, User  # noqa: E402
+from app.models.task import TaskStatus  # noqa: E402
+
+SEED_EMAIL = "search-bench@example.com"
+SEED_PROJECTS = 1000
+WORDS = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima"
+
+
+def seed(db, count: int) -> None:
+    owner = crud.user.get_by_email(db, email=SEED_EMAIL)
+    if owner is None:
+        owner = User(email=SEED_EMAIL, hashed_password="!", full_name="Search benchmark")
+        db.add(owner)
+        db.commit()
+    db.execute(
+        text(
+            "INSERT INTO projects (title, owner_id) "
+            "SELECT 'search bench ' || g, :owner FROM generate_series(1, :n) g"
+        ),
+        {"owner": owner.id, "n": SEED_PROJECTS},
+    )
+    # Statuses, due dates and assignees spread evenly; text from a small vocabulary
+    db.execute(
+        text(
+            """
+            INSERT INTO tasks (title, description, status, project_id, assignee_id, due_date)
+            SELECT
+                (string_to_array(:words, ' '))[1 + g % 12] || ' task ' || g,
+                'details for ' || (string_to_array(:words, ' '))[1 + (g / 12) % 12],
+                (ARRAY['ToDo', 'InProgress', 'Done'])[1 + g % 3],
+                p.first_id + g % :projects,
+                CASE WHEN g % 10 = 0 THEN :owner END,
+                now() + (g % 365) * interval '1 day'
+            FROM generate_series(1, :n) g,
+                 (SELECT min(id) AS first_id FROM projects WHERE owner_id = :owner) p
+            """
+        ),
+        {"words": WORDS, "projects": SEED_PROJECTS, "owner": owner.id, "n": count},
+    )
+    db.commit()
+    db.execute(text("ANALYZE tasks"))
+    db.commit()
+
+
+def cleanup(db) -> None:
+    owner = crud.user.get_by_email(db, email=SEED_EMAIL)
+    if owner is None:
+        return
+    project_ids = db.query(Project.id).filter(Project.owner_id == owner.id)
+    db.execute(text("DELETE FROM tasks WHERE project_id IN (SELECT id FROM projects WHERE owner_id = :o)"), {"o": owner.id})
+    project_ids.delete(synchronize_session=False)
+    db.delete(owner)
+    db.commit()
+
+
+def explain(db) -> None:
+    owner = crud.user.get_by_email(db, email=SEED_EMAIL)
+    owner_id = owner.id if owner is not None else 1
+    first_project = db.query(Project.id).filter(Project.owner_id == owner_id).order_by(Project.id).first()
+    project_id = first_project.id if first_project is not None else 1
+    now = datetime.now(timezone.utc)
+    cases = {
+        "project + status": dict(project_id=project_id, status=TaskStatus.IN_PROGRESS),
+        "assignee + status + due range": dict(
+            assignee_id=owner_id, status=TaskStatus.TODO, due_after=now, due_before=now + timedelta(days=30)
+        ),
+        "free text": dict(text="foxtrot"),
+        "free text, visible to a user": dict(text="golf details", visible_to=owner_id),
+    }
+    for name, filters in cases.items():
+        query = crud.task.search_query(db, limit=100, **filters)
+        sql = query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        print(f"--- {name}")
+        for (line,) in db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")):
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic tasks first")
+    parser.add_argument("--cleanup", action="store_true", help="delete the synthetic data and exit")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            return
+        if args.seed:
+            seed(db, args.seed)
+        explain(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Cost of a CRUD write with and without the refresh round trip.
+
+Runs the real CRUD methods against the configured database (DATABASE_URL)
+twice: once with DB_WRITE_RETURNING on (server defaults come back from the
+INSERT/UPDATE ... RETURNING) and once with it off (commit, then a refresh
+SELECT). For each mode it prints the mean latency and the number of SQL
+statements per create and per update.
+
+    cd problems/problem_1
+    python benchmarks/write_path.py --iterations 500
+
+The rows it writes belong to a throwaway user and are deleted afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal, get_engine  # noqa: E402
+from app.models import Project, User  # noqa: E402
+from app.schemas.project import ProjectCreate, ProjectUpdate  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(get_engine(), "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(get_engine(), "before_cursor_execute", self._on_execute)
+
+
+def measure(op: Callable[[int], None], iterations: int, counter: StatementCounter) -> Dict[str, float]:
+    timings: List[float] = []
+    counter.count = 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        op(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p95_ms": round(sorted(timings)[int(len(timings) * 0.95) - 1], 3),
+        "statements_per_op": round(counter.count / iterations, 2),
+    }
+
+
+def run_mode(returning: bool, iterations: int, owner_id: int, counter: StatementCounter) -> Dict[str, Dict[str, float]]:
+    settings.DB_WRITE_RETURNING = returning
+    db = SessionLocal()
+    try:
+        projects: List[Project] = []
+
+        def create(i: int) -> None:
+            projects.append(
+                crud.project.create_with_owner(
+                    db, obj_in=ProjectCreate(title=f"bench {i}"), owner_id=owner_id
+                )
+            )
+
+        def update(i: int) -> None:
+            crud.project.update(db, db_obj=projects[i], obj_in=ProjectUpdate(title=f"bench {i}*"))
+
+        return {
+            "create": measure(create, iterations, counter),
+            "update": measure(update, iterations, counter),
+        }
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    owner = User(email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password="!")
+    db.add(owner)
+    db.commit()
+    counter = StatementCounter()
+    results = {}
+    try:
+        for name, returning in (("refresh", False), ("returning", True)):
+            results[name] = run_mode(returning, args.iterations, owner.id, counter)
+            for op, numbers in results[name].items():
+                print(
+                    f"[{name}] {op}: {numbers['mean_ms']}ms mean, {numbers['p95_ms']}ms p95, "
+                    f"{numbers['statements_per_op']} statements/op"
+                )
+    finally:
+        counter.close()
+        db.query(Project).filter(Project.owner_id == owner.id).delete(synchronize_session=False)
+        db.delete(owner)
+        db.commit()
+        db.close()
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
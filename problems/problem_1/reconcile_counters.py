@@ -0,0 +1,23 @@
+"""
+Rebuild `project_task_counters` from the `tasks` and `tasks_archive` tables.
+
+The counters are kept in step by every task write; run this after changing
+tasks outside the API (manual SQL, restores) or if the stats look off:
+
+    python problems/problem_1/reconcile_counters.py
+"""
+from app.crud import task_counter
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        rows = task_counter.rebuild(db)
+    finally:
+        db.close()
+    print(f"Rebuilt project_task_counters: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Fixtures for the Problem 1 microbenchmarks.
+
+The app is served in process through httpx's ASGI transport (no server, no
+network), against the database configured by DATABASE_URL. A throwaway
+owner is seeded once per session with a generated dataset, sized by:
+
+* `P1_BENCH_PROJECTS` (default 50): projects owned by the benchmark user
+* `P1_BENCH_TASKS` (default 10000): tasks spread over those projects
+* `P1_BENCH_DELETE_TASKS` (default 100): tasks in each project the delete
+  benchmark removes
+
+Everything is deleted with the owner at the end of the session.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import text  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core.hashing import get_password_hash  # noqa: E402
+from app.crud import task_counter  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User  # noqa: E402
+
+API_PREFIX = "/api/v1"
+PASSWORD = "Bench123!"
+
+PROJECTS = int(os.getenv("P1_BENCH_PROJECTS", "50"))
+TASKS = int(os.getenv("P1_BENCH_TASKS", "10000"))
+DELETE_TASKS = int(os.getenv("P1_BENCH_DELETE_TASKS", "100"))
+
+
+def seed_project(db, owner_id: int, tasks: int, title: str = "bench") -> int:
+    """Insert a project owned by `owner_id` with `tasks` tasks (server-side); return its id."""
+    project_id = db.execute(
+        text("INSERT INTO projects (title, owner_id) VALUES (:title, :owner) RETURNING id"),
+        {"title": title, "owner": owner_id},
+    ).scalar_one()
+    db.execute(
+        text(
+            "INSERT INTO tasks (title, status, project_id, assignee_id, due_date) "
+            "SELECT 'bench task ' || g, (ARRAY['ToDo', 'InProgress', 'Done'])[1 + g % 3], "
+            ":project, :owner, now() + g * interval '1 hour' "
+            "FROM generate_series(1, :n) g"
+        ),
+        {"project": project_id, "owner": owner_id, "n": tasks},
+    )
+    return project_id
+
+
+@pytest.fixture(scope="session")
+def dataset() -> Iterator[Dict[str, Any]]:
+    db = SessionLocal()
+    owner = User(
+        email=f"bench-{uuid.uuid4().hex}@example.com",
+        hashed_password=get_password_hash(PASSWORD),
+        full_name="Benchmark Owner",
+    )
+    db.add(owner)
+    db.commit()
+    try:
+        project_ids: List[int] = [
+            seed_project(db, owner.id, TASKS // PROJECTS + (i < TASKS % PROJECTS), f"bench {i}")
+            for i in range(PROJECTS)
+        ]
+        db.commit()
+        task_counter.rebuild(db)
+        task_id = db.execute(
+            text("SELECT min(id) FROM tasks WHERE project_id = :project"), {"project": project_ids[0]}
+        ).scalar_one()
+        yield {
+            "db": db,
+            "owner_id": owner.id,
+            "email": owner.email,
+            "project_ids": project_ids,
+            "task_id": task_id,
+        }
+    finally:
+        db.rollback()
+        crud.user.remove(db, id=owner.id)
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def bench_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class InProcessClient:
+    """Blocking calls into the app through an ASGI transport, for `benchmark(...)`."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", follow_redirects=True
+        )
+
+    def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        response = self.loop.run_until_complete(self.client.request(method, url, **kwargs))
+        response.raise_for_status()
+        return response
+
+    def close(self) -> None:
+        self.loop.run_until_complete(self.client.aclose())
+
+
+@pytest.fixture(scope="session")
+def client(bench_loop: asyncio.AbstractEventLoop) -> Iterator[InProcessClient]:
+    c = InProcessClient(bench_loop)
+    yield c
+    c.close()
+
+
+@pytest.fixture(scope="session")
+def auth(client: InProcessClient, dataset: Dict[str, Any]) -> Dict[str, str]:
+    r = client.request(
+        "POST",
+        f"{API_PREFIX}/auth/login/access-token",
+        data={"username": dataset["email"], "password": PASSWORD},
+    )
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
@@ -0,0 +1,87 @@
+"""
+Problem 1 hot-path microbenchmarks (pytest-benchmark).
+
+Drives the app in process (see conftest.py) against a local Postgres. Save a
+run and compare later ones against it, failing on regressions:
+
+    pytest problems/problem_1/tests/benchmarks --benchmark-autosave
+    pytest problems/problem_1/tests/benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict
+
+import pytest
+
+from conftest import API_PREFIX, DELETE_TASKS, PASSWORD, PROJECTS, TASKS, InProcessClient, seed_project
+
+
+@pytest.fixture(autouse=True)
+def describe_dataset(benchmark: Any) -> None:
+    benchmark.extra_info.update(projects=PROJECTS, tasks=TASKS)
+
+
+@pytest.mark.benchmark(group="p1_auth")
+def test_login(benchmark: Any, client: InProcessClient, dataset: Dict[str, Any]) -> None:
+    form = {"username": dataset["email"], "password": PASSWORD}
+    r = benchmark(client.request, "POST", f"{API_PREFIX}/auth/login/access-token", data=form)
+    assert r.json()["token_type"] == "bearer"
+
+
+@pytest.mark.benchmark(group="p1_read")
+def test_list_tasks(benchmark: Any, client: InProcessClient, auth: Dict[str, str]) -> None:
+    r = benchmark(client.request, "GET", f"{API_PREFIX}/tasks/", params={"limit": 100}, headers=auth)
+    assert len(r.json()) == min(100, TASKS)
+
+
+@pytest.mark.benchmark(group="p1_read")
+def test_read_project_with_tasks(
+    benchmark: Any, client: InProcessClient, auth: Dict[str, str], dataset: Dict[str, Any]
+) -> None:
+    url = f"{API_PREFIX}/projects/{dataset['project_ids'][0]}"
+    r = benchmark(client.request, "GET", url, headers=auth)
+    assert r.json()["tasks"]
+
+
+@pytest.mark.benchmark(group="p1_write")
+def test_create_task(
+    benchmark: Any, client: InProcessClient, auth: Dict[str, str], dataset: Dict[str, Any]
+) -> None:
+    body = {"title": "bench created", "project_id": dataset["project_ids"][-1]}
+    r = benchmark(client.request, "POST", f"{API_PREFIX}/tasks/", json=body, headers=auth)
+    assert r.json()["title"] == "bench created"
+
+
+@pytest.mark.benchmark(group="p1_write")
+def test_update_task_status(
+    benchmark: Any, client: InProcessClient, auth: Dict[str, str], dataset: Dict[str, Any]
+) -> None:
+    # Every round is a real transition, so the counters are updated each time
+    statuses = itertools.cycle(["InProgress", "Done", "ToDo"])
+    url = f"{API_PREFIX}/tasks/{dataset['task_id']}/status"
+
+    def update() -> Any:
+        return client.request("POST", f"{url}/{next(statuses)}", headers=auth)
+
+    r = benchmark(update)
+    assert r.json()["id"] == dataset["task_id"]
+
+
+@pytest.mark.benchmark(group="p1_write")
+def test_delete_project(
+    benchmark: Any, client: InProcessClient, auth: Dict[str, str], dataset: Dict[str, Any]
+) -> None:
+    db = dataset["db"]
+    benchmark.extra_info["tasks_per_project"] = DELETE_TASKS
+
+    def setup() -> Any:
+        project_id = seed_project(db, dataset["owner_id"], DELETE_TASKS, "bench delete")
+        db.commit()
+        return (f"{API_PREFIX}/projects/{project_id}",), {}
+
+    def delete(url: str) -> Any:
+        return client.request("DELETE", url, headers=auth)
+
+    r = benchmark.pedantic(delete, setup=setup, rounds=20)
+    assert r.json()["title"] == "bench delete"
@@ -9,10 +9,15 @@ Run independently:
 """
 from __future__ import annotations
 
+import csv
+import io
+import json
 import os
+import subprocess
+import sys
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import httpx
 import psycopg2
@@ -70,6 +75,22 @@ def ensure_user(email: str, password: str, *, full_name: str = "Test User", supe
             return int(row[0])
 
 
+def run_archive_job() -> None:
+    """Run `archive_tasks.py` once against the test database."""
+    load_dotenv(dotenv_path=Path(".env"))
+    user = os.getenv("POSTGRES_USER", "postgres")
+    password = os.getenv("POSTGRES_PASSWORD", "postgres")
+    db = os.getenv("POSTGRES_DB", "app")
+    host = os.getenv("POSTGRES_HOST") or os.getenv("POSTGRES_SERVER", "localhost") or "localhost"
+    port = int(os.getenv("POSTGRES_PORT", "5432"))
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"postgresql://{user}:{password}@{host}:{port}/{db}",
+        "PYTHONPATH": "problems/problem_1",
+    }
+    subprocess.run([sys.executable, "problems/problem_1/archive_tasks.py"], env=env, check=True)
+
+
 def cleanup_invalid_users() -> None:
     """Remove any previously created invalid emails that break EmailStr validation."""
     dsn = _host_db_dsn()
@@ -129,6 +150,13 @@ def test_signup_and_login_flow() -> None:
     r = client.get(f"{API_PREFIX}/users/me", headers=auth_headers(token))
     r.raise_for_status(); me = r.json(); assert me["email"] == email; log("PASS users: me for signed up user (P1)")
 
+    # A token that decoded fine (and is now cached) must not vouch for a tampered copy
+    tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+    for _ in range(2):
+        r = client.get(f"{API_PREFIX}/users/me", headers=auth_headers(tampered))
+        assert r.status_code == 403
+    log("PASS auth: tampered token rejected (P1)")
+
     client.close()
 
 
@@ -205,6 +233,515 @@ def test_problem_1_flow() -> None:
     client.close()
 
 
+def test_cursor_pagination() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=30.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Paging", "description": "Cursor"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+
+    created = []
+    for i in range(5):
+        payload = {"title": f"Paged task {i}", "project_id": proj_id}
+        r = client.post(f"{API_PREFIX}/tasks/", headers=auth_headers(token), json=payload)
+        r.raise_for_status(); created.append(r.json()["id"])
+
+    # Walk every page by cursor; ids must be strictly increasing and complete
+    seen = []
+    cursor: Optional[str] = None
+    while True:
+        params = {"limit": 50}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(f"{API_PREFIX}/tasks/", headers=auth_headers(token), params=params)
+        r.raise_for_status(); seen.extend(t["id"] for t in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == sorted(set(seen)); assert set(created) <= set(seen); log("PASS tasks: cursor pagination")
+
+    r = client.get(f"{API_PREFIX}/tasks/", headers=auth_headers(token), params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400; log("PASS tasks: invalid cursor rejected")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_task_mutation_responses() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=30.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    admin_id = ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Mutations", "description": "Returning"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    r = client.post(f"{API_PREFIX}/tasks/", headers=auth_headers(token), json={"title": "Flip me", "project_id": proj_id})
+    r.raise_for_status(); task_id = r.json()["id"]
+
+    # Status and assignee changes return the updated row without a refetch
+    r = client.post(f"{API_PREFIX}/tasks/{task_id}/status/Done", headers=auth_headers(token))
+    r.raise_for_status(); body = r.json(); assert body["status"] == "Done"; assert body["updated_at"]; log("PASS tasks: status returning")
+
+    r = client.post(f"{API_PREFIX}/tasks/{task_id}/assign/{admin_id}", headers=auth_headers(token))
+    r.raise_for_status(); body = r.json(); assert body["assignee_id"] == admin_id; assert body["assignee"]["id"] == admin_id; log("PASS tasks: assign returning")
+
+    r = client.post(f"{API_PREFIX}/tasks/{task_id}/assign/999999999", headers=auth_headers(token))
+    assert r.status_code == 404; log("PASS tasks: assign unknown user rejected")
+
+    r = client.get(f"{API_PREFIX}/tasks/999999999", headers=auth_headers(token))
+    assert r.status_code == 404; log("PASS tasks: unknown task rejected")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_bulk_user_create() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    stamp = int(time.time())
+    users = [{"email": f"p1bulk_{stamp}_{i}@example.com", "password": "Secret123!", "full_name": f"Bulk {i}"} for i in range(4)]
+    r = client.post(f"{API_PREFIX}/users/bulk", headers=auth_headers(token), json=users)
+    r.raise_for_status(); created = r.json(); assert [u["email"] for u in created] == [u["email"] for u in users]; log("PASS users: bulk create")
+
+    # Bulk-created users can log in with their (pool-hashed) passwords
+    get_token(client, users[0]["email"], "Secret123!"); log("PASS users: bulk user login")
+
+    r = client.post(f"{API_PREFIX}/users/bulk", headers=auth_headers(token), json=users[:1])
+    assert r.status_code == 400; log("PASS users: bulk create rejects existing email")
+
+    client.close()
+
+
+def test_bulk_tasks() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Bulk", "description": "Import"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+
+    tasks = [{"title": f"Bulk task {i}", "project_id": proj_id} for i in range(5)]
+    tasks.append({"title": "Orphan task", "project_id": 999999999})
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=auth_headers(token), json={"tasks": tasks})
+    r.raise_for_status(); body = r.json()
+    assert [t["title"] for t in body["created"]] == [t["title"] for t in tasks[:5]]
+    assert [e["index"] for e in body["errors"]] == [5]; log("PASS tasks: bulk create with per-item errors")
+    ids = [t["id"] for t in body["created"]]
+
+    r = client.post(f"{API_PREFIX}/tasks/bulk-status", headers=auth_headers(token), json={"status": "InProgress", "task_ids": ids[:2] + [999999999]})
+    r.raise_for_status(); body = r.json()
+    assert sorted(body["updated"]) == sorted(ids[:2]); assert [e["id"] for e in body["errors"]] == [999999999]; log("PASS tasks: bulk status by ids")
+
+    r = client.post(f"{API_PREFIX}/tasks/bulk-status", headers=auth_headers(token), json={"status": "Done", "project_id": proj_id, "from_status": "ToDo"})
+    r.raise_for_status(); assert sorted(r.json()["updated"]) == sorted(ids[2:]); log("PASS tasks: bulk status by project filter")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_task_search() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Search", "description": "Filters"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    tasks = [
+        {"title": "Quarterly zeppelin report", "project_id": proj_id, "status": "InProgress", "due_date": "2030-01-10T00:00:00+00:00"},
+        {"title": "Unrelated chore", "description": "zeppelin maintenance", "project_id": proj_id, "due_date": "2030-03-01T00:00:00+00:00"},
+        {"title": "Another chore", "project_id": proj_id},
+    ]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=auth_headers(token), json={"tasks": tasks})
+    r.raise_for_status(); ids = [t["id"] for t in r.json()["created"]]
+
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=auth_headers(token), params={"project_id": proj_id, "q": "zeppelin"})
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[:2]; log("PASS tasks: search by text over title and description")
+
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=auth_headers(token), params={"project_id": proj_id, "status": "InProgress"})
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[:1]; log("PASS tasks: search by project and status")
+
+    params = {"project_id": proj_id, "due_after": "2030-02-01T00:00:00+00:00", "due_before": "2030-04-01T00:00:00+00:00"}
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=auth_headers(token), params=params)
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[1:2]; log("PASS tasks: search by due date range")
+
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=auth_headers(token), params={"due_after": "2030-04-01T00:00:00", "due_before": "2030-02-01T00:00:00"})
+    assert r.status_code == 400; log("PASS tasks: search rejects an empty due date range")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_project_stats() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    project_ids = []
+    for title in ("Stats A", "Stats B"):
+        r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": title})
+        r.raise_for_status(); project_ids.append(r.json()["id"])
+    proj_id = project_ids[0]
+
+    tasks = [
+        {"title": "Late", "project_id": proj_id, "due_date": "2000-01-01T00:00:00+00:00"},
+        {"title": "Late but done", "project_id": proj_id, "status": "Done", "due_date": "2000-01-01T00:00:00+00:00"},
+        {"title": "No due date", "project_id": proj_id},
+    ]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=auth_headers(token), json={"tasks": tasks})
+    r.raise_for_status(); ids = [t["id"] for t in r.json()["created"]]
+    r = client.post(f"{API_PREFIX}/tasks/", headers=auth_headers(token), json={"title": "Single", "project_id": proj_id})
+    r.raise_for_status(); ids.append(r.json()["id"])
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/stats", headers=auth_headers(token))
+    r.raise_for_status(); stats = r.json()
+    assert stats["total"] == 4 and stats["overdue"] == 1
+    assert stats["by_status"] == {"ToDo": 3, "InProgress": 0, "Done": 1}; log("PASS projects: stats after create")
+
+    r = client.post(f"{API_PREFIX}/tasks/{ids[0]}/status/Done", headers=auth_headers(token)); r.raise_for_status()
+    r = client.put(f"{API_PREFIX}/tasks/{ids[2]}", headers=auth_headers(token), json={"status": "InProgress"}); r.raise_for_status()
+    r = client.post(f"{API_PREFIX}/tasks/bulk-status", headers=auth_headers(token), json={"status": "InProgress", "task_ids": [ids[3]]}); r.raise_for_status()
+    r = client.delete(f"{API_PREFIX}/tasks/{ids[1]}", headers=auth_headers(token)); r.raise_for_status()
+
+    r = client.get(f"{API_PREFIX}/projects/stats", headers=auth_headers(token), params={"ids": project_ids + [999999999]})
+    r.raise_for_status(); body = r.json()
+    assert [s["project_id"] for s in body] == project_ids
+    assert body[0]["by_status"] == {"ToDo": 0, "InProgress": 2, "Done": 1} and body[0]["overdue"] == 0
+    assert body[1]["total"] == 0; log("PASS projects: batch stats follow status changes and deletes")
+
+    for pid in project_ids:
+        r = client.delete(f"{API_PREFIX}/projects/{pid}", headers=auth_headers(token))
+        r.raise_for_status()
+
+    client.close()
+
+
+def test_conditional_get() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+    headers = auth_headers(token)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=headers, json={"title": "ETag"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    r = client.post(f"{API_PREFIX}/tasks/", headers=headers, json={"title": "Cached", "project_id": proj_id})
+    r.raise_for_status(); task_id = r.json()["id"]
+
+    for path in (f"/projects/{proj_id}", f"/tasks/{task_id}", "/users/me", "/projects/"):
+        r = client.get(f"{API_PREFIX}{path}", headers=headers)
+        r.raise_for_status(); etag = r.headers["ETag"]; assert etag.startswith('W/"')
+        r = client.get(f"{API_PREFIX}{path}", headers={**headers, "If-None-Match": etag})
+        assert r.status_code == 304 and r.content == b"" and r.headers["ETag"] == etag
+    log("PASS etag: 304 for unchanged project, task, user and list")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}", headers=headers); etag = r.headers["ETag"]
+    r = client.post(f"{API_PREFIX}/tasks/{task_id}/status/Done", headers=headers); r.raise_for_status()
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag; log("PASS etag: project ETag changes when a task changes")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=headers)
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_project_export() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    user2_email = "user2@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    ensure_user(user2_email, password, full_name="User Two", superuser=False)
+    token = get_token(client, admin_email, password)
+    token2 = get_token(client, user2_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Export"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    tasks = [{"title": f"Export {i}", "project_id": proj_id} for i in range(5)]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=auth_headers(token), json={"tasks": tasks})
+    r.raise_for_status(); ids = sorted(t["id"] for t in r.json()["created"])
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/tasks/export", headers=auth_headers(token))
+    r.raise_for_status(); assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(t["id"] for t in lines) == ids and all(t["project_id"] == proj_id for t in lines)
+    log("PASS projects: NDJSON export streams every task")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/tasks/export", headers=auth_headers(token), params={"format": "csv"})
+    r.raise_for_status(); rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert sorted(int(row["id"]) for row in rows) == ids; log("PASS projects: CSV export")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/tasks/export", headers=auth_headers(token2))
+    assert r.status_code == 400; log("PASS projects: export is limited to the owner")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_project_board() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+    headers = auth_headers(token)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=headers, json={"title": "Board"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    tasks = [{"title": f"Due {i}", "project_id": proj_id, "due_date": f"2030-01-0{5 - i}T00:00:00+00:00"} for i in range(3)]
+    tasks += [{"title": "Undated", "project_id": proj_id}, {"title": "Shipped", "project_id": proj_id, "status": "Done"}]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=headers, json={"tasks": tasks})
+    r.raise_for_status()
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/board", headers=headers, params={"per_column": 2})
+    r.raise_for_status(); columns = {c["status"]: c for c in r.json()["columns"]}
+    assert {s: c["total"] for s, c in columns.items()} == {"ToDo": 4, "InProgress": 0, "Done": 1}
+    todo = columns["ToDo"]
+    assert [t["title"] for t in todo["tasks"]] == ["Due 2", "Due 1"] and todo["next_cursor"]
+    assert columns["Done"]["next_cursor"] is None; log("PASS projects: board columns with totals, first tasks by due date")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/board", headers=headers, params={"per_column": 2, "cursor": todo["next_cursor"]})
+    r.raise_for_status(); columns = r.json()["columns"]
+    assert [c["status"] for c in columns] == ["ToDo"] and columns[0]["total"] == 4
+    assert [t["title"] for t in columns[0]["tasks"]] == ["Due 0", "Undated"] and columns[0]["next_cursor"] is None
+    log("PASS projects: board column loads more by cursor, undated tasks last")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/board", headers=headers, params={"cursor": "garbage"})
+    assert r.status_code == 400; log("PASS projects: board rejects a bad cursor")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=headers)
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_task_archive() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+    headers = auth_headers(token)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=headers, json={"title": "Archive"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    tasks = [
+        {"title": "Done long ago", "project_id": proj_id, "status": "Done"},
+        {"title": "Done just now", "project_id": proj_id, "status": "Done"},
+        {"title": "Still open", "project_id": proj_id},
+    ]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=headers, json={"tasks": tasks})
+    r.raise_for_status(); ids = [t["id"] for t in r.json()["created"]]
+    with psycopg2.connect(_host_db_dsn()) as conn:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("UPDATE tasks SET created_at = now() - interval '10 years' WHERE id = %s", (ids[0],))
+    run_archive_job()
+
+    r = client.get(f"{API_PREFIX}/tasks/{ids[0]}", headers=headers)
+    assert r.status_code == 404
+    r = client.get(f"{API_PREFIX}/tasks/{ids[0]}", headers=headers, params={"include_archived": True})
+    r.raise_for_status(); assert r.json()["title"] == "Done long ago" and r.json()["project"]["id"] == proj_id
+    log("PASS tasks: old Done task archived, readable only with include_archived")
+
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=headers, params={"project_id": proj_id})
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[1:]
+    r = client.get(f"{API_PREFIX}/tasks/search", headers=headers, params={"project_id": proj_id, "include_archived": True, "limit": 2})
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[:2]
+    r = client.get(
+        f"{API_PREFIX}/tasks/search", headers=headers,
+        params={"project_id": proj_id, "include_archived": True, "limit": 2, "cursor": r.headers["X-Next-Cursor"]},
+    )
+    r.raise_for_status(); assert [t["id"] for t in r.json()] == ids[2:]
+    log("PASS tasks: search pages across tasks and archive with include_archived")
+
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/tasks/export", headers=headers, params={"include_archived": True})
+    r.raise_for_status(); assert sorted(json.loads(line)["id"] for line in r.text.splitlines()) == ids
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}/stats", headers=headers)
+    r.raise_for_status(); assert r.json()["by_status"] == {"ToDo": 1, "InProgress": 0, "Done": 2}
+    r = client.put(f"{API_PREFIX}/tasks/{ids[0]}", headers=headers, json={"title": "Revived"})
+    assert r.status_code == 404; log("PASS tasks: archived tasks exported and counted, not writable")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=headers)
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_my_tasks() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    user2_email = "user2@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    user2_id = ensure_user(user2_email, password, full_name="User Two", superuser=False)
+    token = get_token(client, admin_email, password)
+    token2 = get_token(client, user2_email, password)
+
+    # user2 owns one project (one of its tasks also assigned to them) and is
+    # assigned a Done task in the admin's project
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token2), json={"title": "Mine"})
+    r.raise_for_status(); own_id = r.json()["id"]
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Theirs"})
+    r.raise_for_status(); other_id = r.json()["id"]
+    tasks = [
+        {"title": "Mine 1", "project_id": own_id},
+        {"title": "Mine 2", "project_id": own_id, "assignee_id": user2_id},
+    ]
+    r = client.post(f"{API_PREFIX}/tasks/bulk", headers=auth_headers(token2), json={"tasks": tasks})
+    r.raise_for_status(); ids = [t["id"] for t in r.json()["created"]]
+    r = client.post(
+        f"{API_PREFIX}/tasks/", headers=auth_headers(token),
+        json={"title": "Theirs 1", "project_id": other_id, "assignee_id": user2_id, "status": "Done"},
+    )
+    r.raise_for_status(); ids = sorted(ids + [r.json()["id"]])
+
+    r = client.get(f"{API_PREFIX}/tasks/mine", headers=auth_headers(token2))
+    r.raise_for_status(); got = [t["id"] for t in r.json()]
+    assert [i for i in got if i in ids] == ids and len(got) == len(set(got))
+    log("PASS tasks: /tasks/mine unions assigned and owned-project tasks without duplicates")
+
+    r = client.get(f"{API_PREFIX}/tasks/mine", headers=auth_headers(token2), params={"status": "Done"})
+    r.raise_for_status(); assert ids[-1] in [t["id"] for t in r.json()]
+    assert all(t["status"] == "Done" for t in r.json()); log("PASS tasks: /tasks/mine status filter")
+
+    seen: List[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        r = client.get(f"{API_PREFIX}/tasks/mine", headers=auth_headers(token2), params=params)
+        r.raise_for_status(); seen += [t["id"] for t in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == got; log("PASS tasks: /tasks/mine cursor pages")
+
+    for proj_id, tok in ((own_id, token2), (other_id, token)):
+        r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(tok))
+        r.raise_for_status()
+
+    client.close()
+
+
+def test_query_cache() -> None:
+    # The owner's project list is cached; every write to it must show on the next read
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    user2_email = "user2@example.com"
+    password = "Secret123!"
+    ensure_user(user2_email, password, full_name="User Two", superuser=False)
+    headers = auth_headers(get_token(client, user2_email, password))
+
+    def titles() -> Dict[int, str]:
+        r = client.get(f"{API_PREFIX}/projects/", headers=headers, params={"limit": 1000})
+        r.raise_for_status()
+        return {p["id"]: p["title"] for p in r.json()}
+
+    titles()
+    r = client.post(f"{API_PREFIX}/projects/", headers=headers, json={"title": "Cached"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    assert titles()[proj_id] == "Cached"
+    assert titles()[proj_id] == "Cached"
+    r = client.put(f"{API_PREFIX}/projects/{proj_id}", headers=headers, json={"title": "Recached"})
+    r.raise_for_status()
+    assert titles()[proj_id] == "Recached"
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=headers)
+    r.raise_for_status()
+    assert proj_id not in titles()
+    log("PASS query cache: project list invalidated by create, update and delete")
+
+    r = client.get("/metrics")
+    r.raise_for_status()
+    assert 'query_cache_lookups_total{name="projects.get_multi_by_owner"' in r.text
+    log("PASS query cache: lookups counted")
+
+    client.close()
+
+
+def test_read_your_writes() -> None:
+    # With DATABASE_REPLICA_URLS set, reads right after a write must still see it
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.post(f"{API_PREFIX}/projects/", headers=auth_headers(token), json={"title": "Fresh"})
+    r.raise_for_status(); proj_id = r.json()["id"]
+    if "X-Primary-Pin" in r.headers:
+        assert client.cookies.get("db_primary_pin") == r.headers["X-Primary-Pin"]
+        log("PASS read routing: writes pin the client to the primary")
+    r = client.put(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token), json={"title": "Fresher"})
+    r.raise_for_status()
+    r = client.get(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status(); assert r.json()["title"] == "Fresher"
+    r = client.get(f"{API_PREFIX}/projects/", headers=auth_headers(token), params={"limit": 1000})
+    r.raise_for_status(); assert proj_id in [p["id"] for p in r.json()]
+    log("PASS read routing: a write is visible to the next reads")
+
+    r = client.delete(f"{API_PREFIX}/projects/{proj_id}", headers=auth_headers(token))
+    r.raise_for_status()
+
+    client.close()
+
+
+def test_query_stats_metrics() -> None:
+    client = httpx.Client(base_url=BASE_URL, timeout=60.0, follow_redirects=True)
+
+    admin_email = "admin@example.com"
+    password = "Secret123!"
+    ensure_user(admin_email, password, full_name="Admin Test", superuser=True)
+    token = get_token(client, admin_email, password)
+
+    r = client.get(f"{API_PREFIX}/projects/", headers=auth_headers(token))
+    r.raise_for_status()
+    r = client.get("/metrics")
+    r.raise_for_status()
+    route = f'method="GET",route="{API_PREFIX}/projects/"'
+    assert f"db_queries_per_request_count{{{route}}}" in r.text
+    assert f"db_time_per_request_seconds_count{{{route}}}" in r.text
+    log("PASS metrics: SQL statements and DB time recorded per route")
+
+    client.close()
+
+
 def test_summary() -> None:
     """Parse the log file and print a brief summary to console."""
     if not LOG_FILE.exists():
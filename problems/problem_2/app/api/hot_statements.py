@@ -0,0 +1,28 @@
+"""The statements behind Problem 2's hot endpoints, for the startup warmup.
+
+Same CRUD calls as login, authentication and the product/order reads, with
+values that match no rows (`limit=0` compiles to the same statement as any
+other limit), so the engine caches them before the first request (see
+Problem 1's `app.core.warmup`).
+"""
+from sqlalchemy.orm import Session
+
+# Reuse Problem 1 components, as the endpoints do
+from app.core.principal_cache import load_principal
+from app.crud import user as crud_user
+
+from problems.problem_2.app.crud import order as order_crud
+from problems.problem_2.app.crud import product as product_crud
+
+# Ids start at 1
+NO_ID = 0
+
+
+def run(db: Session) -> None:
+    crud_user.get_by_email(db, email="warmup@example.invalid")
+    load_principal(db, NO_ID)
+    product_crud.list_products(db, limit=0)
+    product_crud.get(db, NO_ID)
+    product_crud.get_by_sku(db, "")
+    order_crud.list_orders(db, limit=0)
+    order_crud.get(db, NO_ID)
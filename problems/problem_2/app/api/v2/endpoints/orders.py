@@ -2,7 +2,7 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.db.session import get_db
 
 from problems.problem_2.app import schemas
@@ -17,7 +17,7 @@ router = APIRouter()
 def create_order(
     payload: schemas.OrderCreate,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
 ) -> Any:
     order = crud.create_order(db, user_id=current_user.id, items=[i.dict() for i in payload.items])
     # publish reserve event
@@ -26,12 +26,12 @@ def create_order(
 
 
 @router.get("/orders", response_model=List[schemas.Order])
-def list_orders(db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def list_orders(db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     return crud.list_orders(db)
 
 
 @router.get("/orders/{order_id}", response_model=schemas.Order)
-def get_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def get_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     order = crud.get(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -39,7 +39,7 @@ def get_order(order_id: int, db: Session = Depends(get_db), current_user=Depends
 
 
 @router.post("/orders/{order_id}/pay", response_model=schemas.Order)
-def pay_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def pay_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     order = crud.get(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -49,7 +49,7 @@ def pay_order(order_id: int, db: Session = Depends(get_db), current_user=Depends
 
 
 @router.post("/orders/{order_id}/cancel", response_model=schemas.Order)
-def cancel_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def cancel_order(order_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     order = crud.get(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
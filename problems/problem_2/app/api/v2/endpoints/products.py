@@ -2,7 +2,7 @@ from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.db.session import get_db
 
 from problems.problem_2.app import schemas
@@ -15,7 +15,7 @@ router = APIRouter()
 def create_product(
     payload: schemas.ProductCreate,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
 ) -> Any:
     if product_crud.get_by_sku(db, payload.sku):
         raise HTTPException(status_code=400, detail="SKU already exists")
@@ -43,7 +43,7 @@ def get_product(product_id: int, db: Session = Depends(get_db)) -> Any:
 
 
 @router.patch("/products/{product_id}", response_model=schemas.Product)
-def update_product(product_id: int, payload: schemas.ProductUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def update_product(product_id: int, payload: schemas.ProductUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     prod = product_crud.get(db, product_id)
     if not prod:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -51,7 +51,7 @@ def update_product(product_id: int, payload: schemas.ProductUpdate, db: Session
 
 
 @router.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
-def delete_product(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Response:
+def delete_product(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Response:
     prod = product_crud.get(db, product_id)
     if not prod:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -60,7 +60,7 @@ def delete_product(product_id: int, db: Session = Depends(get_db), current_user=
 
 
 @router.patch("/products/{product_id}/stock", response_model=schemas.Product)
-def adjust_stock(product_id: int, delta: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> Any:
+def adjust_stock(product_id: int, delta: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)) -> Any:
     prod = product_crud.get(db, product_id)
     if not prod:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
+from problems.problem_1.app.db.session import commit_write
+
 from problems.problem_2.app.models.order import Order, OrderItem, OrderStatus
 from problems.problem_2.app.models.product import Product
 
@@ -32,14 +34,12 @@ def create_order(db: Session, user_id: int, items: List[dict]) -> Order:
         db.add(OrderItem(order_id=order.id, product_id=product.id, quantity=qty, unit_price_cents=product.price_cents))
 
     order.total_cents = total
-    db.commit()
-    db.refresh(order)
+    commit_write(db, order)
     return order
 
 
 def set_status(db: Session, order: Order, status: OrderStatus) -> Order:
     order.status = status
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    commit_write(db, order)
     return order
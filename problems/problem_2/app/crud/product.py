@@ -1,6 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
+from problems.problem_1.app.db.session import commit_write
+
 from problems.problem_2.app.models.product import Product
 from problems.problem_2.app.models.order import OrderItem
 
@@ -20,8 +22,7 @@ def list_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]
 def create(db: Session, sku: str, name: str, price_cents: int, stock: int = 0, description: Optional[str] = None) -> Product:
     obj = Product(sku=sku, name=name, price_cents=price_cents, stock=stock, description=description)
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    commit_write(db, obj)
     return obj
 
 
@@ -30,8 +31,7 @@ def update(db: Session, product: Product, **fields) -> Product:
         if v is not None:
             setattr(product, k, v)
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    commit_write(db, product)
     return product
 
 
@@ -47,6 +47,5 @@ def adjust_stock(db: Session, product: Product, delta: int) -> Product:
     if product.stock < 0:
         raise ValueError("Stock cannot be negative")
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    commit_write(db, product)
     return product
@@ -1,6 +1,6 @@
 import enum
 from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 
 from problems.problem_1.app.core.database import Base
@@ -17,13 +17,16 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    # Server defaults come back from the INSERT/UPDATE (RETURNING), not a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.PENDING)
     total_cents = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # default=null() puts NULL in the INSERT so eager_defaults need not SELECT it back
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 
 # Reuse Base from Problem 1
@@ -8,6 +8,8 @@ from problems.problem_1.app.core.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    # Server defaults come back from the INSERT/UPDATE (RETURNING), not a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     sku = Column(String, unique=True, index=True, nullable=False)
@@ -16,6 +18,7 @@ class Product(Base):
     price_cents = Column(Integer, nullable=False)
     stock = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # default=null() puts NULL in the INSERT so eager_defaults need not SELECT it back
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # reverse relationship: defined in OrderItem via product_id
@@ -1,33 +1,24 @@
 """Async database setup for Problem 3.
 
-Provides an AsyncEngine, AsyncSession factory, and dependency helpers.
+Provides the AsyncSession factory and dependency helpers; the engine is
+the process-wide one from Problem 1's `db.session`.
 """
 from __future__ import annotations
 
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .config import settings
 from problems.problem_1.app.core.database import Base
+# One asyncpg pool per process, sized by Problem 1's DB_POOL_* settings
+from problems.problem_1.app.db.session import AsyncSessionLocal, get_async_engine
 
-# Create AsyncEngine with sensible pool settings
-engine = create_async_engine(
-    settings.ASYNC_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True,
-    echo=False,
-    future=True,
-)
-
-# Async session factory
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    class_=AsyncSession,
-)
+
+def __getattr__(name: str):
+    # `engine` is created on first use by the shared factory
+    if name == "engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+# Imported first so the startup timings cover every other import
+from problems.problem_1.app.core import startup  # isort: skip
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from problems.problem_1.app.core import warmup
+from problems.problem_1.app.core.principal_cache import principal_cache
+from problems.problem_1.app.db.query_stats import QueryStatsMiddleware
+
 from .core.config import settings
 from .routes.analytics import router as analytics_router
 from .routes.auth import router as auth_router
+from .services import cache, hot_statements
+
+startup.mark("imports")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    with startup.phase("lifespan"):
+        # Auth reads users through the sync stack, analytics the async one
+        await warmup.warm_up(
+            app,
+            sync_statements=hot_statements.run,
+            async_statements=hot_statements.run_async,
+            redis_pings=[principal_cache.ping, cache.ping],
+        )
+    startup.report("problem_3")
+    yield
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     docs_url="/docs",
     redoc_url=None,
+    lifespan=lifespan,
 )
 
 # CORS from Problem 1 settings
@@ -25,14 +55,23 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# SQL statements and DB time per request, slow-query log
+app.add_middleware(QueryStatsMiddleware)
+
 # Routers
 app.include_router(analytics_router, prefix="/api/p3")
 app.include_router(auth_router, prefix="/api/p3")
 
 
+# 503 until the lifespan warmup is done
 @app.get("/health", tags=["health"])
-async def health_check():
-    return {"status": "ok", "service": "problem_3", "version": settings.APP_VERSION}
+async def health_check(request: Request):
+    body = {"status": "ok", "service": "problem_3", "version": settings.APP_VERSION}
+    if not warmup.is_ready(request.app):
+        return JSONResponse({**body, "status": "warming_up"}, status_code=503)
+    return body
 
 # Metrics
 Instrumentator().instrument(app).expose(app)
+
+startup.mark("app")
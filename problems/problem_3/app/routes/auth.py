@@ -4,13 +4,15 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from pydantic import BaseModel, ValidationError
-from passlib.context import CryptContext
+from pydantic import BaseModel
 
 # Use Problem 1 settings and User model explicitly without importing modules that rely on top-level 'app'
 from problems.problem_1.app.core.config import settings as p1_settings
 from problems.problem_1.app.core.database import get_db
+from problems.problem_1.app.core.hashing import get_password_hash, verify_password
+from problems.problem_1.app.core.principal_cache import Principal, get_principal
+from problems.problem_1.app.core.token_cache import InvalidToken, token_cache
+from problems.problem_1.app.db.session import commit_write
 from problems.problem_1.app.models.user import User as P1User
 
 router = APIRouter(prefix="/auth", tags=["auth"]) 
@@ -23,10 +25,6 @@ class Token(BaseModel):
     token_type: str
 
 
-class TokenPayload(BaseModel):
-    sub: Optional[int] = None
-
-
 class UserOut(BaseModel):
     id: int
     email: str
@@ -40,19 +38,11 @@ class UserOut(BaseModel):
         orm_mode = True
 
 
-# Local security helpers (avoid importing P1 security which depends on 'app')
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-
+# Local token helper (avoid importing P1 security which depends on 'app');
+# bcrypt goes through the shared hashing pool above.
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt  # loaded on first login, not at startup
+
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=p1_settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode = {"exp": expire, "sub": str(subject)}
     return jwt.encode(to_encode, p1_settings.SECRET_KEY, algorithm=p1_settings.ALGORITHM)
@@ -73,19 +63,28 @@ def login_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-def _get_current_user(
+def _get_current_principal(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> Any:
+) -> Principal:
+    """Authenticate via the shared principal cache; the users row is read only on a miss."""
     try:
-        payload = jwt.decode(token, p1_settings.SECRET_KEY, algorithms=[p1_settings.ALGORITHM])
-        token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
+        token_data = token_cache.decode(token)
+    except InvalidToken:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
-    user_obj = db.query(P1User).filter(P1User.id == token_data.sub).first()
-    if not user_obj:
+    principal = get_principal(db, token_data.sub)
+    if not principal:
         raise HTTPException(status_code=404, detail="User not found")
-    if not user_obj.is_active:
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
+def _get_current_user(
+    db: Session = Depends(get_db), principal: Principal = Depends(_get_current_principal)
+) -> Any:
+    user_obj = db.query(P1User).filter(P1User.id == principal.id).first()
+    if not user_obj:
+        raise HTTPException(status_code=404, detail="User not found")
     return user_obj
 
 
@@ -123,6 +122,5 @@ def signup(
         is_active=True,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    commit_write(db, db_user)
     return db_user
@@ -56,6 +56,18 @@ async def top_paths_slow(
     return [TopPath(path=p, count=c) for p, c in top]
 
 
+def top_paths_statement(
+    *, start: Optional[datetime] = None, end: Optional[datetime] = None, limit: int = 10
+) -> Select:
+    """The SQL aggregation behind `top_paths_optimized`."""
+    stmt = select(PageView.path, func.count(PageView.id).label("cnt"))
+    if start:
+        stmt = stmt.where(PageView.created_at >= start)
+    if end:
+        stmt = stmt.where(PageView.created_at <= end)
+    return stmt.group_by(PageView.path).order_by(desc("cnt")).limit(limit)
+
+
 async def top_paths_optimized(
     session: AsyncSession,
     *,
@@ -71,14 +83,7 @@ async def top_paths_optimized(
         # cached is list of dicts
         return [TopPath(**item) for item in cached]
 
-    stmt = select(PageView.path, func.count(PageView.id).label("cnt"))
-    if start:
-        stmt = stmt.where(PageView.created_at >= start)
-    if end:
-        stmt = stmt.where(PageView.created_at <= end)
-    stmt = stmt.group_by(PageView.path).order_by(desc("cnt")).limit(limit)
-
-    result = await session.execute(stmt)
+    result = await session.execute(top_paths_statement(start=start, end=end, limit=limit))
     rows = result.all()
 
     data = [TopPath(path=r[0], count=int(r[1])) for r in rows]
@@ -28,6 +28,12 @@ async def get_redis() -> Redis:
     return _redis_singleton
 
 
+async def ping() -> bool:
+    """Open the Redis connection ahead of the first request."""
+    r = await get_redis()
+    return bool(await r.ping())
+
+
 async def cache_get(key: str) -> Optional[Any]:
     """Get a JSON value from Redis cache."""
     r = await get_redis()
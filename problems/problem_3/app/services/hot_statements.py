@@ -0,0 +1,34 @@
+"""The statements behind Problem 3's hot endpoints, for the startup warmup.
+
+Login and authentication read `users` through the sync engine; the
+optimized top-paths query runs on the async one, with and without a time
+window (each is its own cached statement). Values match no rows, so each
+engine caches the statements before the first request (see Problem 1's
+`app.core.warmup`).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from problems.problem_1.app.core.principal_cache import load_principal
+from problems.problem_1.app.models.user import User as P1User
+
+from .analytics import top_paths_statement
+
+# Ids start at 1
+NO_ID = 0
+EPOCH = datetime(1970, 1, 1)
+
+
+def run(db: Session) -> None:
+    db.query(P1User).filter(P1User.email == "warmup@example.invalid").first()
+    db.query(P1User).filter(P1User.id == NO_ID).first()
+    load_principal(db, NO_ID)
+
+
+async def run_async(session: AsyncSession) -> None:
+    await session.execute(top_paths_statement(limit=1))
+    await session.execute(top_paths_statement(start=EPOCH, end=EPOCH, limit=1))